@@ -15,7 +15,7 @@
     University of Virginia
     ----------------------
     15 January 2018
-    Version 0.3
+    Version 0.4
 
     *Definitions*
     ----------------------
@@ -27,6 +27,10 @@
         threshold map would look like this:
             threshold_map[0] = [1.2, 3, 4.5, 6]
 
+    With --profile or --metrics-out, the wall time, CPU time and peak
+    resident memory of every stage, and counters of the model and automata,
+    are logged and written to JSON (see tools/metrics.py).
+
 """
 
 # Utility Imports
@@ -38,12 +42,11 @@ import os.path
 from classes.featureTable import *
 
 # Import tools
-import tools.charactersets as cs
-import tools.quickrank as qr
-import tools.sklearn as skl
+import tools.pipeline as pipe
 from tools.anmltools import *
 import tools.gputools as gputools
 from tools.io import *
+from tools.metrics import Metrics, NullMetrics
 
 # WARNING: EXPERIMENTAL
 from tools.circuitTools import generate_circuits
@@ -54,11 +57,43 @@ from tools.mnrltools import *
 # Turn on logging; let's see what all is going on
 logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
 
+# The stages of the conversion, as named in the metrics
+STAGES = ['load_model', 'tree_to_chains', 'threshold_map', 'feature_table',
+          'set_character_sets', 'sort_and_combine', 'dump', 'generate_anml',
+          'gpu_chains', 'generate_circuits', 'input_file', 'mnrl']
+
+
+# Count the chains and their nodes (STEs) under prefix
+def count_chains(metrics, prefix, chains):
+
+    nodes = [len(chain.nodes_) for chain in chains]
+
+    metrics.count(prefix + '_chains', len(chains))
+    metrics.count(prefix + '_chain_stes', sum(nodes))
+    metrics.count(prefix + '_min_stes_per_chain', min(nodes) if nodes else 0)
+    metrics.count(prefix + '_max_stes_per_chain', max(nodes) if nodes else 0)
+    metrics.count(prefix + '_mean_stes_per_chain',
+                  sum(nodes) / float(len(nodes)) if nodes else 0.0)
+
+
+# Count the bytes of the outputs written, then log and write the metrics
+def report_metrics(metrics, outputs, metrics_out):
+
+    if not metrics.enabled:
+        return
+
+    metrics.count('output_bytes', sum(os.path.getsize(output)
+                                      for output in outputs
+                                      if os.path.isfile(output)))
+    metrics.log_summary()
+
+    if metrics_out is not None:
+        metrics.write(metrics_out)
+        logging.info("Wrote the metrics to %s" % metrics_out)
+
 # Main()
 if __name__ == '__main__':
 
-    quickrank = False
-
     # Parse Command Line Arguments
     usage = '%prog [options][model filename]'
 
@@ -87,15 +122,44 @@ if __name__ == '__main__':
                       dest='longer',
                       help='Make a 1000x longer input (23,100,000)')
 
+    parser.add_option('--cftvm', type='string', dest='cftvm',
+                      help='Dump the chains, feature table and value maps to this pickle')
+
+    parser.add_option('--value-map', type='string', dest='value_map',
+                      help='Dump the report code values and tree weights to this JSON sidecar for classify.py')
+
+    parser.add_option('-j', '--njobs', type='int', dest='njobs', default=1,
+                      help='Number of processes used to render the ANML')
+
     parser.add_option('-p', '--thresholds', action='store_true', default=False,
                       dest='plot_thresholds',
                       help='Generate a plot of the distribution of threshold counts')
 
+    parser.add_option('--profile', action='store_true', default=False,
+                      dest='profile',
+                      help='Log the time, memory and counters of every stage')
+
+    parser.add_option('--metrics-out', type='string', dest='metrics_out',
+                      help='Write the time, memory and counters of every stage to this JSON file (implies --profile)')
+
+    parser.add_option('--cprofile', type='choice', dest='cprofile',
+                      choices=STAGES,
+                      help='Run this stage under cProfile, dumping <stage>.prof (implies --profile)')
+
     parser.add_option('-v', '--verbose', action='store_true', default=False,
                       dest='verbose', help='Verbose')
 
+    parser.add_option('--debug', action='store_true', default=False,
+                      dest='debug',
+                      help='Also log the STE packing and input file details (large on big models)')
+
     options, args = parser.parse_args()
 
+    # The packing and input file details are only formatted when asked for
+    if options.debug:
+        for name in ['tools.util', 'classes.featureTable']:
+            logging.getLogger(name).setLevel(logging.DEBUG)
+
     model_filename = None
 
     # Verify model filename parameter
@@ -113,25 +177,20 @@ if __name__ == '__main__':
     else:
         parser.error("No valid model; provide <model filename>")
 
-    # Grab the model
-    model = None
-
-    # Simple check if quickrank model (might wanna improve this later)
-    if '.xml' in model_filename:
-
-        quickrank = True
+    # Metrics cost nothing unless asked for
+    if options.profile or options.metrics_out or options.cprofile:
+        metrics = Metrics(profile_stage=options.cprofile)
+    else:
+        metrics = NullMetrics()
 
-        model = qr.load_qr(model_filename)
+    # The files written, counted in the output bytes
+    outputs = []
 
-        # Grab the constituent trees
-        trees = qr.grab_data(model)
+    # Grab the model and its constituent trees
+    with metrics.stage('load_model'):
+        model, trees, quickrank = pipe.load_trees(model_filename)
 
-    # Else, its a scikit learn-type model
-    else:
-        model = load_model(model_filename)
-
-        # Grab the constituent trees
-        trees = [dtc.tree_ for dtc in model.estimators_]
+    metrics.count('trees', len(trees))
 
     if options.verbose:
         logging.info("Grabbed %d constituent trees to be 'chained'" %
@@ -139,99 +198,49 @@ if __name__ == '__main__':
 
     # Convert all trees to chains
     # Each chain represents a root->leaf path
-    chains = []
-
-    # Keep track of map from unique
-    # feature -> thresholds used for branch comparisons
-    threshold_map = {}
-
-    # Keep track of unique class values (unique(Y))
-    values = []
-
-    # We're going to use these to index leaf values (classes)
-    value_map = {}
-    reverse_value_map = {}
-
-    # To deal with quickrank, we need to parse the trees differently
-    if quickrank:
-
-        if options.verbose:
-            logging.info("Converting QuickRank trees to chains")
-
-        # Here is where we generate the chains from the trees
-        for tree_id, tree_weight, tree_split in trees:
-
-            qr.tree_to_chains(tree_id, tree_weight, tree_split,
-                              chains, threshold_map, values)
-
-        # Sort the classification values
-        values.sort()
-
-        # Create a map from value to index (starting from 1 -- imposed by AP)
-        for _i, _value in enumerate(values):
-
-            value_map[_value] = _i + 1
-            reverse_value_map[_i + 1] = _value
-
-    # Else, we're dealing with an SKLEARN model
-    else:
-
-        if options.verbose:
-            logging.info("Converting SKLEARN trees to chains")
-
-        # Grab the classification values
-        classes = model.classes_
-
-        if options.verbose:
-            logging.info("%d unique classifications available: %s" %
-                         (len(classes), str(model.classes_)))
-
-        # For each tree, chain-ify
-        for tree_id, tree in enumerate(trees):
-
-            skl.tree_to_chains(tree, tree_id, chains, threshold_map, values)
-
-        if options.verbose:
-            logging.info("There are %d chains" % len(chains))
-
-        for _i in values:
-            # value_map[classes[_i]] = _i + 1
-
-            # We don't need a value map (this might not be true)
-            value_map = None
-            reverse_value_map[_i + 1] = classes[_i]
+    with metrics.stage('tree_to_chains'):
+        chains, threshold_map, value_map, reverse_value_map =\
+            pipe.trees_to_chains(model, trees, quickrank,
+                                 verbose=options.verbose)
 
     if options.verbose:
         logging.info("Done converting trees to chains; now sorting")
 
-    # Because we built the chains from the left-most to the right-most leaf
-    # We can simply assign chain ids sequentially over our list
-    for chain_id, chain in enumerate(chains):
-        chain.set_chain_id(chain_id)
-
     # Now, once we have our chains, we can make our mnrl chains (which contain thresholds)
     if options.mnrl:
-        mnrl_network = make_mnrl_chains(chains)
 
-        mnrl_network.exportToFile("chains.mnrl")
+        with metrics.stage('mnrl'):
+            mnrl_network = make_mnrl_chains(chains)
+
+            mnrl_network.exportToFile("chains.mnrl")
+
+            X_test, y_test = load_test("testing_data.pickle")
 
-        X_test, y_test = load_test("testing_data.pickle")
+            # Catch
+            if len(X_test) == 0 or len(y_test) == 0:
+                raise ValueError
 
-        # Catch
-        if not X_test or not y_test:
-            raise ValueError
+            np.savetxt("testing.csv", X_test, delimiter=',', fmt='%1.4e')
 
-        np.savetxt("testing.csv", X_test, delimiter=',', fmt='%1.4e')
+        outputs.extend(["chains.mnrl", "testing.csv"])
 
         if options.verbose:
             logging.info("Done generating MNRL and testing output files")
 
+        report_metrics(metrics, outputs, options.metrics_out)
+
         # We stop here with MNRL
         exit(0)
 
     # Sort the thresholds for all features
-    for f, t in threshold_map.items():
-        t.sort()
+    with metrics.stage('threshold_map'):
+        pipe.sort_thresholds(threshold_map)
+
+    metrics.count('unique_features', len(threshold_map))
+
+    if metrics.enabled:
+        metrics.count('thresholds', sum(len(thresholds) for thresholds in
+                                        threshold_map.values()))
 
     if options.verbose:
         logging.info("There are %d features in the threshold map [%d-%d]" %
@@ -247,19 +256,51 @@ if __name__ == '__main__':
         logging.info("Building the Feature Table")
 
     # Create ideal address spacing for all features and thresholds
-    ft = FeatureTable(threshold_map, unrolled=options.unrolled)
+    with metrics.stage('feature_table'):
+        ft = pipe.build_feature_table(threshold_map, unrolled=options.unrolled)
+
+    metrics.count('ste_count', ft.ste_count_)
+    metrics.count('loop_length', 0 if ft.start_loop_ is None else
+                  ft.ste_count_ - ft.start_loop_)
+    metrics.count('symbols_per_sample', len(ft.permutation_) + 1)
 
     if options.verbose:
         logging.info("Sorting and combining the chains")
 
     # Set the character sets for each node in the chains
     # Then sort and combine the states in the chains
-    for chain in chains:
-        cs.set_character_sets(chain, ft)
-        chain.sort_and_combine()
+    with metrics.stage('set_character_sets'):
+        pipe.set_character_sets(chains, ft)
 
-    if options.verbose:
-        logging.info("Dumping Chains, Feature Table, Value Map and Reverse Value Map to pickle")
+    if metrics.enabled:
+        count_chains(metrics, 'uncombined', chains)
+
+    with metrics.stage('sort_and_combine'):
+        pipe.sort_and_combine(chains)
+
+    if metrics.enabled:
+        count_chains(metrics, 'combined', chains)
+
+    if options.cftvm is not None:
+
+        if options.verbose:
+            logging.info("Dumping Chains, Feature Table, Value Map and Reverse Value Map to pickle")
+
+        with metrics.stage('dump'):
+            dump_cftvm(options.cftvm, chains, ft, value_map, reverse_value_map)
+
+        outputs.append(options.cftvm)
+
+    if options.value_map is not None:
+
+        if options.verbose:
+            logging.info("Dumping the value map sidecar")
+
+        with metrics.stage('dump'):
+            dump_value_map(options.value_map, chains, value_map,
+                           reverse_value_map)
+
+        outputs.append(options.value_map)
 
     # Generate output for GPU implementation
     if options.gpu:
@@ -267,7 +308,10 @@ if __name__ == '__main__':
         if options.verbose:
             logging.info("Generating %d GPU chains" % (len(chains)))
 
-        gputools.gpu_chains(chains, ft, value_map, options.anml)
+        with metrics.stage('gpu_chains'):
+            gputools.gpu_chains(chains, ft, value_map, options.anml)
+
+        outputs.append(options.anml)
 
     # Generate output for circuit implementation
     elif options.circuit:
@@ -275,7 +319,11 @@ if __name__ == '__main__':
         if options.verbose:
             logging.info("Generating circuit file with %d chains" % (len(chains)))
 
-        generate_circuits(chains, ft, value_map, "circuits.txt", unrolled=options.unrolled)
+        with metrics.stage('generate_circuits'):
+            generate_circuits(chains, ft, value_map, "circuits.txt",
+                              unrolled=options.unrolled)
+
+        outputs.append("circuits.txt")
 
     # Else, we're dealing with a spatial architecture; generate ANML
     else:
@@ -283,7 +331,11 @@ if __name__ == '__main__':
         if options.verbose:
             logging.info("Generating ANML file with %d chains" % (len(chains)))
 
-        generate_anml(chains, ft, value_map, options.anml, unrolled=options.unrolled)
+        with metrics.stage('generate_anml'):
+            generate_anml(chains, ft, value_map, options.anml,
+                          unrolled=options.unrolled, n_jobs=options.njobs)
+
+        outputs.append(options.anml)
 
     if options.verbose:
         logging.info("Dumping test file")
@@ -291,7 +343,12 @@ if __name__ == '__main__':
     X_test, y_test = load_test("testing_data.pickle")
 
     # If using quickrank, our features are based at index = 1, instead of 0
-    ft.input_file(X_test, "input_file.bin", onebased=quickrank,
-                  short=options.short, delimited=True)
+    with metrics.stage('input_file'):
+        ft.input_file(X_test, "input_file.bin", onebased=quickrank,
+                      short=options.short, delimited=True)
+
+    outputs.append("input_file.bin")
+
+    report_metrics(metrics, outputs, options.metrics_out)
 
     logging.info("Done!")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+'''
+    The purpose of this program is to benchmark ANML generation with
+    a serial run against a process pool of chain shards, and to verify
+    that both runs produce byte-identical ANML files.
+
+    Train a large model first, e.g.
+        trainEnsemble.py -c mnist -m rf -d 8 -n 1000
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+from optparse import OptionParser
+from multiprocessing import cpu_count
+import filecmp
+import logging
+import os
+import time
+
+# Import tools
+import tools.pipeline as pipe
+from tools.anmltools import generate_anml
+
+# Turn on logging; let's see what all is going on
+logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
+
+
+# Time a single call to generate_anml()
+def time_generate_anml(chains, ft, value_map, filename, unrolled, n_jobs,
+                       shard_size):
+
+    start_time = time.time()
+
+    generate_anml(chains, ft, value_map, filename, unrolled=unrolled,
+                  n_jobs=n_jobs, shard_size=shard_size)
+
+    return time.time() - start_time
+
+
+# Main()
+if __name__ == '__main__':
+
+    # Parse Command Line Arguments
+    usage = '%prog [options][model filename]'
+    parser = OptionParser(usage)
+    parser.add_option('-j', '--njobs', type='int', dest='njobs',
+                      default=cpu_count(),
+                      help='Number of processes used for the parallel run')
+    parser.add_option('-s', '--shard-size', type='int', dest='shard_size',
+                      default=256, help='Number of chains per shard')
+    parser.add_option('-n', '--numiter', type='int', dest='iters', default=3,
+                      help='The number of times each run is repeated')
+    parser.add_option('--unrolled', action='store_true', default=False,
+                      dest='unrolled', help='Set to get unrolled chains (no loops)')
+    options, args = parser.parse_args()
+
+    if len(args) != 1 or not os.path.isfile(args[0]):
+        parser.error("No valid model file; provide <model filename>")
+
+    model, trees, quickrank = pipe.load_trees(args[0])
+
+    chains, threshold_map, value_map, reverse_value_map =\
+        pipe.trees_to_chains(model, trees, quickrank)
+
+    pipe.sort_thresholds(threshold_map)
+    ft = pipe.build_feature_table(threshold_map, unrolled=options.unrolled)
+    pipe.set_character_sets(chains, ft)
+    pipe.sort_and_combine(chains)
+
+    logging.info("Benchmarking ANML generation for %d trees, %d chains, %d STEs per chain" %
+                 (len(trees), len(chains), ft.ste_count_))
+
+    results = {}
+
+    for n_jobs, filename in [(1, 'bench_serial.anml'),
+                             (options.njobs, 'bench_parallel.anml')]:
+
+        times = [time_generate_anml(chains, ft, value_map, filename,
+                                    options.unrolled, n_jobs,
+                                    options.shard_size)
+                 for i in range(options.iters)]
+
+        # Keep the best run; the others only add noise from the OS
+        results[n_jobs] = min(times)
+
+        logging.info("n_jobs=%d: best %f seconds over %d runs (%d bytes)" %
+                     (n_jobs, results[n_jobs], options.iters,
+                      os.path.getsize(filename)))
+
+    if not filecmp.cmp('bench_serial.anml', 'bench_parallel.anml',
+                       shallow=False):
+        raise ValueError("Parallel ANML output differs from the serial output")
+
+    logging.info("Outputs are identical")
+    logging.info("Speedup with %d processes: %fx" %
+                 (options.njobs, results[1] / results[options.njobs]))
+
+    os.remove('bench_serial.anml')
+    os.remove('bench_parallel.anml')
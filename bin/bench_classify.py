@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+'''
+    The purpose of this program is to benchmark the report parsers of
+    classify.py in report lines per second, and to verify that they all
+    produce the same classifications.
+
+    The text reports are classified line by line and in numpy blocks;
+    binary reports of the same run (simulate.py -b) can be added.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+from optparse import OptionParser
+import logging
+import os
+import tempfile
+import time
+
+# Import tools
+from classify import classify, classify_bulk
+
+# Turn on logging; let's see what all is going on
+logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
+
+
+# Count the lines of a text file a block at a time
+def count_lines(filename, block_size=1 << 24):
+
+    lines = 0
+
+    with open(filename, 'rb') as f:
+
+        block = f.read(block_size)
+
+        while block:
+            lines += block.count(b'\n')
+            block = f.read(block_size)
+
+    return lines
+
+
+# Main()
+if __name__ == '__main__':
+
+    # Parse Command Line Arguments
+    usage = '%prog [options][reports filename]'
+    parser = OptionParser(usage)
+    parser.add_option('-n', '--binary', type='string', dest='binary',
+                      help='Binary (.npy) reports of the same run to benchmark too')
+    parser.add_option('-b', '--block-size', type='int', dest='block_size',
+                      default=1 << 24, help='Bytes of reports parsed at a time by numpy')
+    options, args = parser.parse_args()
+
+    if len(args) != 1 or not os.path.isfile(args[0]):
+        parser.error("No valid reports file; provide <reports filename>")
+
+    reports_filename = args[0]
+
+    lines = count_lines(reports_filename)
+    size = os.path.getsize(reports_filename)
+
+    logging.info("Benchmarking %d report lines (%d bytes)" % (lines, size))
+
+    transformer = lambda x: x - 1
+
+    parsers = [
+        ('stream', reports_filename,
+         lambda r, o: classify(r, transformer, o)),
+        ('numpy', reports_filename,
+         lambda r, o: classify_bulk(r, transformer, o, options.block_size))]
+
+    if options.binary is not None:
+        parsers.append(('binary', options.binary,
+                        lambda r, o: classify_bulk(r, transformer, o,
+                                                   options.block_size)))
+
+    expected = None
+    output_dir = tempfile.mkdtemp(prefix='classify_')
+
+    try:
+
+        for name, filename, parse in parsers:
+
+            output_filename = os.path.join(output_dir, name + '.txt')
+
+            start_time = time.time()
+            parse(filename, output_filename)
+            elapsed = max(time.time() - start_time, 1e-9)
+
+            with open(output_filename, 'r') as f:
+                classifications = f.read()
+
+            os.remove(output_filename)
+
+            if expected is None:
+                expected = classifications
+
+            elif classifications != expected:
+                raise ValueError("The %s parser classifications differ" % name)
+
+            logging.info("%s: %f seconds (%f lines/s, %f MB/s)" %
+                         (name, elapsed, lines / elapsed,
+                          os.path.getsize(filename) / elapsed / 1e6))
+
+    finally:
+        os.rmdir(output_dir)
+
+    logging.info("All parsers produce the same classifications")
@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+'''
+    The purpose of this program is to benchmark every stage of the
+    automatize pipeline on synthetic forests (see tools/synthetic.py) of
+    growing tree counts, without training a model or network access.
+
+    Each stage is timed and its peak resident memory sampled
+    (tools/benchmark.py); the time of every stage is then fit to
+    c * trees ** exponent, and stages growing faster than --max-exponent
+    are flagged, so accidental O(n^2) regressions stand out.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+from collections import OrderedDict
+from optparse import OptionParser
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+
+# Import tools
+import tools.benchmark as bench
+import tools.gputools as gputools
+import tools.pipeline as pipe
+from tools.anmltools import generate_anml
+from tools.circuitTools import generate_circuits
+from tools.synthetic import synthetic_forest, synthetic_samples
+
+# Turn on logging; let's see what all is going on
+logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
+
+
+# Parse a comma-separated list of ints
+def parse_list(option, opt_str, value, parser):
+
+    setattr(parser.values, option.dest, [int(v) for v in value.split(',')])
+
+
+# Run the stages of automatize.py on a model, writing the outputs to
+# directory. Returns {stage: {seconds, peak_rss, rss_growth}}, the chain
+# count and the STE count
+def run_stages(model, X, directory):
+
+    stages = OrderedDict()
+
+    # Run and measure one stage; returns its result
+    def stage(name, function, *args):
+
+        result, seconds, peak, before = bench.measure(function, *args)
+
+        stages[name] = {'seconds': seconds, 'peak_rss': peak,
+                        'rss_growth': peak - before}
+
+        return result
+
+    trees = [estimator.tree_ for estimator in model.estimators_]
+
+    chains, threshold_map, value_map, reverse_value_map =\
+        stage('tree_to_chains', pipe.trees_to_chains, model, trees, False)
+
+    stage('threshold_map', pipe.sort_thresholds, threshold_map)
+
+    ft = stage('feature_table', pipe.build_feature_table, threshold_map)
+
+    stage('set_character_sets', pipe.set_character_sets, chains, ft)
+    stage('sort_and_combine', pipe.sort_and_combine, chains)
+
+    stage('generate_anml', generate_anml, chains, ft, value_map,
+          os.path.join(directory, 'model.anml'))
+    stage('gpu_chains', gputools.gpu_chains, chains, ft, value_map,
+          os.path.join(directory, 'gpu_chains.txt'))
+    stage('generate_circuits', generate_circuits, chains, ft, value_map,
+          os.path.join(directory, 'circuits.txt'))
+
+    stage('input_file', ft.input_file, X,
+          os.path.join(directory, 'input_file.bin'))
+
+    return stages, len(chains), ft.ste_count_
+
+
+# Main()
+if __name__ == '__main__':
+
+    # Parse Command Line Arguments
+    usage = '%prog [options]'
+    parser = OptionParser(usage)
+    parser.add_option('-n', '--trees', type='string', dest='trees',
+                      action='callback', callback=parse_list,
+                      default=[25, 50, 100, 200],
+                      help='Comma-separated tree counts of the synthetic forests')
+    parser.add_option('-d', '--depth', type='int', dest='depth', default=6,
+                      help='Depth of the synthetic trees')
+    parser.add_option('-f', '--features', type='int', dest='features',
+                      default=32, help='Number of features')
+    parser.add_option('-t', '--thresholds', type='int', dest='thresholds',
+                      default=64,
+                      help='Size of the threshold pool of every feature')
+    parser.add_option('--skew', type='float', dest='skew', default=1.0,
+                      help='Zipf skew of the features picked by the splits (0 is uniform)')
+    parser.add_option('-s', '--samples', type='int', dest='samples',
+                      default=1000,
+                      help='Number of samples written by input_file')
+    parser.add_option('-r', '--repeats', type='int', dest='repeats',
+                      default=1,
+                      help='Runs per tree count; the fastest run of every stage is kept')
+    parser.add_option('--max-exponent', type='float', dest='max_exponent',
+                      default=1.5,
+                      help='Flag stages whose time grows faster than trees ** exponent')
+    parser.add_option('--seed', type='int', dest='seed', default=0,
+                      help='Seed of the synthetic forests')
+    parser.add_option('-o', '--output', type='string', dest='output',
+                      default='reports/pipeline_benchmark.json',
+                      help='JSON results file')
+    options, args = parser.parse_args()
+
+    if len(options.trees) < 2:
+        parser.error("Provide at least two tree counts to fit the scaling")
+
+    X = synthetic_samples(options.samples, options.features, options.seed)
+
+    directory = tempfile.mkdtemp(prefix='bench_pipeline_')
+
+    runs = []
+
+    try:
+
+        for trees in options.trees:
+
+            model = synthetic_forest(trees, options.depth, options.features,
+                                     options.thresholds, options.skew,
+                                     seed=options.seed)
+
+            best = None
+
+            for repeat in range(options.repeats):
+
+                stages, chains, ste_count = run_stages(model, X, directory)
+
+                if best is None:
+                    best = stages
+                else:
+                    for name, stage in stages.items():
+                        if stage['seconds'] < best[name]['seconds']:
+                            best[name] = stage
+
+            logging.info("%d trees: %d chains, %d STEs" %
+                         (trees, chains, ste_count))
+
+            for name, stage in best.items():
+                logging.info("    %-20s %10.4f seconds, peak %8.1f MB" %
+                             (name, stage['seconds'],
+                              stage['peak_rss'] / float(1 << 20)))
+
+            runs.append({'trees': trees, 'chains': chains,
+                         'ste_count': ste_count, 'stages': best})
+
+    finally:
+        shutil.rmtree(directory)
+
+    # Fit the scaling of every stage with the tree count
+    scaling = OrderedDict()
+
+    for name in runs[0]['stages']:
+
+        exponent = bench.scaling_exponent(
+            [run['trees'] for run in runs],
+            [run['stages'][name]['seconds'] for run in runs])
+
+        scaling[name] = {'exponent': exponent,
+                         'flagged': exponent > options.max_exponent}
+
+        logging.info("%-20s time ~ trees ** %.2f%s" %
+                     (name, exponent,
+                      ' <- above %.2f' % options.max_exponent
+                      if scaling[name]['flagged'] else ''))
+
+    directory = os.path.dirname(options.output)
+
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    with open(options.output, 'w') as f:
+        json.dump({'depth': options.depth, 'features': options.features,
+                   'thresholds': options.thresholds, 'skew': options.skew,
+                   'samples': options.samples, 'seed': options.seed,
+                   'machine': bench.machine(), 'runs': runs,
+                   'scaling': scaling}, f, indent=1)
+
+    logging.info("Wrote the results to %s" % options.output)
+
+    flagged = [name for name, fit in scaling.items() if fit['flagged']]
+
+    if flagged:
+        logging.warning("Stages scaling above trees ** %.2f: %s" %
+                        (options.max_exponent, ', '.join(flagged)))
+        sys.exit(1)
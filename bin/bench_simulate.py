@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+'''
+    The purpose of this program is to benchmark the CPU simulation engines
+    in symbols per second, and to verify that they all produce the same
+    reports.
+
+    The reference engine simulates one STE object at a time and is very
+    slow, so it only runs over the first --reference-symbols symbols;
+    the other engines are checked against it on that prefix.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+from optparse import OptionParser
+import logging
+import os
+import time
+import numpy as np
+
+# Import tools
+from tools.io import load_cftvm
+import tools.reference as reference
+import tools.shiftand as shiftand
+import tools.simulator as sim
+
+# Turn on logging; let's see what all is going on
+logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
+
+
+# Consume all batches of an engine; returns (cycles, chains, seconds)
+def time_engine(batches):
+
+    start_time = time.time()
+
+    all_cycles = [np.zeros(0, dtype=np.uint64)]
+    all_chains = [np.zeros(0, dtype=np.int64)]
+
+    for cycles, chains in batches:
+        all_cycles.append(cycles)
+        all_chains.append(chains)
+
+    elapsed = max(time.time() - start_time, 1e-9)
+
+    return np.concatenate(all_cycles), np.concatenate(all_chains), elapsed
+
+
+# The reference engine as a generator, so it runs inside of time_engine()
+def reference_batches(network, data, anml_net):
+
+    yield reference.simulate(network, data, anml_net)
+
+
+# Cut the stream after the last delimiter within the first count symbols
+def prefix(data, count):
+
+    delimiters = sim.find_delimiters(data[:count + 1])
+
+    if len(delimiters) == 0:
+        return data[:0]
+
+    return data[:delimiters[-1] + 1]
+
+
+# Main()
+if __name__ == '__main__':
+
+    # Parse Command Line Arguments
+    usage = '%prog [options][input filename]'
+    parser = OptionParser(usage)
+    parser.add_option('-a', '--anml', type='string', dest='anml',
+                      help='ANML file generated by automatize.py')
+    parser.add_option('-c', '--cftvm', type='string', dest='cftvm',
+                      help='Chains pickle dumped by automatize.py --cftvm')
+    parser.add_option('-r', '--reference-symbols', type='int',
+                      dest='reference_symbols', default=100000,
+                      help='Number of symbols run through the reference engine')
+    options, args = parser.parse_args()
+
+    if len(args) == 0:
+        input_filename = 'input_file.bin'
+    elif len(args) == 1:
+        input_filename = args[0]
+    else:
+        parser.error("Provide a single <input filename>")
+
+    if not os.path.isfile(input_filename):
+        parser.error("No valid input file; provide <input filename>")
+
+    if options.cftvm is not None:
+        chains, ft, value_map, reverse_value_map = load_cftvm(options.cftvm)
+        network = sim.network_from_chains(chains, ft, value_map)
+
+    elif options.anml is not None:
+        network = sim.network_from_anml(options.anml)
+
+    else:
+        parser.error("No network; provide -a <anml file> or -c <cftvm file>")
+
+    data = sim.load_input(input_filename)
+    reference_data = prefix(data, options.reference_symbols)
+
+    logging.info("Benchmarking %s over %d symbols (%d for the reference)" %
+                 (str(network), len(data), len(reference_data)))
+
+    # Compile the Shift-And masks and the STE objects up front,
+    # so only the simulation itself gets timed
+    start_time = time.time()
+    masks = shiftand.compile_masks(network)
+    logging.info("Compiled %d words of Shift-And masks in %f seconds" %
+                 (masks['words'], time.time() - start_time))
+
+    start_time = time.time()
+    anml_net = reference.anml_from_network(network)
+    logging.info("Built %d STE objects in %f seconds" %
+                 (len(anml_net.stes_), time.time() - start_time))
+
+    engines = [
+        ('windows', lambda d: sim.simulate_batches(network, d)),
+        ('shift-and', lambda d: shiftand.simulate_batches(network, d,
+                                                          masks=masks)),
+        ('reference', lambda d: reference_batches(network, d, anml_net))]
+
+    expected = None
+
+    for name, engine in engines:
+
+        cycles, chains, elapsed = time_engine(engine(reference_data))
+
+        if expected is None:
+            expected = (cycles, chains)
+
+        elif not (np.array_equal(cycles, expected[0]) and
+                  np.array_equal(chains, expected[1])):
+            raise ValueError("The %s engine reports differ" % name)
+
+        # The reference engine doesn't get to run over the whole stream
+        if name != 'reference':
+            cycles, chains, elapsed = time_engine(engine(data))
+            symbols = len(data)
+        else:
+            symbols = len(reference_data)
+
+        logging.info("%s: %d symbols in %f seconds (%f symbols/s); %d reports" %
+                     (name, symbols, elapsed, symbols / elapsed, len(cycles)))
+
+    logging.info("All engines produce the same reports")
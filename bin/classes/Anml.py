@@ -61,15 +61,23 @@ class Anml(object):
         self.id_ = aId
 
     def __str__(self):
+        return self.header() + self.body() + self.footer()
+
+    # Everything that comes before the first STE
+    def header(self):
         string = "<anml version=\"1.0\"  xmlns:xsi=\"\
             http://www.w3.org/2001/XMLSchema-instance\">\n"
         string += "\t<automata-network id=\"" + self.id_ + "\">\n"
-        for ste in self.stes_:
-            string += '\t\t' + str(ste)
-        string += '\t</automata-network>\n'
-        string += '</anml>\n'
         return string
 
+    # Everything that comes after the last STE
+    def footer(self):
+        return '\t</automata-network>\n</anml>\n'
+
+    # String representation of the STEs only (no header or footer)
+    def body(self):
+        return ''.join(['\t\t' + str(ste) for ste in self.stes_])
+
     def AddSTE(self, *args, **kargs):
 
         ste = Ste(*args, **kargs)
@@ -80,6 +80,9 @@ class Chain(object):
         self.value_ = None
         self.chain_ = None
 
+        # Index of the leaf this chain ends in (sklearn trees)
+        self.leaf_id_ = None
+
         # This was added for boosted regression trees
         self.tree_weight_ = tree_weight
 
@@ -103,6 +106,10 @@ class Chain(object):
     def set_value(self, value):
         self.value_ = value
 
+    # Set the leaf this chain ends in
+    def set_leaf_id(self, leaf_id):
+        self.leaf_id_ = leaf_id
+
     # Sort the chain by feature value, then update ids and children
     def sort_and_combine(self, verbose=False):
 
@@ -7,21 +7,28 @@
     2. We use the resulting lookup table to map feature values to feature
         labels.
     3. We use the lookup table to generate input files for the AP.
+
+    Details of the input files are logged at the DEBUG level of the
+    classes.featureTable logger.
     ----------------------
     Author: Tom Tracy II
     email: tjt7a@virginia.edu
     University of Virginia
     ----------------------
     12 June 2017
-    Version 0.2
+    Version 0.3
 '''
 
 # Utility imports
 from termcolor import colored
 from random import *
 from array import *
+import numpy as np
 import tools.util as util
 from collections import OrderedDict
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Define FeatureTable class
 class FeatureTable(object):
@@ -42,7 +49,8 @@ class FeatureTable(object):
 
         # Find the minimum number of stes required to handle the features
         feature_pointer, stes, start_loop, end_loop =\
-            util.compact(self.threshold_map_, unrolled=self.unrolled, verbose=True)
+            util.compact(self.threshold_map_, unrolled=self.unrolled,
+                         verbose=verbose)
 
         # Assign feature_pointer and stes
         # feature -> [(STE, start, end)]
@@ -159,6 +167,39 @@ class FeatureTable(object):
 
         return return_list
 
+    # Vectorized get_symbols() over whole columns of X; returns the
+    # (samples, symbols) matrix of labels input_file() writes for X,
+    # one row per sample, without the delimiters
+    def encode(self, X, onebased=False):
+
+        X = np.asarray(X)
+        columns = []
+
+        for f_i in self.permutation_:
+
+            values = X[:, f_i - 1] if onebased else X[:, f_i]
+            found = np.zeros(len(values), dtype=bool)
+
+            for ste, start, end in self.get_ranges(f_i):
+
+                thresholds = np.array(self.stes_[ste][start:end],
+                                      dtype=np.float64)
+
+                # The first label with a threshold >= value, or the -1
+                hits = (thresholds == -1) | ((thresholds != -2) &
+                                             (thresholds >= values[:, None]))
+                hit = hits.any(axis=1)
+
+                # Found in an earlier STE, or not in this one: last label
+                labels = np.where(found | ~hit, end - 1,
+                                  start + np.argmax(hits, axis=1))
+
+                found |= hit
+                columns.append(labels)
+
+        return np.array(columns, dtype=np.uint8).reshape(len(columns),
+                                                         len(X)).T.copy()
+
     # This function generates an input file from an input X
     def input_file(self, X, filename, onebased=False,
                    short=False, delimited=True):
@@ -166,12 +207,8 @@ class FeatureTable(object):
         if short:
             X = X[:10]
 
-        print "Writing %d samples to input file" % X.shape[0]
-
-        if delimited:
-            print "Delimited"
-        else:
-            print "Not Delimited"
+        logger.debug("input_file: samples=%d delimited=%s", X.shape[0],
+                     delimited)
 
         num_bytes_per_class = 0
 
@@ -183,10 +220,10 @@ class FeatureTable(object):
             if delimited:
                 inputstring.append(255)
 
-            print "%d features in each row of X" % len(X[0])
-            print "%d unique features in this permutation" %\
-                len(set(self.permutation_))
-            print "%d cycles per classification" % len(self.permutation_)
+            logger.debug("input_file: row_features=%d permutation_features=%d "
+                         "cycles=%d", len(X[0]), len(set(self.permutation_)),
+                         len(self.permutation_))
+
             # For each input row...
             for row in X:
 
@@ -0,0 +1,127 @@
+'''
+    This objected-oriented module defines a compiled chain network class
+
+    All chains generated from one feature table share the same shape:
+    a start STE (0xFF, all-input), ste_count_ STEs in a row, an optional
+    loop from the last STE back to start_loop_, and a report STE (0xFF)
+    enabled by end_loop_. The network stores, for every STE position,
+    a 256-entry table of packed bits (one bit per chain) telling which
+    chains accept each symbol.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+import numpy as np
+
+
+# Define ChainNetwork class
+class ChainNetwork(object):
+
+    # Constructor; start_loop is None for unrolled chains (no loop),
+    # end_loop is None if a chain can report from any STE
+    def __init__(self, ste_count, start_loop, end_loop):
+
+        self.ste_count_ = ste_count
+        self.start_loop_ = start_loop
+        self.end_loop_ = end_loop
+
+        # Per chain attributes
+        self.tree_ids_ = []
+        self.chain_ids_ = []
+        self.codes_ = []
+
+        # Per chain (ste_count, 32) packed accept bits; freed by finalize()
+        self.accept_ = []
+
+        # tables_[ste] is a (256, words) uint64 array once finalized
+        self.tables_ = None
+        self.words_ = 0
+
+    # Number of chains in the network
+    def __len__(self):
+        return len(self.codes_)
+
+    # String representation of the network
+    def __str__(self):
+        return "Chains: %d, STEs per chain: %d, Loop: %s-%s" %\
+            (len(self), self.ste_count_, str(self.start_loop_),
+             str(self.end_loop_))
+
+    # Add a chain; accept is a (ste_count, 256) boolean array
+    def add_chain(self, tree_id, chain_id, code, accept):
+
+        assert accept.shape == (self.ste_count_, 256),\
+            "Chain has the wrong number of STEs"
+
+        self.tree_ids_.append(tree_id)
+        self.chain_ids_.append(chain_id)
+        self.codes_.append(code)
+        self.accept_.append(np.packbits(accept, axis=1))
+
+    # Transpose the per-chain accept bits into per-STE symbol tables
+    def finalize(self):
+
+        chains = len(self)
+
+        # Pad the chain bits to full 64-bit words
+        self.words_ = max(1, (chains + 63) // 64)
+
+        self.tables_ = []
+
+        accept = np.array(self.accept_, dtype=np.uint8)
+
+        for ste in range(self.ste_count_):
+
+            table = np.zeros((256, self.words_ * 8), dtype=np.uint8)
+
+            if chains > 0:
+                # (chains, 256) -> (256, chains) -> packed over chains
+                bits = np.unpackbits(accept[:, ste, :], axis=1)
+                packed = np.packbits(bits.T, axis=1)
+                table[:, :packed.shape[1]] = packed
+
+            self.tables_.append(table.view(np.uint64))
+
+        self.tree_ids_ = np.array(self.tree_ids_, dtype=np.int64)
+        self.chain_ids_ = np.array(self.chain_ids_, dtype=np.int64)
+        self.codes_ = np.array(self.codes_, dtype=np.int64)
+        self.accept_ = None
+
+    # The STE visited by each symbol of a window between two delimiters,
+    # or None if a window of this length can never reach the report STE
+    def window_states(self, length):
+
+        if length == 0:
+            return None
+
+        # Unrolled chains have at most one symbol per STE
+        if self.start_loop_ is None:
+
+            if length > self.ste_count_:
+                return None
+
+            states = np.arange(length)
+
+        else:
+
+            positions = np.arange(length)
+            loop_size = self.ste_count_ - self.start_loop_
+
+            states = np.where(positions < self.ste_count_, positions,
+                              self.start_loop_ +
+                              (positions - self.start_loop_) % loop_size)
+
+        # The last symbol has to be consumed by the STE enabling the report
+        if self.end_loop_ is not None and states[-1] != self.end_loop_:
+            return None
+
+        return states
+
+    # The VASIM-style id of each chain's reporting STE
+    def report_ids(self):
+
+        return ["%dt_%dl_%dr" % (tree_id, chain_id, code) for
+                tree_id, chain_id, code in
+                zip(self.tree_ids_, self.chain_ids_, self.codes_)]
@@ -13,55 +13,310 @@
 
 # Utility Imports
 from optparse import OptionParser
+from Queue import Queue
+import sys
+import threading
+import numpy as np
 
 # Import tools
 import os
 
 from tools.io import *
+from tools.reports import group_blocks, majority, mean, parse_text_block,\
+    read_report_blocks, report_samples, weighted_majority, weighted_sum
+from tools.evaluator import class_values
+from tools.simulator import find_delimiters
 
 # Turn on logging; let's see what all is going on
 logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
 
 
+# Write the mode of the classifications counted for one report index
+# Ties go to the classification reported first
+def write_classification(output, index, counts, seen):
+
+    classification = max(seen, key=counts.__getitem__)
+
+    output.write(str(index) + ':' + str(classification) + '\n')
+
+    # Clear the counters for the next report index
+    for _c in seen:
+        counts[_c] = 0
+
+    del seen[:]
+
+
 # Read reports, transform, dump to output file
+# VASIM writes the reports in cycle order, so all reports of a report
+# index are consecutive; each index is classified as soon as it ends
 def classify(reports_filename_, transformer_, output_filename_):
 
-    # This dict acts as a map from the cycle index to a list of the reports for that index
-    report_map = {}
+    # classification -> number of reports at the current index
+    counts = []
+
+    # The classifications seen at the current index, in report order
+    seen = []
 
-    # To preserve order, we'll also have a list of report_indexes
-    report_indexes = []
+    current_index = None
 
-    # Read the reports file
-    with open(reports_filename_, 'r') as reports:
+    with open(reports_filename_, 'r') as reports,\
+            open(output_filename_, 'w') as output:
 
         for report in reports:
 
-            report_index = int(report.split(':')[0].strip())
-            report_code = int(report.split(':')[-1].strip())
+            fields = report.split(':')
 
-            if report_index not in report_indexes:
+            report_index = int(fields[0])
+            classification = transformer_(int(fields[-1]))
 
-                report_map[report_index] = [report_code]
-                report_indexes.append(report_index)
+            if report_index != current_index:
 
-            else:
+                if seen:
+                    write_classification(output, current_index, counts, seen)
+
+                current_index = report_index
 
-                report_map[report_index].append(report_code)
+            if classification >= len(counts):
+                counts.extend([0] * (classification + 1 - len(counts)))
 
+            if counts[classification] == 0:
+                seen.append(classification)
+
+            counts[classification] += 1
+
+        if seen:
+            write_classification(output, current_index, counts, seen)
+
+
+# Read reports in blocks of block_size bytes, and vote with numpy
+# The transformer is applied to arrays of report codes; binary (.npy)
+# reports are read too. With a value map sidecar, every report votes
+# with the weight of its tree (weighted-vote)
+def classify_bulk(reports_filename_, transformer_, output_filename_,
+                  block_size=1 << 24, value_map_=None):
+
+    if value_map_ is None:
+        blocks = ((cycles, transformer_(codes)) for cycles, codes in
+                  read_report_blocks(reports_filename_, block_size))
+        reducer = majority
+
+    else:
+        blocks = weighted_vote_blocks(reports_filename_, transformer_,
+                                      value_map_, block_size)
+        reducer = weighted_majority
 
-    # Now write the resulting classifications to the output file
     with open(output_filename_, 'w') as output:
 
-        for index in report_indexes:
+        for indexes, classifications in group_blocks(blocks, reducer):
+
+            output.write(''.join(['%d:%d\n' % pair for pair in
+                                  zip(indexes.tolist(),
+                                      classifications.tolist())]))
+
+
+# Read reports in blocks of block_size bytes; yields (cycles, scores)
+# blocks, the value of every report code times the weight of its tree
+def score_blocks(reports_filename_, value_map_, block_size=1 << 24):
+
+    values = np.full(max(value_map_['values'].keys()) + 1, np.nan)
+
+    for code, value in value_map_['values'].items():
+        values[code] = value
+
+    weights = value_map_['tree_weights']
+
+    # The tree ids are only parsed when the tree weights differ
+    if len(set(weights.values())) > 1:
+
+        tree_weights = np.ones(max(weights.keys()) + 1)
+
+        for tree, weight in weights.items():
+            tree_weights[tree] = weight
+
+        return ((cycles, values[codes] * tree_weights[trees]) for
+                cycles, codes, trees in
+                read_report_blocks(reports_filename_, block_size, trees=True))
+
+    weight = list(weights.values())[0] if weights else 1.0
+
+    return ((cycles, values[codes] * weight) for cycles, codes in
+            read_report_blocks(reports_filename_, block_size))
+
+
+# Read reports in blocks of block_size bytes; yields (cycles,
+# classifications, weights) blocks, the weight of every report being the
+# weight of its tree in the value map sidecar
+def weighted_vote_blocks(reports_filename_, transformer_, value_map_,
+                         block_size=1 << 24):
+
+    weights = value_map_['tree_weights']
+
+    # The tree ids are only parsed when the tree weights differ
+    if len(set(weights.values())) > 1:
+
+        tree_weights = np.ones(max(weights.keys()) + 1)
+
+        for tree, weight in weights.items():
+            tree_weights[tree] = weight
+
+        return ((cycles, transformer_(codes), tree_weights[trees]) for
+                cycles, codes, trees in
+                read_report_blocks(reports_filename_, block_size, trees=True))
+
+    return ((cycles, transformer_(codes), np.ones(len(codes))) for
+            cycles, codes in read_report_blocks(reports_filename_, block_size))
+
+
+# Score every report index with the value map sidecar: the sum
+# (weighted-sum) or the mean (mean) of the report values, times the
+# weights of their trees
+def score_bulk(reports_filename_, value_map_, output_filename_, mode_,
+               block_size=1 << 24):
+
+    blocks = score_blocks(reports_filename_, value_map_, block_size)
+    reducer = SCORE_REDUCERS[mode_]
+
+    with open(output_filename_, 'w') as output:
+
+        for indexes, scores in group_blocks(blocks, reducer):
+
+            output.write(''.join(['%d:%r\n' % pair for pair in
+                                  zip(indexes.tolist(), scores.tolist())]))
+
+
+# Predict every input sample, in row order, from (cycles, values) report
+# blocks reduced by reducer. Sample k is framed by the delimiters at
+# cycles k * cycles_per_sample_ and (k + 1) * cycles_per_sample_, and its
+# chains report on the closing one; samples without reports get default_
+def predict_samples(blocks, reducer, samples_, cycles_per_sample_, default_,
+                    dtype=np.int64):
+
+    predictions = np.full(samples_, default_, dtype=dtype)
+
+    for cycles, results in group_blocks(blocks, reducer):
+
+        indexes = report_samples(cycles, cycles_per_sample_)
+        inside = (indexes >= 0) & (indexes < samples_)
+
+        if not inside.all():
+            logging.warning("%d report cycles outside of the %d samples" %
+                            (np.count_nonzero(~inside), samples_))
+
+        predictions[indexes[inside]] = results[inside]
+
+    return predictions
+
+
+# Read chunks of a report pipe as soon as they are written, and hand them
+# to the voter through the queue; an empty chunk marks the end of the pipe
+def read_chunks(reports_, queue, chunk_size):
+
+    fd = reports_.fileno()
+
+    while True:
+
+        # os.read returns what the pipe holds instead of waiting for
+        # chunk_size bytes
+        chunk = os.read(fd, chunk_size)
+        queue.put(chunk)
+
+        if not chunk:
+            break
+
+
+# Classify the reports of a live pipe (stdin or a FIFO) while the
+# simulator writes them. A reader thread reads the pipe, so parsing
+# overlaps with the simulator. The reports of sample k all come in
+# window k of cycles_per_sample_ cycles (the permutation and its
+# delimiter); a sample is written as soon as a later window reports,
+# or as soon as all trees_ trees reported for it (one report per tree)
+def classify_stream(reports_, transformer_, output_, cycles_per_sample_,
+                    trees_=None, chunk_size=1 << 16):
+
+    queue = Queue(maxsize=64)
+
+    reader = threading.Thread(target=read_chunks,
+                              args=(reports_, queue, chunk_size))
+    reader.daemon = True
+    reader.start()
+
+    counts = []
+    seen = []
+
+    # The current window, the report index written for it, and its number
+    # of reports; closed once written early
+    current_window = None
+    current_index = None
+    reports = 0
+    closed = False
+
+    remainder = b''
+
+    while True:
 
-            # Apply the transformation to each report code at the given index
-            classifications = map(transformer_, report_map[index])
+        chunk = queue.get()
 
-            # Now find the MODE(); that's our classification!
-            classification = max(classifications, key=classifications.count)
+        # Parse the whole lines; the partial last line waits for the rest
+        if chunk:
+            block = remainder + chunk
+            end = block.rfind(b'\n') + 1
+        else:
+            block = remainder
+            end = len(block)
 
-            output.write(str(index) + ':' + str(classification) + '\n')
+        remainder = block[end:]
+
+        if end > 0:
+
+            cycles, codes = parse_text_block(block[:end])
+
+            for cycle, classification in zip(cycles.tolist(),
+                                             transformer_(codes).tolist()):
+
+                window = cycle // cycles_per_sample_
+
+                if window != current_window:
+
+                    if seen:
+                        write_classification(output_, current_index, counts,
+                                             seen)
+
+                    current_window = window
+                    current_index = cycle
+                    reports = 0
+                    closed = False
+
+                if closed:
+                    logging.warning("Report after the last tree of cycle %d" %
+                                    current_index)
+                    continue
+
+                if classification >= len(counts):
+                    counts.extend([0] * (classification + 1 - len(counts)))
+
+                if counts[classification] == 0:
+                    seen.append(classification)
+
+                counts[classification] += 1
+                reports += 1
+
+                # Every tree has voted; the sample is final
+                if reports == trees_:
+                    write_classification(output_, current_index, counts, seen)
+                    closed = True
+
+            output_.flush()
+
+        if not chunk:
+            break
+
+    if seen:
+        write_classification(output_, current_index, counts, seen)
+        output_.flush()
+
+
+# The reducers of the score modes
+SCORE_REDUCERS = {'weighted-sum': weighted_sum, 'mean': mean}
 
 
 # Main()
@@ -74,6 +329,34 @@ if __name__ == '__main__':
 
     parser.add_option('-o', '--output', type='string', dest='output_filename',
                       default='classifications.txt', help='Classifications output file')
+    parser.add_option('-p', '--parser', type='choice', dest='parser',
+                      choices=['numpy', 'stream'], default='numpy',
+                      help='Parse the reports in numpy blocks or line by line (numpy, stream)')
+    parser.add_option('-b', '--block-size', type='int', dest='block_size',
+                      default=1 << 24, help='Bytes of reports parsed at a time by numpy')
+    parser.add_option('-m', '--mode', type='choice', dest='mode',
+                      choices=['vote', 'weighted-vote', 'weighted-sum',
+                               'mean'],
+                      help='Aggregate the reports of a sample by vote, weighted-vote, weighted-sum or mean (defaults to the mode of the value map, or vote)')
+    parser.add_option('--value-map', type='string', dest='value_map',
+                      help='Value map sidecar written by automatize.py --value-map')
+    parser.add_option('-s', '--stream', action='store_true', dest='stream',
+                      default=False,
+                      help='Classify the reports of a live pipe (- for stdin, or a FIFO) as they are written')
+    parser.add_option('-c', '--cftvm', type='string', dest='cftvm',
+                      help='Chains and feature table pickle (automatize.py --cftvm) giving the cycles per sample and the tree count')
+    parser.add_option('--cycles', type='int', dest='cycles',
+                      help='Cycles per sample (the permutation length + 1 for the delimiter)')
+    parser.add_option('-n', '--npy', type='string', dest='npy',
+                      help='Write one prediction per input sample, in row order, to this .npy file')
+    parser.add_option('-i', '--input', type='string', dest='input',
+                      help='The simulated input file, giving the number of samples (and cycles per sample) for --npy')
+    parser.add_option('--samples', type='int', dest='samples',
+                      help='The number of input samples for --npy')
+    parser.add_option('--default', type='float', dest='default',
+                      help='Prediction of the samples without reports for --npy (default: -1, or NaN for scores)')
+    parser.add_option('--trees', type='int', dest='trees',
+                      help='Reports per sample for --stream; a sample is written once all its trees reported')
 
 
     options, args = parser.parse_args()
@@ -83,16 +366,170 @@ if __name__ == '__main__':
 
         reports_filename = args[0]
 
-        # Verify that the file exists
-        if not os.path.isfile(reports_filename):
+        # Verify that the file exists; streams also read stdin or FIFOs
+        if options.stream:
+            if reports_filename != '-' and not os.path.exists(reports_filename):
+                parser.error("No valid reports pipe; provide <reports filename>")
+
+        elif not os.path.isfile(reports_filename):
             parser.error("No valid reports file; provide <reports filename>")
 
     else:
         parser.error("No valid reports file; provide <reports filename>")
 
 
+    value_map = None
+
+    if options.value_map is not None:
+        value_map = load_value_map(options.value_map)
+
+    mode = options.mode
+
+    if mode is None:
+        mode = value_map['mode'] if value_map is not None else 'vote'
+
     # For our current implementation, based on the AP, we had to offset the report codes
     # by 1, because the AP would not return a 0 (the first class)
     transformer = lambda x: x - 1
 
-    classify(reports_filename, transformer, options.output_filename)
\ No newline at end of file
+    # The framing of the samples: permutation + delimiter cycles each
+    cycles_per_sample = options.cycles
+    trees = options.trees
+    samples = options.samples
+
+    if options.cftvm is not None:
+
+        chains, ft, _, _ = load_cftvm(options.cftvm)
+
+        if cycles_per_sample is None:
+            cycles_per_sample = len(ft.permutation_) + 1
+
+        if trees is None:
+            trees = len(set(chain.tree_id_ for chain in chains))
+
+    # The 0xFF delimiters of the input file frame the samples
+    if options.input is not None:
+
+        delimiters = find_delimiters(np.memmap(options.input, dtype=np.uint8,
+                                               mode='r'))
+        gaps = np.unique(np.diff(delimiters))
+
+        if samples is None:
+            samples = max(0, len(delimiters) - 1)
+
+        if cycles_per_sample is None and len(gaps) == 1:
+            cycles_per_sample = int(gaps[0])
+
+        if len(gaps) > 1 or (len(gaps) == 1 and
+                             gaps[0] != cycles_per_sample):
+            parser.error("The samples of %s aren't %s cycles apart" %
+                         (options.input, cycles_per_sample))
+
+    # Classify a live pipe as the reports come in
+    if options.stream:
+
+        if mode != 'vote':
+            parser.error("--stream only supports the vote mode")
+
+        if cycles_per_sample is None:
+            parser.error("--stream needs --cftvm or --cycles")
+
+        reports = sys.stdin if reports_filename == '-' else\
+            open(reports_filename, 'rb')
+        output = sys.stdout if options.output_filename == '-' else\
+            open(options.output_filename, 'w')
+
+        try:
+            classify_stream(reports, transformer, output, cycles_per_sample,
+                            trees)
+        finally:
+            if reports is not sys.stdin:
+                reports.close()
+            if output is not sys.stdout:
+                output.close()
+
+    # One prediction per sample, in row order
+    elif options.npy is not None:
+
+        if cycles_per_sample is None or samples is None:
+            parser.error("--npy needs --input, or --cftvm / --cycles and --samples")
+
+        if mode in ['vote', 'weighted-vote']:
+
+            if mode == 'vote':
+                blocks = ((cycles, transformer(codes)) for cycles, codes in
+                          read_report_blocks(reports_filename,
+                                             options.block_size))
+                reducer = majority
+
+            elif value_map is None:
+                parser.error("The %s mode needs a --value-map" % mode)
+
+            else:
+                blocks = weighted_vote_blocks(reports_filename, transformer,
+                                              value_map, options.block_size)
+                reducer = weighted_majority
+
+            default = -1 if options.default is None else int(options.default)
+
+            predictions = predict_samples(blocks, reducer, samples,
+                                          cycles_per_sample, -1)
+
+            # The majority codes - 1 are class indexes; the value map
+            # gives their class values
+            if value_map is not None:
+                predictions = np.where(predictions >= 0, class_values(
+                    np.maximum(predictions, 0), value_map['values']), default)
+
+            else:
+                predictions[predictions < 0] = default
+
+        else:
+
+            if value_map is None:
+                parser.error("The %s mode needs a --value-map" % mode)
+
+            predictions = predict_samples(
+                score_blocks(reports_filename, value_map, options.block_size),
+                SCORE_REDUCERS[mode], samples, cycles_per_sample,
+                np.nan if options.default is None else options.default,
+                np.float64)
+
+        np.save(options.npy, predictions)
+
+        logging.info("Wrote %d predictions to %s" % (samples, options.npy))
+
+    # Tree weights come from the value map
+    elif mode == 'weighted-vote':
+
+        if value_map is None:
+            parser.error("The %s mode needs a --value-map" % mode)
+
+        if options.parser != 'numpy':
+            parser.error("The %s mode needs the numpy parser" % mode)
+
+        classify_bulk(reports_filename, transformer, options.output_filename,
+                      options.block_size, value_map)
+
+    # Scores come from the report values of the value map
+    elif mode != 'vote':
+
+        if value_map is None:
+            parser.error("The %s mode needs a --value-map" % mode)
+
+        if options.parser != 'numpy':
+            parser.error("The %s mode needs the numpy parser" % mode)
+
+        score_bulk(reports_filename, value_map, options.output_filename,
+                   mode, options.block_size)
+
+    elif options.parser == 'numpy':
+        classify_bulk(reports_filename, transformer, options.output_filename,
+                      options.block_size)
+
+    # Binary reports can only be read in blocks
+    elif reports_filename.endswith('.npy'):
+        parser.error("Binary reports need the numpy parser")
+
+    else:
+        classify(reports_filename, transformer, options.output_filename)
\ No newline at end of file
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+'''
+    The purpose of this program is to convert VASIM text reports into
+    compact binary reports: a .npy array of (cycle, code) records in the
+    narrowest fixed-width fields that hold them. They can be memory
+    mapped with np.load(filename, mmap_mode='r') without any parsing,
+    and passed to classify.py.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+from optparse import OptionParser
+import logging
+import os
+import time
+
+# Import tools
+from tools.reports import convert_text_reports, read_binary_reports
+
+# Turn on logging; let's see what all is going on
+logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
+
+
+# Main()
+if __name__ == '__main__':
+
+    # Parse Command Line Arguments
+    usage = '%prog [options][reports filename]'
+    parser = OptionParser(usage)
+    parser.add_option('-o', '--output', type='string', dest='output',
+                      help='Binary reports output file (defaults to the reports file name with .npy)')
+    parser.add_option('-b', '--block-size', type='int', dest='block_size',
+                      default=1 << 24, help='Bytes of reports parsed at a time')
+    options, args = parser.parse_args()
+
+    if len(args) != 1 or not os.path.isfile(args[0]):
+        parser.error("No valid reports file; provide <reports filename>")
+
+    reports_filename = args[0]
+
+    if options.output is None:
+        options.output = os.path.splitext(reports_filename)[0] + '.npy'
+
+    start_time = time.time()
+
+    count = convert_text_reports(reports_filename, options.output,
+                                 options.block_size)
+
+    elapsed = max(time.time() - start_time, 1e-9)
+
+    logging.info("Converted %d reports in %f seconds: %d bytes -> %d bytes (%s records)" %
+                 (count, elapsed, os.path.getsize(reports_filename),
+                  os.path.getsize(options.output),
+                  str(read_binary_reports(options.output).dtype)))
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+'''
+    The purpose of this program is to check that the automata generated
+    by automatize.py are equivalent to the model, for large test sets.
+
+    For every sample and tree it compares the leaf reached by the sklearn
+    model, the chains matching the encoded input file, and the reports of
+    VASIM-format report files (see tools/equivalence.py). Every mismatch
+    is listed with its sample index, tree id and chain id, and the
+    predictions of all sources are compared.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+from optparse import OptionParser
+import logging
+import sys
+import time
+import numpy as np
+
+# Import tools
+from tools.equivalence import check_equivalence
+from tools.io import load_cftvm, load_model, load_test
+from tools.simulator import load_input
+
+# Turn on logging; let's see what all is going on
+logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
+
+
+# Main()
+if __name__ == '__main__':
+
+    # Parse Command Line Arguments
+    usage = '%prog [options]'
+    parser = OptionParser(usage)
+    parser.add_option('-m', '--model', type='string', dest='model',
+                      default='model.pickle',
+                      help='Input SKLEARN model pickle file')
+    parser.add_option('-c', '--cftvm', type='string', dest='cftvm',
+                      default='cftvm.pickle',
+                      help='Chains pickle dumped by automatize.py --cftvm')
+    parser.add_option('-t', '--test', type='string', dest='test',
+                      default='testing_data.pickle', help='The testing data')
+    parser.add_option('-i', '--input', type='string', dest='input',
+                      default='input_file.bin',
+                      help='The input file written for the testing data')
+    parser.add_option('-r', '--reports', type='string', dest='reports',
+                      action='append', default=[],
+                      help='VASIM-format report file to compare (can be repeated)')
+    parser.add_option('-s', '--samples', type='int', dest='samples',
+                      help='Compare the first <samples> samples (defaults to all)')
+    parser.add_option('-j', '--njobs', type='int', dest='njobs', default=1,
+                      help='Number of processes comparing chunks of samples')
+    parser.add_option('-b', '--batch-size', type='int', dest='batch_size',
+                      help='The number of samples matched at a time')
+    parser.add_option('-o', '--output', type='string', dest='output',
+                      help='Write all mismatches to a CSV file')
+    parser.add_option('-p', '--print', type='int', dest='print_count',
+                      default=10, help='Number of mismatches to print per source')
+    parser.add_option('-v', '--verbose', action='store_true', default=False,
+                      dest='verbose', help='Verbose')
+    options, args = parser.parse_args()
+
+    model = load_model(options.model)
+    chains, ft, value_map, reverse_value_map = load_cftvm(options.cftvm)
+    X_test, y_test = load_test(options.test)
+    data = load_input(options.input)
+
+    start_time = time.time()
+
+    predictions, mismatches =\
+        check_equivalence(model, chains, ft, X_test, data,
+                          n_samples=options.samples,
+                          report_filenames=options.reports,
+                          n_jobs=options.njobs,
+                          batch_size=options.batch_size)
+
+    n_samples = len(predictions['sklearn'])
+
+    logging.info("Compared %d samples x %d trees in %f seconds" %
+                 (n_samples, len(model.estimators_), time.time() - start_time))
+
+    # sklearn averages the probabilities of the trees, which is not always
+    # the majority vote of the trees
+    logging.info("sklearn predict() agrees with the tree votes on %f of the samples" %
+                 np.mean(predictions['sklearn'] == predictions['trees']))
+
+    equivalent = True
+
+    for source, samples, chain_indexes, extra in mismatches:
+
+        agreement = np.mean(predictions[source] == predictions['trees'])
+
+        logging.info("%s: %d mismatched chains in %d samples; %f of the votes agree with the trees" %
+                     (source, len(samples), len(np.unique(samples)),
+                      agreement))
+
+        equivalent &= len(samples) == 0 and agreement == 1
+
+        for sample, chain, is_extra in list(zip(samples, chain_indexes,
+                                                extra))[:options.print_count]:
+
+            logging.info("  sample %d, tree %d, chain %d: %s" %
+                         (sample, chains[chain].tree_id_,
+                          chains[chain].chain_id_,
+                          'unexpected match' if is_extra else 'missing match'))
+
+    if options.output is not None:
+
+        with open(options.output, 'w') as output:
+
+            output.write("source,sample,tree,chain,kind\n")
+
+            for source, samples, chain_indexes, extra in mismatches:
+                for sample, chain, is_extra in zip(samples, chain_indexes,
+                                                   extra):
+                    output.write("%s,%d,%d,%d,%s\n" %
+                                 (source, sample, chains[chain].tree_id_,
+                                  chains[chain].chain_id_,
+                                  'extra' if is_extra else 'missing'))
+
+    if options.verbose:
+        logging.info("Equivalent: %s" % equivalent)
+
+    sys.exit(0 if equivalent else 1)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+'''
+    The purpose of this program is to generate synthetic classification
+    and ranking datasets (see tools/synthetic.py), without network access,
+    as training and testing .npz files for trainEnsemble.py -t/-x.
+
+    Optionally, a synthetic QuickRank XML ensemble is written as well,
+    with thresholds split between the values of the training data, and the
+    testing data is dumped to a pickle for automatize.py, so every stage
+    of the pipeline can be load-tested at any size.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+from optparse import OptionParser
+import logging
+import pickle
+
+# Import tools
+import tools.synthetic as syn
+
+# Turn on logging; let's see what all is going on
+logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
+
+
+# Main()
+if __name__ == '__main__':
+
+    # Parse Command Line Arguments
+    usage = '%prog [options]'
+    parser = OptionParser(usage)
+    parser.add_option('-r', '--rows', type='int', dest='rows', default=10000,
+                      help='Number of training samples')
+    parser.add_option('--test-rows', type='int', dest='test_rows',
+                      default=2000, help='Number of testing samples')
+    parser.add_option('-f', '--features', type='int', dest='features',
+                      default=64, help='Number of features')
+    parser.add_option('-d', '--distribution', type='choice',
+                      dest='distribution', choices=syn.DISTRIBUTIONS,
+                      default='uniform',
+                      help='Feature values: uniform, binary (like OCR) or heavy (heavy tailed, like MSLR)')
+    parser.add_option('--task', type='choice', dest='task', choices=syn.TASKS,
+                      default='classification',
+                      help='classification or ranking')
+    parser.add_option('-c', '--classes', type='int', dest='classes',
+                      help='Number of classes, or relevance grades for ranking (default: 2, or 5 for ranking)')
+    parser.add_option('-q', '--docs-per-query', type='int', dest='docs',
+                      default=100,
+                      help='Documents in every query of a ranking dataset')
+    parser.add_option('--noise', type='float', dest='noise', default=0.1,
+                      help='Label noise, relative to the spread of the hidden scores')
+    parser.add_option('--seed', type='int', dest='seed', default=0,
+                      help='Seed of the dataset and ensemble')
+    parser.add_option('-t', '--train', type='string', dest='train',
+                      default='train.npz', help='Training data .npz file')
+    parser.add_option('-x', '--test', type='string', dest='test',
+                      default='test.npz', help='Testing data .npz file')
+    parser.add_option('--test-pickle', type='string', dest='test_pickle',
+                      help='Also dump the testing data to this pickle for automatize.py (e.g. testing_data.pickle)')
+    parser.add_option('--xml', type='string', dest='xml',
+                      help='Also write a synthetic QuickRank XML ensemble to this file')
+    parser.add_option('-n', '--trees', type='int', dest='trees', default=100,
+                      help='Number of trees in the XML ensemble')
+    parser.add_option('--depth', type='int', dest='depth', default=6,
+                      help='Depth of the trees in the XML ensemble')
+    parser.add_option('--thresholds', type='int', dest='thresholds',
+                      default=64,
+                      help='Most thresholds per feature in the XML ensemble')
+    parser.add_option('--skew', type='float', dest='skew', default=1.0,
+                      help='Zipf skew of the features picked by the splits (0 is uniform)')
+    parser.add_option('--shrinkage', type='float', dest='shrinkage',
+                      default=0.1, help='Weight of every tree in the XML ensemble')
+    options, args = parser.parse_args()
+
+    if options.classes is None:
+        options.classes = 5 if options.task == 'ranking' else 2
+
+    if options.classes < 2:
+        parser.error("Provide at least two classes")
+
+    # One hidden model for both splits; the testing queries start fresh
+    X, y, qid = syn.synthetic_dataset(options.rows + options.test_rows,
+                                      options.features, options.distribution,
+                                      options.classes, options.task,
+                                      options.docs, options.noise,
+                                      options.seed)
+
+    X_train, y_train = X[:options.rows], y[:options.rows]
+    X_test, y_test = X[options.rows:], y[options.rows:]
+
+    if qid is None:
+        qid_train = qid_test = None
+    else:
+        qid_train = qid[:options.rows]
+        qid_test = qid[:options.test_rows] + qid_train[-1] + 1
+
+    syn.write_dataset(options.train, X_train, y_train, qid_train)
+    syn.write_dataset(options.test, X_test, y_test, qid_test)
+
+    logging.info("Wrote %d x %d %s %s samples to %s and %d to %s" %
+                 (options.rows, options.features, options.distribution,
+                  options.task, options.train, options.test_rows,
+                  options.test))
+
+    if options.test_pickle is not None:
+
+        with open(options.test_pickle, 'wb') as f:
+            pickle.dump((X_test, y_test), f)
+
+        logging.info("Dumped the testing data to %s" % options.test_pickle)
+
+    if options.xml is not None:
+
+        # The rows are independent; a chunk of them places the thresholds
+        pools = syn.data_pools(X_train[:syn.CHUNK_ROWS], options.thresholds)
+
+        model = syn.synthetic_forest(options.trees, options.depth,
+                                     options.features, skew=options.skew,
+                                     seed=options.seed, pools=pools)
+
+        syn.write_quickrank(options.xml, model, options.shrinkage,
+                            options.seed)
+
+        logging.info("Wrote a %d tree QuickRank ensemble of depth %d to %s" %
+                     (options.trees, options.depth, options.xml))
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+'''
+    The purpose of this program is to run a GPU chains file (written by
+    automatize.py --gpu) on the CPU, so the GPU export can be validated
+    and benchmarked without a GPU.
+
+    Every sample of the input file is predicted with the majority report
+    code of its matching chains, and the predictions are written in the
+    classify.py format (report cycle:classification), where the report
+    cycle is the delimiter closing the sample.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+from optparse import OptionParser
+import logging
+import os
+import time
+import numpy as np
+
+# Import tools
+from tools.evaluator import class_values
+from tools.gputools import gpu_predictions, load_gpu_chains
+from tools.io import load_cftvm, load_test
+from tools.simulator import find_delimiters, load_input
+
+# Turn on logging; let's see what all is going on
+logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
+
+
+# Main()
+if __name__ == '__main__':
+
+    # Parse Command Line Arguments
+    usage = '%prog [options] <gpu chains filename> [input filename]'
+    parser = OptionParser(usage)
+    parser.add_option('-o', '--output', type='string', dest='output',
+                      default='classifications.txt',
+                      help='Classifications output file')
+    parser.add_option('-t', '--test', type='string', dest='test',
+                      help='Testing data to compute the accuracy against')
+    parser.add_option('-c', '--cftvm', type='string', dest='cftvm',
+                      help='Chains pickle (automatize.py --cftvm) mapping the report codes to the classes for the accuracy')
+    parser.add_option('-v', '--verbose', action='store_true', default=False,
+                      dest='verbose', help='Verbose')
+    options, args = parser.parse_args()
+
+    if len(args) == 1:
+        gpu_chains_filename, input_filename = args[0], 'input_file.bin'
+    elif len(args) == 2:
+        gpu_chains_filename, input_filename = args
+    else:
+        parser.error("Provide <gpu chains filename> [input filename]")
+
+    for filename in [gpu_chains_filename, input_filename]:
+        if not os.path.isfile(filename):
+            parser.error("No such file: %s" % filename)
+
+    start_time = time.time()
+
+    network = load_gpu_chains(gpu_chains_filename)
+
+    if options.verbose:
+        logging.info("Loaded GPU chains in %f seconds: %s" %
+                     (time.time() - start_time, str(network)))
+
+    data = load_input(input_filename)
+
+    start_time = time.time()
+
+    predictions = gpu_predictions(network, data)
+
+    elapsed = max(time.time() - start_time, 1e-9)
+
+    logging.info("Predicted %d samples in %f seconds (%f ksamples / second, %f MB/s)" %
+                 (len(predictions), elapsed, len(predictions) / elapsed / 1000.0,
+                  len(data) / elapsed / 1e6))
+
+    # The chains of a sample report on the delimiter closing it
+    report_cycles = find_delimiters(data)[1:]
+
+    with open(options.output, 'w') as output:
+        for index, prediction in enumerate(predictions):
+            if prediction >= 0:
+                output.write("%d:%d\n" % (report_cycles[index], prediction))
+
+    if options.test is not None:
+
+        X_test, y_test = load_test(options.test)
+
+        y_test = np.asarray(y_test)[:len(predictions)]
+
+        # Samples without a matching chain have no class
+        reported = predictions[:len(y_test)] >= 0
+
+        if not reported.all():
+            logging.warning("%d of %d samples matched no chain" %
+                            (len(reported) - reported.sum(), len(reported)))
+
+        classes = predictions[:len(y_test)][reported]
+
+        # Predictions are indexes into the classes
+        if options.cftvm is not None:
+            _, _, _, reverse_value_map = load_cftvm(options.cftvm)
+            classes = class_values(classes, reverse_value_map)
+        else:
+            logging.warning("No --cftvm; assuming the classes are 0..K-1")
+
+        logging.info("Accuracy: %f over %d reporting samples" %
+                     (np.mean(classes == y_test[reported]), reported.sum()))
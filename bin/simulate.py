@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""
+    The purpose of this program is to run an input file through the
+    generated chain network on the CPU and write the resulting reports,
+    in the VASIM text format and/or as a binary array.
+
+    The default engine evaluates whole windows between delimiters; the
+    shift-and engine advances every STE of every chain one symbol at a
+    time with bit-parallel updates, and the reference engine simulates
+    one STE object at a time (slow, for checking the others).
+
+    The network is either parsed from the generated ANML file (-a) or
+    built from the chains pickle dumped by automatize.py --cftvm (-c).
+    ----------------------
+    19 October 2026
+    Version 0.1
+"""
+
+# Utility Imports
+from optparse import OptionParser
+import logging
+import os
+import time
+
+# Import tools
+from tools.io import load_cftvm
+from tools.reports import REPORT_DTYPE, compact_dtype, write_reports
+import tools.reference as reference
+from tools.shards import simulate_sharded
+import tools.shiftand as shiftand
+import tools.simulator as sim
+
+# Turn on logging; let's see what all is going on
+logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
+
+
+# Main()
+if __name__ == '__main__':
+
+    # Parse Command Line Arguments
+    usage = '%prog [options][input filename]'
+    parser = OptionParser(usage)
+    parser.add_option('-a', '--anml', type='string', dest='anml',
+                      help='ANML file generated by automatize.py')
+    parser.add_option('-c', '--cftvm', type='string', dest='cftvm',
+                      help='Chains pickle dumped by automatize.py --cftvm')
+    parser.add_option('-o', '--output', type='string', dest='output',
+                      default='reports.txt',
+                      help='Text (VASIM format) reports output file')
+    parser.add_option('-b', '--binary', type='string', dest='binary',
+                      help='Binary (.npy) reports output file')
+    parser.add_option('--compact', action='store_true', default=False,
+                      dest='compact',
+                      help='Only keep the cycle and code of the binary reports, in the narrowest fields that hold them')
+    parser.add_option('-e', '--engine', type='choice', dest='engine',
+                      choices=['windows', 'shift-and', 'reference'],
+                      default='windows',
+                      help='Simulation engine: windows, shift-and, reference')
+    parser.add_option('-j', '--njobs', type='int', dest='njobs', default=1,
+                      help='Split the input at delimiters into this many shards, simulated by a pool of processes')
+    parser.add_option('--command', type='string', dest='command',
+                      help='Simulate each shard with this VASIM-compatible command instead; {anml}, {input} and {report} are replaced by file names (standard output is the report without {report})')
+    parser.add_option('-v', '--verbose', action='store_true', default=False,
+                      dest='verbose', help='Verbose')
+    options, args = parser.parse_args()
+
+    if len(args) == 0:
+        input_filename = 'input_file.bin'
+    elif len(args) == 1:
+        input_filename = args[0]
+    else:
+        parser.error("Provide a single <input filename>")
+
+    if not os.path.isfile(input_filename):
+        parser.error("No valid input file; provide <input filename>")
+
+    start_time = time.time()
+
+    network = None
+
+    if options.cftvm is not None:
+        chains, ft, value_map, reverse_value_map = load_cftvm(options.cftvm)
+        network = sim.network_from_chains(chains, ft, value_map)
+
+    elif options.anml is not None and options.command is None:
+        network = sim.network_from_anml(options.anml)
+
+    elif options.command is None:
+        parser.error("No network; provide -a <anml file> or -c <cftvm file>")
+
+    if options.command is not None and options.binary is not None:
+        parser.error("Binary reports are only available with the built-in simulator")
+
+    if options.verbose and network is not None:
+        logging.info("Loaded network in %f seconds: %s" %
+                     (time.time() - start_time, str(network)))
+
+    data = sim.load_input(input_filename)
+
+    # Cycles are offsets into the input
+    if options.compact and options.binary is not None:
+        binary_dtype = compact_dtype(len(data), network.codes_.max())
+    else:
+        binary_dtype = REPORT_DTYPE
+
+    start_time = time.time()
+
+    if options.njobs > 1 or options.command is not None:
+
+        # Shard reports are merged in order, with serial run cycles
+        count = simulate_sharded(data, options.njobs, options.output,
+                                 binary_filename=options.binary,
+                                 network=network, engine=options.engine,
+                                 command=options.command,
+                                 anml_filename=options.anml,
+                                 binary_dtype=binary_dtype)
+
+    else:
+
+        if options.engine == 'shift-and':
+            batches = shiftand.simulate_batches(network, data)
+        elif options.engine == 'reference':
+            batches = [reference.simulate(network, data)]
+        else:
+            batches = sim.simulate_batches(network, data)
+
+        # Reports are written out batch by batch as the simulation goes
+        count = write_reports(batches, network,
+                              text_filename=options.output,
+                              binary_filename=options.binary,
+                              binary_dtype=binary_dtype)
+
+    elapsed = max(time.time() - start_time, 1e-9)
+
+    logging.info("Simulated %d symbols in %f seconds (%f MB/s); %d reports" %
+                 (len(data), elapsed, len(data) / elapsed / 1e6, count))
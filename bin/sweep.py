@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+'''
+    The purpose of this program is to sweep the hyperparameters of the
+    trainEnsemble.py models in parallel, and to record the accuracy and
+    the automata cost of every configuration (see tools/sweep.py) in one
+    CSV or JSON file. The configurations on the Pareto front of accuracy,
+    STE count and input bytes per sample are flagged.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+from optparse import OptionParser
+import logging
+import numpy as np
+
+# Model Imports
+from sklearn.model_selection import train_test_split
+
+# Import tools
+import tools.sweep as sw
+
+# Turn on logging; let's see what all is going on
+logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
+
+
+# Parse a comma-separated grid of ints
+def parse_grid(option, opt_str, value, parser):
+
+    setattr(parser.values, option.dest, [int(v) for v in value.split(',')])
+
+
+# Main()
+if __name__ == '__main__':
+
+    # Parse Command Line Arguments
+    usage = '%prog [options]'
+    parser = OptionParser(usage)
+    parser.add_option('-t', '--train', type='string', dest='trainfile',
+                      help='Training Data File (.npz file)')
+    parser.add_option('-x', '--test', type='string', dest='testfile',
+                      help='Testing Data File (.npz file); the training data is split without one')
+    parser.add_option('-m', '--model', type='string', dest='models',
+                      default='rf',
+                      help='Comma-separated models to sweep (rf, brt, ada)')
+    for flag, name, dest, text in [
+            ('-d', '--depth', 'max_depth', 'max depths'),
+            ('-l', '--leaves', 'max_leaf_nodes', 'max leaves'),
+            ('-n', '--tree_n', 'n_estimators', 'tree counts'),
+            ('-k', '--max-thresholds', 'max_thresholds',
+             'max thresholds per feature (trainEnsemble.py -k)')]:
+        parser.add_option(flag, name, type='string', dest=dest,
+                          action='callback', callback=parse_grid,
+                          help='Comma-separated %s' % text)
+    parser.add_option('-j', '--njobs', type='int', dest='njobs', default=1,
+                      help='Number of configurations trained in parallel')
+    parser.add_option('-i', '--iters', type='int', dest='iters', default=10,
+                      help='Number of predict() runs timed per configuration')
+    parser.add_option('-o', '--output', type='string', dest='output',
+                      default='sweep.csv',
+                      help='Results file (.csv, or .json)')
+    parser.add_option('-v', '--verbose', action='store_true', default=False,
+                      dest='verbose', help='Verbose')
+    options, args = parser.parse_args()
+
+    if options.trainfile is None:
+        parser.error("No training data; provide -t <training npz file>")
+
+    if options.n_estimators is None:
+        parser.error("No tree counts; provide -n <num trees,...>")
+
+    if options.max_depth is None and options.max_leaf_nodes is None:
+        parser.error("No tree size; provide -d <max depth,...> or -l <max leaves,...>")
+
+    if options.iters < 1:
+        parser.error("Provide at least one timed run; -i <iters> >= 1")
+
+    models = options.models.lower().split(',')
+
+    for model in models:
+        if model not in sw.MODELS:
+            parser.error("Invalid model %s; provide {'rf', 'brt', 'ada'}" %
+                         model)
+
+    npzfile = np.load(options.trainfile)
+    X, y = npzfile['X'], npzfile['y']
+
+    if options.testfile is None:
+        logging.info("No included test file, so going to split training data")
+        X_train, X_test, y_train, y_test = train_test_split(X, y,
+                                                            test_size=0.33,
+                                                            random_state=42)
+    else:
+        X_train, y_train = X, y
+
+        npzfile = np.load(options.testfile)
+        X_test, y_test = npzfile['X'], npzfile['y']
+
+    configs = sw.grid_configs({'model': models,
+                               'max_depth': options.max_depth,
+                               'max_leaf_nodes': options.max_leaf_nodes,
+                               'n_estimators': options.n_estimators,
+                               'max_thresholds': options.max_thresholds})
+
+    logging.info("Sweeping %d configurations with %d processes" %
+                 (len(configs), options.njobs))
+
+    # Log every configuration as it finishes
+    def log_result(result):
+
+        logging.info("%s: accuracy %f, %d chains, %d STEs, %d bytes/sample, "
+                     "%f ksamples/second" %
+                     (', '.join(['%s=%s' % (name, result[name])
+                                 for name in sw.PARAMETERS
+                                 if result[name] is not None]),
+                      result['accuracy'], result['chains'],
+                      result['ste_count'], result['bytes_per_sample'],
+                      result['ksamples_per_second']))
+
+    results = sw.sweep(configs, X_train, y_train, X_test, y_test,
+                       options.njobs, options.iters,
+                       log_result if options.verbose else None)
+
+    sw.write_results(results, options.output)
+
+    logging.info("Wrote %d results to %s; %d on the Pareto front" %
+                 (len(results), options.output,
+                  sum(result['pareto'] for result in results)))
@@ -80,9 +80,10 @@ if __name__ == "__main__":
             if previous_cycle_count is None:
                 previous_cycle_count = cycle_count
 
+            # The first report of a new cycle starts its class list
             if cycle_count != previous_cycle_count:
                 automata_results.append(max(set(class_list), key=class_list.count))
-                class_list = []
+                class_list = [classification]
                 previous_cycle_count = cycle_count
 
             else:
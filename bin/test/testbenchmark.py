@@ -0,0 +1,103 @@
+from __future__ import absolute_import
+import unittest
+import os
+import pickle
+import tempfile
+import numpy as np
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from tools.benchmark import *
+
+'''
+    This unit test file tests the CPU inference benchmark
+
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Test the benchmark grid and points
+class TestBenchmark(unittest.TestCase):
+
+	def test_grid(self):
+
+		self.assertEqual(batch_sizes(250), [1, 10, 100, 250])
+		self.assertEqual(batch_sizes(100), [1, 10, 100])
+		self.assertEqual(job_counts(6), [1, 2, 4, 6])
+		self.assertEqual(job_counts(1), [1])
+
+	def test_benchmark(self):
+
+		sizes = []
+
+		# A scorer that records the batches it is given
+		scorer = {'predict': lambda X, n_jobs: sizes.append((len(X), n_jobs))}
+
+		points = benchmark(scorer, np.zeros((10, 2)), [3, 20], [1, 2],
+		                   warmup=2, min_batches=5, max_batches=5,
+		                   min_seconds=0)
+
+		self.assertEqual([(p['n_jobs'], p['batch_size'], p['batches'])
+		                  for p in points],
+		                 [(1, 3, 5), (1, 10, 5), (2, 3, 5), (2, 10, 5)])
+
+		# Warmup and timed batches, all full size
+		self.assertEqual(sizes[:7], [(3, 1)] * 7)
+
+		for point in points:
+			self.assertTrue(point['p50_latency'] <= point['p99_latency'])
+
+	def test_predict_threaded(self):
+
+		pools = {}
+
+		X = np.arange(10)[:, np.newaxis]
+
+		self.assertEqual(list(predict_threaded(lambda x: x[:, 0] * 2, X, 3,
+		                                       pools)),
+		                 list(range(0, 20, 2)))
+
+
+	def test_threading(self):
+
+		X = np.random.RandomState(0).rand(60, 3)
+		y = (X[:, 0] > 0.5).astype(np.int64)
+
+		for model, threading in [(RandomForestClassifier(n_estimators=3), 'sklearn'),
+		                         (GradientBoostingClassifier(n_estimators=3), 'pool')]:
+
+			model.fit(X, y)
+
+			filename = tempfile.mkstemp(suffix='.pickle')[1]
+
+			with open(filename, 'wb') as f:
+				pickle.dump(model, f)
+
+			scorer = load_scorer(filename)
+			os.remove(filename)
+
+			# Boosting has no n_jobs; its batches are split across threads
+			self.assertEqual(scorer['threading'], threading)
+			self.assertTrue(np.array_equal(scorer['predict'](X, 4),
+			                               model.predict(X)))
+
+	def test_scaling_exponent(self):
+
+		sizes = [10, 20, 40, 80]
+
+		self.assertAlmostEqual(scaling_exponent(sizes, [s * 0.1 for s in sizes]),
+		                       1.0)
+		self.assertAlmostEqual(scaling_exponent(sizes, [s * s for s in sizes]),
+		                       2.0)
+
+	def test_measure(self):
+
+		result, seconds, peak, before = measure(lambda n: np.ones(n).sum(),
+		                                        1 << 20)
+
+		self.assertEqual(result, 1 << 20)
+		self.assertTrue(seconds >= 0)
+		self.assertTrue(peak >= before > 0)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from tools.binning import *
+
+'''
+    This unit test file tests the quantile binning of automata-aware training
+
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Test training on at most K thresholds per feature
+class TestBinning(unittest.TestCase):
+
+	def setUp(self):
+
+		random = np.random.RandomState(0)
+
+		self.X = random.rand(500, 4)
+		self.y = (self.X[:, 0] + self.X[:, 1] > 1).astype(int)
+
+	def test_quantile_edges(self):
+
+		edges = quantile_edges(np.array([[1, 5], [2, 5], [3, 5], [4, 5],
+		                                 [5, 5]]), 2)
+
+		self.assertEqual([list(e) for e in edges], [[2, 3], []])
+
+		# Every edge falls between two bins
+		bins = bin_features(np.array([[2, 0], [2.5, 0], [9, 0]]), edges)
+
+		self.assertEqual(list(bins[:, 0]), [0, 1, 2])
+
+	def test_unbin_thresholds(self):
+
+		edges = quantile_edges(self.X, 4)
+
+		model = RandomForestClassifier(n_estimators=5, random_state=0)
+		model.fit(bin_features(self.X, edges), self.y)
+
+		binned = model.predict(bin_features(self.X, edges))
+
+		unbin_thresholds(model, edges)
+
+		# The raw features take the same paths as their bins
+		self.assertEqual(list(model.predict(self.X)), list(binned))
+
+		for tree in ensemble_trees(model):
+			for node in np.flatnonzero(tree.children_left >= 0):
+				self.assertIn(tree.threshold[node], edges[tree.feature[node]])
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,196 @@
+import unittest
+import os
+import tempfile
+import threading
+from classify import classify, classify_bulk, classify_stream,\
+	predict_samples, score_bulk
+import numpy as np
+from tools.reports import compact_dtype, convert_text_reports, majority,\
+	parse_text_block
+
+'''
+    This unit test file tests the majority voter in classify.py
+
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Test classify() on a small report file
+class TestClassify(unittest.TestCase):
+
+	def setUp(self):
+
+		self.reports = ["5 : 0t_0l_2r : 2", "5 : 1t_0l_3r : 3",
+		                "5 : 2t_1l_3r : 3", "9 : 0t_1l_3r : 3",
+		                "9 : 1t_1l_1r : 1", "14 : 0t_2l_1r : 1"]
+
+	# Classify the reports with a classify function; returns the lines
+	def run_classify(self, classify_function, lines):
+
+		handle, reports_filename = tempfile.mkstemp()
+		os.close(handle)
+
+		handle, output_filename = tempfile.mkstemp()
+		os.close(handle)
+
+		try:
+
+			with open(reports_filename, 'w') as f:
+				f.write('\n'.join(lines) + '\n')
+
+			classify_function(reports_filename, lambda x: x - 1,
+			                  output_filename)
+
+			with open(output_filename, 'r') as f:
+				return f.read().split()
+
+		finally:
+			os.remove(reports_filename)
+			os.remove(output_filename)
+
+	def test_classify(self):
+
+		# Ties go to the classification reported first
+		self.assertEqual(self.run_classify(classify, self.reports),
+		                 ['5:2', '9:2', '14:0'])
+
+	def test_classify_bulk(self):
+
+		# Blocks of 20 bytes split the reports of every cycle; lines that
+		# are not reports are skipped
+		classify_blocks = lambda r, t, o: classify_bulk(r, t, o, 20)
+
+		self.assertEqual(self.run_classify(classify_blocks, ["Reports:"] +
+		                                   self.reports),
+		                 ['5:2', '9:2', '14:0'])
+
+	def test_weighted_vote(self):
+
+		# Trees 1 and 2 weigh half of tree 0: cycle 5 ties between codes 2
+		# and 3, won by code 2, reported first
+		value_map = {'mode': 'weighted-vote',
+		             'values': {1: 0, 2: 1, 3: 2},
+		             'tree_weights': {0: 1.0, 1: 0.5, 2: 0.5}}
+
+		classify_weighted = lambda r, t, o: classify_bulk(r, t, o, 20,
+		                                                  value_map)
+
+		self.assertEqual(self.run_classify(classify_weighted, self.reports),
+		                 ['5:1', '9:2', '14:0'])
+
+	def test_classify_stream(self):
+
+		reports_read, reports_write = os.pipe()
+		output_read, output_write = os.pipe()
+
+		reports = os.fdopen(reports_read, 'rb')
+		output = os.fdopen(output_write, 'w')
+		results = os.fdopen(output_read, 'r')
+
+		# Windows of 4 cycles; 3 trees report at every sample
+		voter = threading.Thread(target=classify_stream,
+		                         args=(reports, lambda x: x - 1, output, 4, 3))
+		voter.start()
+
+		# The first sample is written as soon as its 3 trees reported
+		os.write(reports_write, ('\n'.join(self.reports[:3]) + '\n').encode())
+		self.assertEqual(results.readline().strip(), '5:2')
+
+		os.write(reports_write, ('\n'.join(self.reports[3:]) + '\n').encode())
+		os.close(reports_write)
+
+		voter.join()
+		output.close()
+
+		self.assertEqual(results.read().split(), ['9:2', '14:0'])
+
+		reports.close()
+		results.close()
+
+	def test_predict_samples(self):
+
+		cycles, codes = parse_text_block(('\n'.join(self.reports)).encode())
+
+		# Samples of 4 cycles report on cycles 4, 8, 12, ...; the last two
+		# samples have no reports
+		predictions = predict_samples([(cycles, codes - 1)], majority, 5, 4,
+		                              -1)
+
+		self.assertEqual(list(predictions), [2, 2, 0, -1, -1])
+
+	def test_parse_text_block(self):
+
+		cycles, codes = parse_text_block(b"12 : 0t_1l_2r : 2\n 7: x : 31")
+
+		self.assertEqual(list(cycles), [12, 7])
+		self.assertEqual(list(codes), [2, 31])
+
+		cycles, codes, trees = parse_text_block(b"3 : 14t_1l_2r : 2\n", True)
+
+		self.assertEqual(list(trees), [14])
+
+		cycles, codes, trees, chains = parse_text_block(
+			b"3 : 14t_105l_2r : 2\n4 : 0t_7l_1r : 1", True, True)
+
+		self.assertEqual(list(trees), [14, 0])
+		self.assertEqual(list(chains), [105, 7])
+
+	def test_score_bulk(self):
+
+		# Codes 1, 2, 3 are worth 0.5, 1, -1; trees 1 and 2 weigh twice
+		# tree 0
+		value_map = {'mode': 'weighted-sum',
+		             'values': {1: 0.5, 2: 1.0, 3: -1.0},
+		             'tree_weights': {0: 1.0, 1: 2.0, 2: 2.0}}
+
+		for mode, expected in [('weighted-sum', ['5:-3.0', '9:0.0', '14:0.5']),
+		                       ('mean', ['5:-1.0', '9:0.0', '14:0.5'])]:
+
+			score = lambda r, t, o: score_bulk(r, value_map, o, mode, 20)
+			scores = self.run_classify(score, self.reports)
+
+			self.assertEqual(scores, expected)
+
+	def test_convert_text_reports(self):
+
+		handle, reports_filename = tempfile.mkstemp()
+		os.close(handle)
+
+		handle, binary_filename = tempfile.mkstemp(suffix='.npy')
+		os.close(handle)
+
+		try:
+
+			with open(reports_filename, 'w') as f:
+				f.write('\n'.join(self.reports) + '\n')
+
+			self.assertEqual(convert_text_reports(reports_filename,
+			                                      binary_filename, 20), 6)
+
+			reports = np.load(binary_filename, mmap_mode='r')
+
+			self.assertEqual(reports.dtype, compact_dtype(14, 3))
+			self.assertEqual(list(reports['cycle']), [5, 5, 5, 9, 9, 14])
+			self.assertEqual(list(reports['code']), [2, 3, 3, 3, 1, 1])
+
+			del reports
+
+			# classify.py reads the binary reports like the text ones
+			classifications = self.run_classify(
+				lambda r, t, o: classify_bulk(binary_filename, t, o), [])
+
+		finally:
+			os.remove(reports_filename)
+			os.remove(binary_filename)
+
+		self.assertEqual(classifications, ['5:2', '9:2', '14:0'])
+
+	def test_compact_dtype(self):
+
+		self.assertEqual(compact_dtype(1 << 32, 1).itemsize, 10)
+		self.assertEqual(compact_dtype(1, 1 << 16).itemsize, 8)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+import tools.pipeline as pipe
+from tools.equivalence import *
+
+'''
+    This unit test file tests the model / chains / reports equivalence
+    harness
+
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Test the harness on a small random forest
+class TestEquivalence(unittest.TestCase):
+
+	def setUp(self):
+
+		random = np.random.RandomState(0)
+
+		X = random.randint(0, 20, (200, 4)).astype(np.float64)
+		y = (X[:, 0] + X[:, 1] > 20).astype(np.int64) + (X[:, 2] > 10)
+
+		self.model = RandomForestClassifier(n_estimators=3, max_depth=4,
+		                                    random_state=0).fit(X, y)
+		self.X = X[:50]
+
+		self.chains, threshold_map, value_map, reverse_value_map =\
+			pipe.trees_to_chains(self.model, [e.tree_ for e in
+			                                  self.model.estimators_], False)
+
+		self.ft = pipe.build_feature_table(pipe.sort_thresholds(threshold_map))
+
+		pipe.set_character_sets(self.chains, self.ft)
+		pipe.sort_and_combine(self.chains)
+
+		handle, filename = tempfile.mkstemp()
+		os.close(handle)
+
+		try:
+			self.ft.input_file(self.X, filename)
+			self.data = np.fromfile(filename, dtype=np.uint8)
+		finally:
+			os.remove(filename)
+
+	def test_chains(self):
+
+		predictions, mismatches = check_equivalence(
+			self.model, self.chains, self.ft, self.X, self.data, chunk_size=16)
+
+		source, samples, chains, extra = mismatches[0]
+
+		self.assertEqual(len(samples), 0)
+		self.assertEqual(list(predictions['chains']),
+		                 list(predictions['trees']))
+
+	def test_reports(self):
+
+		delimiters = np.flatnonzero(self.data == 255)
+		leaves = self.model.apply(self.X[:10])
+
+		expected = [[chain.chain_id_ for chain in self.chains if
+		             leaves[sample, chain.tree_id_] == chain.leaf_id_]
+		            for sample in range(10)]
+
+		# Drop the first chain of sample 0, and add a chain to sample 3
+		missing = expected[0].pop(0)
+		extra = [chain.chain_id_ for chain in self.chains if
+		         chain.chain_id_ not in expected[3]][0]
+		expected[3].append(extra)
+
+		handle, filename = tempfile.mkstemp()
+		os.close(handle)
+
+		try:
+			with open(filename, 'w') as reports:
+				for sample in range(10):
+					for chain in sorted(expected[sample]):
+						code = self.chains[chain].value_ + 1
+						reports.write("%d : %dt_%dl_%dr : %d\n" %
+						              (delimiters[sample + 1],
+						               self.chains[chain].tree_id_, chain,
+						               code, code))
+
+			# Parse the reports in blocks of a few lines across the pool
+			predictions, mismatches = check_equivalence(
+				self.model, self.chains, self.ft, self.X, self.data,
+				n_samples=10, report_filenames=[filename], n_jobs=2,
+				report_block_size=64)
+		finally:
+			os.remove(filename)
+
+		source, samples, chains, extra_flags = mismatches[1]
+
+		self.assertEqual(source, filename)
+		self.assertEqual(list(zip(samples, chains, extra_flags)),
+		                 [(0, missing, False), (3, extra, True)])
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,155 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+from classes.chain import Chain, Node
+from classes.featureTable import FeatureTable
+import tools.pipeline as pipe
+from tools.circuitTools import generate_circuits, load_circuits, parse_labels
+from tools.evaluator import *
+
+'''
+    This unit test file tests the vectorized chain evaluator
+
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Test the evaluator on the three chains of a small tree
+class TestEvaluator(unittest.TestCase):
+
+	# f0 <= 1.5 -> 0; f0 > 1.5 and f1 <= 2.5 -> 1; otherwise -> 2
+	def setUp(self):
+
+		self.ft = FeatureTable({0: [1.5, 3.5], 1: [2.5]})
+
+		self.chains = []
+
+		for value, nodes in enumerate([[(0, 1.5, False)],
+		                               [(0, 1.5, True), (1, 2.5, False)],
+		                               [(0, 1.5, True), (1, 2.5, True)]]):
+
+			chain = Chain(0)
+			chain.set_chain_id(value)
+			chain.set_value(value)
+
+			for feature, threshold, gt in nodes:
+				chain.add_node(Node(feature, threshold, gt))
+
+			self.chains.append(chain)
+
+		pipe.set_character_sets(self.chains, self.ft)
+		pipe.sort_and_combine(self.chains)
+
+		self.X = np.array([[0, 0], [1.5, 9], [2, 2.5], [4, 3], [1.6, -1]])
+
+	def test_encode(self):
+
+		handle, filename = tempfile.mkstemp()
+		os.close(handle)
+
+		try:
+			self.ft.input_file(self.X, filename)
+			data = np.fromfile(filename, dtype=np.uint8)
+		finally:
+			os.remove(filename)
+
+		symbols = self.ft.encode(self.X)
+
+		self.assertEqual(data[1:].tolist(),
+		                 np.column_stack((symbols, np.full(len(self.X), 255))
+		                                 ).ravel().tolist())
+
+	def test_predict(self):
+
+		predictions = predict(self.chains, self.ft, self.X)
+
+		self.assertEqual(list(predictions), [0, 0, 1, 2, 1])
+
+		# Classes 3, 5 and 9 have report codes 1, 2 and 3
+		self.assertEqual(list(class_values(predictions, {1: 3, 2: 5, 3: 9})),
+		                 [3, 3, 5, 9, 5])
+
+	# A second tree ties with the first on every sample; like classify.py,
+	# the class of the matching chain reported first (lowest id) wins
+	def test_ties(self):
+
+		for chain in self.chains:
+			chain.set_chain_id(chain.chain_id_ + 2)
+
+		# f0 <= 1.5 -> 2; otherwise -> 0
+		for chain_id, (value, gt) in enumerate([(2, False), (0, True)]):
+
+			chain = Chain(1)
+			chain.set_chain_id(chain_id)
+			chain.set_value(value)
+			chain.add_node(Node(0, 1.5, gt))
+
+			self.chains.append(chain)
+
+		pipe.set_character_sets(self.chains, self.ft)
+		pipe.sort_and_combine(self.chains)
+
+		self.assertEqual(list(predict(self.chains, self.ft, self.X)),
+		                 [2, 2, 0, 0, 0])
+
+		lo, hi = chain_intervals(self.chains, self.ft)
+		votes = value_votes([chain.value_ for chain in self.chains])
+		matches = match_chains(self.ft.encode(self.X), lo, hi)
+
+		# Sample 0 ties between classes 0 and 2
+		self.assertEqual(list(np.dot(matches, votes)[0]), [1, 0, 1])
+
+		# Without chain ids, the first tree's chains are reported first
+		self.assertEqual(list(majority_vote(matches, votes)), [0, 0, 1, 2, 1])
+
+	def test_one_match_per_tree(self):
+
+		lo, hi = chain_intervals(self.chains, self.ft)
+		matches = match_chains(self.ft.encode(self.X), lo, hi)
+
+		self.assertEqual(list(matches.sum(axis=1)), [1] * len(self.X))
+
+	def test_stream_symbols(self):
+
+		symbols = self.ft.encode(self.X)
+		data = np.column_stack((np.full(len(self.X), 255), symbols)).ravel()
+
+		self.assertEqual(stream_symbols(np.append(data, 255),
+		                                symbols.shape[1]).tolist(),
+		                 symbols.tolist())
+
+	def test_parse_labels(self):
+
+		# '0-4041-79' only splits one way in ranges [0, 50) and [40, 90)
+		self.assertEqual(parse_labels('0-4041-79', [(0, 50), (40, 90)]),
+		                 [(0, 40), (41, 79)])
+		self.assertEqual(parse_labels('12', [(0, 10), (0, 10)]), [(1, 1),
+		                                                          (2, 2)])
+		self.assertEqual(parse_labels('1-2', [(0, 2)]), None)
+
+	def test_circuits(self):
+
+		handle, filename = tempfile.mkstemp()
+		os.close(handle)
+
+		try:
+			generate_circuits(self.chains, self.ft, None, filename)
+			ft, chain_ids, values, lo, hi = load_circuits(filename)
+		finally:
+			os.remove(filename)
+
+		expected_lo, expected_hi = chain_intervals(self.chains, self.ft)
+
+		self.assertEqual(ft.permutation_, self.ft.permutation_)
+		self.assertEqual(chain_ids, [0, 1, 2])
+		self.assertEqual(lo.tolist(), expected_lo.tolist())
+		self.assertEqual(hi.tolist(), expected_hi.tolist())
+		self.assertEqual(list(predict_symbols(ft.encode(self.X), lo, hi,
+		                                      value_votes(values), False)),
+		                 [0, 0, 1, 2, 1])
+
+
+if __name__ == '__main__':
+	unittest.main()
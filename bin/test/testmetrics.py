@@ -0,0 +1,87 @@
+import unittest
+import json
+import os
+import tempfile
+import numpy as np
+from tools.metrics import *
+
+'''
+    This unit test file tests the stage metrics of automatize.py
+
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Test the stages and counters of Metrics, and that NullMetrics does nothing
+class TestMetrics(unittest.TestCase):
+
+	def test_stages(self):
+
+		metrics = Metrics()
+
+		with metrics.stage('sum'):
+			np.ones(1 << 20).sum()
+
+		with metrics.stage('sum'):
+			pass
+
+		metrics.count('trees', 3)
+
+		stage = metrics.stages_['sum']
+
+		self.assertTrue(stage['wall_seconds'] >= 0)
+		self.assertTrue(stage['cpu_seconds'] >= 0)
+		self.assertTrue(stage['peak_rss'] > 0)
+		self.assertEqual(list(metrics.counters_.items()), [('trees', 3)])
+
+		filename = tempfile.mkstemp(suffix='.json')[1]
+		metrics.write(filename)
+
+		with open(filename, 'r') as f:
+			results = json.load(f)
+
+		os.remove(filename)
+
+		self.assertEqual(list(results['stages']), ['sum'])
+		self.assertEqual(results['counters'], {'trees': 3})
+
+	def test_profile(self):
+
+		directory = tempfile.mkdtemp()
+		metrics = Metrics(profile_stage='sort', profile_directory=directory)
+
+		with metrics.stage('sort'):
+			sorted(range(1000), reverse=True)
+
+		self.assertEqual(metrics.profile_file_,
+		                 os.path.join(directory, 'sort.prof'))
+		self.assertTrue(os.path.isfile(metrics.profile_file_))
+
+		os.remove(metrics.profile_file_)
+		os.rmdir(directory)
+
+	def test_exception(self):
+
+		metrics = Metrics()
+
+		with self.assertRaises(ValueError):
+			with metrics.stage('fail'):
+				raise ValueError
+
+		self.assertTrue('fail' in metrics.stages_)
+
+	def test_null(self):
+
+		metrics = NullMetrics()
+
+		self.assertFalse(metrics.enabled)
+
+		with metrics.stage('sum'):
+			metrics.count('trees', 3)
+
+		self.assertFalse(hasattr(metrics, 'stages_'))
+
+
+if __name__ == '__main__':
+	unittest.main()
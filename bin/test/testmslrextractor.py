@@ -0,0 +1,104 @@
+import unittest
+import os
+import sys
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'data'))
+
+from mslrExtractor import *
+
+'''
+    This unit test file tests the chunked MSLR / svmlight parser
+
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# A small svmlight file: a comment-only header, a sparse row with a
+# trailing comment, a row without a qid, CRLF endings, a blank line and
+# no final newline
+SVMLIGHT = (b'# features: 4\r\n'
+            b'2 qid:7 1:0.5 3:1.5 # doc a\r\n'
+            b'0 qid:7 2:2.0 4:-1.0 1:3.0\n'
+            b'\n'
+            b'1 4:8.25\n'
+            b'3 qid:9 2:4.5')
+
+X_EXPECTED = np.array([[0.5, 0.0, 1.5, 0.0],
+                       [3.0, 2.0, 0.0, -1.0],
+                       [0.0, 0.0, 0.0, 8.25],
+                       [0.0, 4.5, 0.0, 0.0]], dtype=np.float32)
+
+# Test the sample count and parse of svmlight files in chunks
+class TestMSLRExtractor(unittest.TestCase):
+
+	def setUp(self):
+
+		self.filename = self.write(SVMLIGHT)
+
+	def tearDown(self):
+
+		os.remove(self.filename)
+
+	def write(self, data):
+
+		handle, filename = tempfile.mkstemp(suffix='.txt')
+
+		with os.fdopen(handle, 'wb') as f:
+			f.write(data)
+
+		return filename
+
+	def parse(self, filename, chunk_bytes):
+
+		rows = count_rows(filename, chunk_bytes)
+
+		X = np.zeros((rows, 4), dtype=np.float32)
+		y = np.zeros(rows, dtype=np.float32)
+		qid = np.zeros(rows, dtype=np.int64)
+
+		parse_file(filename, X, y, qid, chunk_bytes)
+
+		return X, y, qid
+
+	def test_parse(self):
+
+		# Tiny chunks split lines across chunk boundaries
+		for chunk_bytes in [CHUNK_BYTES, 7, 1]:
+
+			X, y, qid = self.parse(self.filename, chunk_bytes)
+
+			self.assertTrue(np.array_equal(X, X_EXPECTED))
+			self.assertEqual(list(y), [2, 0, 1, 3])
+			self.assertEqual(list(qid), [7, 7, 0, 9])
+
+	def test_extract(self):
+
+		prefix = self.filename[:-4]
+
+		filename, rows, size, seconds = extract(self.filename, prefix, 4, 5)
+
+		self.assertEqual((rows, size), (4, len(SVMLIGHT)))
+		self.assertTrue(np.array_equal(np.load(prefix + '.X.npy'), X_EXPECTED))
+		self.assertEqual(list(np.load(prefix + '.qid.npy')), [7, 7, 0, 9])
+
+		for suffix in ['.X.npy', '.y.npy', '.qid.npy']:
+			os.remove(prefix + suffix)
+
+	def test_out_of_range(self):
+
+		for line in [b'1 qid:1 5:1.0\n', b'1 qid:1 0:1.0\n']:
+
+			filename = self.write(line)
+
+			with self.assertRaises(ValueError):
+				self.parse(filename, CHUNK_BYTES)
+
+			os.remove(filename)
+
+
+if __name__ == '__main__':
+	unittest.main()
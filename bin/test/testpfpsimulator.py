@@ -0,0 +1,70 @@
+import unittest
+import numpy as np
+from classes.chain import Chain, Node
+from tools.pfpsimulator import *
+
+'''
+    This unit test file tests the floating-point MNRL chain simulator
+
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Test the simulator on the three chains of a small tree
+class TestPFPSimulator(unittest.TestCase):
+
+	# f0 <= 1.5 -> 0; f0 > 1.5 and f1 <= 2.5 -> 1; otherwise -> 2
+	def setUp(self):
+
+		self.chains = []
+
+		for value, nodes in enumerate([[(0, 1.5, False)],
+		                               [(0, 1.5, True), (1, 2.5, False)],
+		                               [(0, 1.5, True), (1, 2.5, True)]]):
+
+			chain = Chain(0)
+			chain.set_chain_id(value)
+			chain.set_value(value)
+
+			for feature, threshold, gt in nodes:
+				chain.add_node(Node(feature, threshold, gt))
+
+			self.chains.append(chain)
+
+		self.X = np.array([[0, 0], [1.5, 9], [2, 2.5], [4, 3], [1.6, -1]])
+
+	def test_compile_network(self):
+
+		network = compile_network(self.chains)
+
+		self.assertEqual(list(network['heads']), [0, 1, 3])
+		self.assertEqual(list(network['feature']), [0, 0, 1, 0, 1])
+		self.assertEqual(list(network['gt']), [False, True, False, True,
+		                                       True])
+
+	def test_simulate(self):
+
+		network = compile_network(self.chains)
+
+		samples, report_ids = simulate(network, self.X, batch_size=2)
+
+		self.assertEqual(list(samples), [0, 1, 2, 3, 4])
+		self.assertEqual(list(report_ids), [0, 0, 1, 2, 1])
+
+	def test_predict(self):
+
+		# A chain without nodes has no states, and never reports
+		empty = Chain(1)
+		empty.set_chain_id(3)
+		empty.set_value(2)
+
+		chains = self.chains + [empty]
+		network = compile_network(chains)
+
+		self.assertEqual(list(predict(network, chains, self.X)),
+		                 [0, 0, 1, 2, 1])
+
+
+if __name__ == '__main__':
+	unittest.main()
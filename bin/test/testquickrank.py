@@ -0,0 +1,44 @@
+import unittest
+import numpy as np
+from tools.quickrank import compile_trees, score
+
+'''
+    This unit test file tests the native QuickRank scorer
+
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Test scoring two small trees of different depths
+class TestQuickRankScore(unittest.TestCase):
+
+	def setUp(self):
+
+		# f1 <= 1.5 ? (f2 <= 2.5 ? 1 : 2) : 3
+		first = {'feature': '1', 'threshold': '1.5',
+		         'split': [{'feature': '2', 'threshold': '2.5',
+		                    'split': [{'output': '1'}, {'output': '2'}]},
+		                   {'output': '3'}]}
+
+		# f2 <= 0 ? -1 : 1
+		second = {'feature': '2', 'threshold': '0',
+		          'split': [{'output': '-1'}, {'output': '1'}]}
+
+		self.compiled = compile_trees([(1, 1.0, first), (2, 0.5, second)])
+
+	def test_compile_trees(self):
+
+		self.assertEqual(self.compiled['depth'], 2)
+		self.assertEqual(list(self.compiled['roots']), [0, 5])
+
+	def test_score(self):
+
+		X = np.array([[1, 0], [1.5, 3], [2, 1], [0, 2.5]])
+
+		self.assertEqual(list(score(self.compiled, X, batch_size=3)),
+		                 [0.5, 2.5, 3.5, 1.5])
+
+
+if __name__ == '__main__':
+	unittest.main()
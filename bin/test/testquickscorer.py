@@ -0,0 +1,90 @@
+import unittest
+import numpy as np
+from tools.quickscorer import *
+
+'''
+    This unit test file tests the QuickScorer-style bitvector scorer
+
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Walk a flat tree from the root to the exit leaf of x
+def traverse(tree, x):
+
+	node = 0
+
+	while tree['feature'][node] >= 0:
+
+		if x[tree['feature'][node]] <= tree['threshold'][node]:
+			node = tree['left'][node]
+		else:
+			node = tree['right'][node]
+
+	return tree['values'][node]
+
+
+# Test the scorer against plain tree traversal
+class TestQuickScorer(unittest.TestCase):
+
+	def setUp(self):
+
+		# x0 <= 1.5 ? (x1 <= 2.5 ? 1 : 2) : 3
+		first = flat_tree([0, 1, -1, -1, -1], [1.5, 2.5, 0, 0, 0],
+		                  [1, 2, -1, -1, -1], [4, 3, -1, -1, -1],
+		                  [[0], [0], [1], [2], [3]])
+
+		# x1 <= 2.5 ? 10 : (x0 <= 0.5 ? 20 : 30)
+		second = flat_tree([1, -1, 0, -1, -1], [2.5, 0, 0.5, 0, 0],
+		                   [1, -1, 3, -1, -1], [2, -1, 4, -1, -1],
+		                   [[0], [10], [0], [20], [30]])
+
+		self.trees = [first, second]
+		self.X = np.array([[0, 0], [1.5, 2.5], [1.5, 3], [2, 0], [0.5, 9],
+		                   [0.6, 9]])
+
+	def test_score(self):
+
+		forest = compile_forest(self.trees)
+
+		expected = [sum(traverse(tree, x)[0] for tree in self.trees)
+		            for x in self.X]
+
+		self.assertEqual(list(score(forest, self.X, batch_size=4)[:, 0]),
+		                 expected)
+
+	def test_many_leaves(self):
+
+		# A chain of 100 nodes on one feature spans two words of leaves
+		count = 100
+		feature = [0] * count + [-1] * (count + 1)
+		threshold = list(range(count)) + [0] * (count + 1)
+		left = [count + i for i in range(count)] + [-1] * (count + 1)
+		right = list(range(1, count)) + [2 * count] + [-1] * (count + 1)
+		values = [[0]] * count + [[i] for i in range(count + 1)]
+
+		forest = compile_forest([flat_tree(feature, threshold, left, right,
+		                                   values)])
+
+		self.assertEqual(forest['words'], 2)
+
+		X = np.arange(-1, count + 1, 0.5)[:, np.newaxis]
+
+		self.assertEqual(list(score(forest, X)[:, 0]),
+		                 list(np.clip(np.ceil(X[:, 0]), 0, count)))
+
+	def test_quickrank(self):
+
+		split = {'feature': '2', 'threshold': '1.0',
+		         'split': [{'output': '1.0'}, {'output': '-1.0'}]}
+
+		trees = trees_from_quickrank([(1, 0.5, split)])
+
+		self.assertEqual(list(score(compile_forest(trees),
+		                            np.array([[9, 1], [9, 2]]))[:, 0]),
+		                 [0.5, -0.5])
+
+
+if __name__ == '__main__':
+	unittest.main()
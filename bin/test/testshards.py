@@ -0,0 +1,99 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+from classes.network import ChainNetwork
+from tools.reports import write_reports
+from tools.simulator import simulate
+from tools.shards import *
+
+'''
+    This unit test file tests the sharded simulation
+
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Test sharding on a small looped network and a random stream
+class TestShards(unittest.TestCase):
+
+	def setUp(self):
+
+		rng = np.random.RandomState(0)
+
+		self.network = ChainNetwork(3, 1, 1)
+
+		for chain in range(20):
+			accept = rng.rand(3, 256) < 0.8
+			accept[:, 255] = False
+			self.network.add_chain(0, chain, chain + 1, accept)
+
+		self.network.finalize()
+
+		self.data = rng.randint(0, 255, 5000).astype(np.uint8)
+		self.data[rng.rand(5000) < 0.2] = 255
+		self.data[0] = 255
+
+	def test_shard_bounds(self):
+
+		bounds = shard_bounds(self.data, 7, scan_size=3)
+
+		self.assertEqual(bounds[0][0], 0)
+		self.assertEqual(bounds[-1][1], len(self.data))
+
+		for (start, end), (next_start, next_end) in zip(bounds[:-1],
+		                                                bounds[1:]):
+			self.assertEqual(self.data[next_start], 255)
+			self.assertEqual(end, next_start + 1)
+
+	def test_simulate_sharded(self):
+
+		handle, serial = tempfile.mkstemp()
+		os.close(handle)
+		handle, sharded = tempfile.mkstemp()
+		os.close(handle)
+
+		try:
+			write_reports([simulate(self.network, self.data)], self.network,
+			              serial)
+
+			count = simulate_sharded(self.data, 4, sharded,
+			                         network=self.network)
+
+			with open(serial) as f:
+				expected = f.read()
+
+			with open(sharded) as f:
+				self.assertEqual(f.read(), expected)
+
+			self.assertEqual(count, expected.count('\n'))
+
+		finally:
+			os.remove(serial)
+			os.remove(sharded)
+
+	def test_merge_text_reports(self):
+
+		handle, shard = tempfile.mkstemp()
+		os.close(handle)
+		handle, merged = tempfile.mkstemp()
+		os.close(handle)
+
+		try:
+			with open(shard, 'w') as f:
+				f.write("header\n5 : 0t_0l_1r : 1\n")
+
+			merge_text_reports([shard, shard], [0, 100], merged)
+
+			with open(merged) as f:
+				self.assertEqual(f.read(), "header\n5 : 0t_0l_1r : 1\n"
+				                 "105 : 0t_0l_1r : 1\n")
+
+		finally:
+			os.remove(shard)
+			os.remove(merged)
+
+
+if __name__ == '__main__':
+	unittest.main()
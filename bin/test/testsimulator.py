@@ -0,0 +1,143 @@
+import os
+import unittest
+import numpy as np
+from classes.network import ChainNetwork
+from tools.simulator import *
+import tools.gputools as gputools
+import tools.reference as reference
+import tools.shiftand as shiftand
+
+'''
+    This unit test file tests the chain network simulator
+
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Test the simulator on a small looped network
+class TestSimulator(unittest.TestCase):
+
+	# Two chains of 3 STEs; loop from STE 2 back to STE 1, report from STE 1
+	def setUp(self):
+
+		self.network = ChainNetwork(3, 1, 1)
+
+		first = np.zeros((3, 256), dtype=bool)
+		first[0, 0:10] = True
+		first[1, 0:10] = True
+		first[2, 0:10] = True
+
+		second = np.zeros((3, 256), dtype=bool)
+		second[0, 5:20] = True
+		second[1, 0:5] = True
+		second[2, 0:254] = True
+
+		self.network.add_chain(0, 0, 1, first)
+		self.network.add_chain(0, 1, 2, second)
+		self.network.finalize()
+
+	def test_parse_character_class(self):
+
+		accept = parse_character_class(r"[\x00-\x0A\x0F]")
+
+		self.assertEqual(list(np.flatnonzero(accept)), list(range(11)) + [15])
+
+	def test_window_states(self):
+
+		self.assertEqual(list(self.network.window_states(4)), [0, 1, 2, 1])
+		self.assertEqual(self.network.window_states(3), None)
+		self.assertEqual(self.network.window_states(0), None)
+
+	def test_simulate(self):
+
+		# Windows of length 4 can report, the window of length 3 can not
+		data = np.array([255, 1, 2, 3, 4, 255, 6, 1, 9, 2, 255, 1, 1, 1, 255,
+		                 7, 3, 100, 2, 255], dtype=np.uint8)
+
+		cycles, chains = simulate(self.network, data)
+
+		self.assertEqual(list(cycles), [5, 10, 10, 19])
+		self.assertEqual(list(chains), [0, 0, 1, 1])
+		self.assertEqual(self.network.report_ids(), ["0t_0l_1r", "0t_1l_2r"])
+
+	def test_engines(self):
+
+		# Includes an empty window and a symbol no STE accepts
+		data = np.array([255, 1, 2, 3, 4, 255, 255, 6, 1, 9, 2, 255, 1, 1,
+		                 1, 255, 7, 3, 100, 254, 255, 0, 0, 0, 0, 0, 0, 255],
+		                dtype=np.uint8)
+
+		cycles, chains = simulate(self.network, data)
+
+		for engine in [shiftand.simulate_batches,
+		               lambda n, d: [reference.simulate(n, d)]]:
+
+			results = list(engine(self.network, data))
+
+			self.assertEqual(list(np.concatenate([r[0] for r in results])),
+			                 list(cycles))
+			self.assertEqual(list(np.concatenate([r[1] for r in results])),
+			                 list(chains))
+
+	def test_shift_down(self):
+
+		bits = np.zeros((1, 2), dtype=np.uint64)
+		bits[0, 1] = np.uint64(1) << np.uint64(4)
+
+		shifted = shiftand.shift_down(bits, 10, np.empty_like(bits))
+
+		self.assertEqual(list(shifted[0]), [1 << 58, 0])
+
+	def test_unpack_matches(self):
+
+		matches = np.zeros((2, 2), dtype=np.uint64)
+		bits = np.zeros((2, 128), dtype=bool)
+		bits[0, [0, 63, 64]] = True
+		bits[1, [7, 127]] = True
+		matches.view(np.uint8)[:] = np.packbits(bits, axis=1)
+
+		rows, chains = unpack_matches(matches)
+
+		self.assertEqual(list(rows), [0, 0, 0, 1, 1])
+		self.assertEqual(list(chains), [0, 63, 64, 7, 127])
+
+	def test_gpu_chains(self):
+
+		# The GPU format has no end of loop; a chain matches any window
+		# its STEs accept every symbol of
+		filename = 'test_gpu_chains.txt'
+
+		with open(filename, 'w') as gpu_file:
+			gpu_file.write("2\n3\n1\n4\n")
+			gpu_file.write("0t_0l_1r\n[\\x00-\\x09]\n[\\x00-\\x09]\n[\\x00-\\x09]\n")
+			gpu_file.write("1t_0l_2r\n[\\x05-\\x13]\n[\\x00-\\x04]\n[\\x00-\\xFD]\n")
+
+		network = gputools.load_gpu_chains(filename)
+		os.remove(filename)
+
+		self.assertEqual(network.end_loop_, None)
+		self.assertEqual(list(network.window_states(2)), [0, 1])
+
+		data = np.array([255, 1, 2, 255, 6, 1, 9, 2, 255, 50, 255, 9, 255],
+		                dtype=np.uint8)
+
+		cycles, chains = simulate(network, data)
+
+		for engine in [shiftand.simulate_batches,
+		               lambda n, d: [reference.simulate(n, d)]]:
+
+			results = list(engine(network, data))
+
+			self.assertEqual(list(np.concatenate([r[0] for r in results])),
+			                 list(cycles))
+			self.assertEqual(list(np.concatenate([r[1] for r in results])),
+			                 list(chains))
+
+		# Window 1 is a tie, won by the chain reported first
+		self.assertEqual(list(gputools.gpu_predictions(network, data)),
+		                 [0, 0, -1, 0])
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from tools.sweep import *
+
+'''
+    This unit test file tests the hyperparameter sweep helpers
+
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Test the configuration grid and the Pareto front
+class TestSweep(unittest.TestCase):
+
+	def test_grid_configs(self):
+
+		configs = grid_configs({'model': ['rf'], 'max_depth': [4, 8],
+		                        'n_estimators': [10, 20],
+		                        'max_thresholds': None})
+
+		self.assertEqual(len(configs), 4)
+		self.assertEqual(configs[1], {'model': 'rf', 'max_depth': 4,
+		                              'max_leaf_nodes': None,
+		                              'n_estimators': 20,
+		                              'max_thresholds': None})
+
+	def test_ignored_parameters(self):
+
+		configs = grid_configs({'model': ['rf', 'ada'], 'max_depth': [3, 5],
+		                        'n_estimators': [10]})
+
+		# AdaBoost ignores max_depth: one configuration, without a depth
+		self.assertEqual([(c['model'], c['max_depth']) for c in configs],
+		                 [('rf', 3), ('rf', 5), ('ada', None)])
+
+	def test_pareto_front(self):
+
+		results = [{'accuracy': 0.9, 'ste_count': 2, 'bytes_per_sample': 10},
+		           {'accuracy': 0.8, 'ste_count': 1, 'bytes_per_sample': 10},
+		           {'accuracy': 0.8, 'ste_count': 2, 'bytes_per_sample': 10},
+		           {'accuracy': 0.9, 'ste_count': 2, 'bytes_per_sample': 10}]
+
+		# The third is beaten by both the first and second; ties stay
+		self.assertEqual(pareto_front(results), [True, True, False, True])
+
+
+if __name__ == '__main__':
+	unittest.main()
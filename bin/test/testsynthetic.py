@@ -0,0 +1,134 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+import tools.quickrank as qr
+from tools.synthetic import *
+
+'''
+    This unit test file tests the synthetic forests and datasets
+
+    ----------------------
+    19 October 2026
+    Version 0.2
+'''
+
+# Test the shape and consistency of synthetic forests
+class TestSynthetic(unittest.TestCase):
+
+	def setUp(self):
+
+		self.model = synthetic_forest(5, 4, 3, thresholds=8, skew=1.0,
+		                              classes=3, seed=1)
+
+	# Check that every node of a tree tests within its ancestors' bounds
+	def check_node(self, tree, node, lo, hi):
+
+		feature = tree.feature[node]
+
+		if feature == -2:
+			self.assertEqual(tree.children_left[node], -1)
+			self.assertTrue(tree.value[node].sum() > 0)
+			return 1
+
+		threshold = tree.threshold[node]
+
+		self.assertTrue(lo[feature] < threshold < hi[feature])
+
+		left_hi = dict(hi)
+		left_hi[feature] = threshold
+		right_lo = dict(lo)
+		right_lo[feature] = threshold
+
+		return self.check_node(tree, tree.children_left[node], lo, left_hi) +\
+			self.check_node(tree, tree.children_right[node], right_lo, hi)
+
+	def test_forest(self):
+
+		self.assertEqual(len(self.model.estimators_), 5)
+		self.assertEqual(list(self.model.classes_), [0, 1, 2])
+
+		for estimator in self.model.estimators_:
+
+			tree = estimator.tree_
+
+			bounds = dict((f, np.inf) for f in range(3))
+			leaves = self.check_node(tree, 0,
+			                         dict((f, -np.inf) for f in range(3)),
+			                         bounds)
+
+			self.assertEqual(leaves, np.count_nonzero(tree.feature == -2))
+			self.assertEqual(tree.value.shape, (len(tree.feature), 1, 3))
+
+	def test_feature_probabilities(self):
+
+		self.assertEqual(list(feature_probabilities(4, 0)), [0.25] * 4)
+
+		probabilities = feature_probabilities(3, 1.0)
+
+		self.assertAlmostEqual(probabilities[0], 2 * probabilities[1])
+
+	def test_datasets(self):
+
+		for distribution in DISTRIBUTIONS:
+
+			X, y, qid = synthetic_dataset(500, 6, distribution, classes=3,
+			                              seed=2)
+
+			self.assertEqual(X.shape, (500, 6))
+			self.assertEqual(X.dtype, np.float32)
+			self.assertEqual(set(y), set([0, 1, 2]))
+			self.assertTrue(qid is None)
+
+		X, y, qid = synthetic_dataset(500, 6, 'binary', seed=2)
+		self.assertEqual(set(np.unique(X)), set([0.0, 1.0]))
+
+		X, y, qid = synthetic_dataset(500, 6, 'heavy', seed=2)
+		self.assertTrue((X >= 0).all() and (X == 0).any())
+
+		# Same seed, same dataset
+		self.assertTrue(np.array_equal(X, synthetic_dataset(500, 6, 'heavy',
+		                                                    seed=2)[0]))
+
+	def test_ranking(self):
+
+		X, y, qid = synthetic_dataset(1000, 4, task='ranking', classes=5,
+		                              docs_per_query=30, seed=3)
+
+		self.assertEqual(list(qid[:31]), [0] * 30 + [1])
+		self.assertEqual(qid[-1], 999 // 30)
+
+		# Most documents are irrelevant, few are perfect
+		counts = np.bincount(y, minlength=5)
+		self.assertTrue(counts[0] > counts[1] > counts[4] > 0)
+
+	def test_quickrank(self):
+
+		X = synthetic_samples(200, 3, seed=4)
+		pools = data_pools(X, 8)
+
+		self.assertEqual([len(pool) for pool in pools], [8, 8, 8])
+
+		model = synthetic_forest(4, 3, 3, seed=4, pools=pools)
+
+		filename = tempfile.mkstemp(suffix='.xml')[1]
+		write_quickrank(filename, model, shrinkage=0.5)
+
+		trees = qr.grab_data(qr.load_qr(filename))
+		os.remove(filename)
+
+		self.assertEqual([(tree_id, weight) for tree_id, weight, split in trees],
+		                 [(1, 0.5), (2, 0.5), (3, 0.5), (4, 0.5)])
+
+		# One-based features, thresholds from the pools
+		split = trees[0][2]
+		feature = int(split['feature'])
+
+		self.assertTrue(1 <= feature <= 3)
+		self.assertTrue(float(split['threshold']) in pools[feature - 1])
+
+		self.assertEqual(qr.score(qr.compile_trees(trees), X).shape, (200,))
+
+
+if __name__ == '__main__':
+	unittest.main()
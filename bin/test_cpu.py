@@ -1,53 +1,36 @@
 #!/usr/bin/env python
 '''
-    The purpose of this program is to test the Scikit-Learn model
-    on your CPU to get throughput results.
-    
+    The purpose of this program is to benchmark a Scikit-Learn model or a
+    QuickRank XML ensemble on your CPU (see tools/benchmark.py): the
+    per-batch latency percentiles and the throughput over batch sizes and
+    thread counts, written to a JSON file.
+
     ----------------------
     Author: Tom Tracy II
     email: tjt7a@virginia.edu
     University of Virginia
     ----------------------
     12 June 2017
-    Version 0.2
+    Version 0.3
 '''
 
 # Utility Imports
 from optparse import OptionParser
 import logging
-import pickle
-import time
+
+# Import tools
+import tools.benchmark as bench
+from tools.io import load_test
 
 # Turn on logging; let's see what all is going on
 logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
 
 
-# Load a sklearn model from a file
-def load_model(modelfile):
-
-    # Read the modelfile pickle
-    try:
-        with open(modelfile, 'rb') as f:
-            model = pickle.load(f)
-    except IOError as e:
-        print "I/O error({0}): {1}".format(e.errno, e.strerror)
-        exit(-1)
-
-    return model
-
+# Parse a comma-separated list of ints
+def parse_list(option, opt_str, value, parser):
 
-# Load testing data
-def load_test(testfile):
+    setattr(parser.values, option.dest, [int(v) for v in value.split(',')])
 
-    # Read the testing data in to be used to generate a symbol file
-    try:
-        with open(testfile, 'rb') as f:
-            X_test, y_test = pickle.load(f)
-    except IOError as e:
-        print "I/O error({0}): {1}".format(e.errno, e.strerror)
-        exit(-1)
-
-    return X_test, y_test
 
 # Main()
 if __name__ == '__main__':
@@ -57,78 +40,61 @@ if __name__ == '__main__':
     parser = OptionParser(usage)
     parser.add_option('-m', '--model', type='string', dest='model',
                       default='model.pickle',
-                      help='Input SKLEARN model pickle file')
+                      help='Input SKLEARN model pickle file or QuickRank XML file')
     parser.add_option('-t', '--test', type='string', dest='test',
                       default='testing_data.pickle', help='The testing data')
-    parser.add_option('-n', '--numiter', type='float', dest='iters',
+    parser.add_option('-e', '--engine', type='choice', dest='engine',
+                      choices=['sklearn', 'quickrank', 'quickscorer'],
+                      help='The scorer (sklearn or quickscorer for SKLEARN models, quickrank or quickscorer for QuickRank)')
+    parser.add_option('-n', '--numiter', type='int', dest='iters',
                       default=1000,
-                      help='The number of times the test is run to get data')
-    parser.add_option('-j', '--njobs', type='int', dest='njobs',
-                      help='The number of threads to execute the model')
+                      help='The most batches timed per batch size and thread count')
+    parser.add_option('-b', '--batch-sizes', type='string', dest='sizes',
+                      action='callback', callback=parse_list,
+                      help='Comma-separated batch sizes (default: 1, 10, 100, ... up to all samples)')
+    parser.add_option('-j', '--njobs', type='string', dest='jobs',
+                      action='callback', callback=parse_list,
+                      help='Comma-separated thread counts (default: 1, 2, 4, ... up to all cores)')
+    parser.add_option('-w', '--warmup', type='int', dest='warmup', default=3,
+                      help='Untimed batches run before timing each point')
+    parser.add_option('-s', '--seconds', type='float', dest='seconds',
+                      default=1.0,
+                      help='The least time spent timing each point')
+    parser.add_option('-o', '--output', type='string', dest='output',
+                      default='reports/cpu_benchmark.json',
+                      help='JSON results file')
     parser.add_option('-v', '--verbose', action='store_true', default=False,
                       dest='verbose', help='Verbose')
     options, args = parser.parse_args()
 
-    logging.info("Running CPU throughput test %d times with model %s" %
-                 (options.iters, options.model))
-
-    if options.model is None:
-        print(usage)
-        exit(-1)
-    else:
-        model = load_model(options.model)
+    scorer = bench.load_scorer(options.model, options.engine)
 
-    if model.max_leaf_nodes is not None:
-    	logging.info("Model: nTrees: %d, nLeaves:%d, nJobs: %d" %
-        	     (model.n_estimators, model.max_leaf_nodes, model.n_jobs))
-    else:
-        logging.info("Model: nTrees: %d, maxDepth:%d, nJobs: %d" %
-		     (model.n_estimators, model.max_depth, model.n_jobs))
+    logging.info("Model: %s, %d trees, %s engine" %
+                 (scorer['model'], scorer['trees'], scorer['engine']))
 
     # Load data
     X_test, y_test = load_test(options.test)
     logging.info("Test Data: %d samples x %d features" % (X_test.shape))
 
-    # Grab the constituent estimators
-    trees = model.estimators_
-
-    # If we only have one, let's do a test on of the trees
-    if len(trees) == 1:
-        logging.info("Only one tree in the Forest; running seperate test")
-
-        if options.njobs is None:
-            logging.info("Because there is only one tree, we cannot parallelize")
-
-        start_time = time.time()
-
-        for i in range(int(options.iters)):
-            trees[0].predict(X_test)
-
-        end_time = time.time()
-
-        avg_time = (end_time - start_time) / options.iters
-        print("Avg Time for D-Tree: ", avg_time)
-
-        throughput = float(X_test.shape[0]) / avg_time
-        kthroughput = throughput / 1000.0
-
-        logging.info("D-Tree Throughput: %d kSamples / second" % (kthroughput))
-    else:
-
-        if options.njobs is not None:
-            model.n_jobs = options.njobs
-
-        start_time = time.time()
+    # Log every point as it finishes
+    def log_point(point):
 
-        for i in range(int(options.iters)):
-            model.predict(X_test)
+        logging.info("n_jobs %d, batch %d: p50 %f s, p99 %f s, "
+                     "%f ksamples / second" %
+                     (point['n_jobs'], point['batch_size'],
+                      point['p50_latency'], point['p99_latency'],
+                      point['ksamples_per_second']))
 
-        end_time = time.time()
+    points = bench.benchmark(scorer, X_test, options.sizes, options.jobs,
+                             log_point, warmup=options.warmup,
+                             max_batches=options.iters,
+                             min_seconds=options.seconds)
 
-        avg_time = (end_time - start_time) / options.iters
-        print("Avg Time: ", avg_time)
+    bench.write_benchmark(scorer, X_test, points, options.output)
 
-        throughput = float(X_test.shape[0]) / avg_time
-        kthroughput = throughput / 1000.0
+    best = max(points, key=lambda point: point['ksamples_per_second'])
 
-        logging.info("RF Throughput: %f ksamples / second" % (kthroughput))
+    logging.info("Best Throughput: %f ksamples / second (n_jobs %d, batch %d)"
+                 % (best['ksamples_per_second'], best['n_jobs'],
+                    best['batch_size']))
+    logging.info("Wrote %d points to %s" % (len(points), options.output))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+'''
+    The purpose of this program is to test the chains generated by
+    automatize.py on your CPU to get throughput results, by matching
+    them directly against the encoded testing data (see tools/evaluator.py).
+
+    The chains come from the pickle dumped by automatize.py --cftvm.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+from optparse import OptionParser
+import logging
+import time
+import numpy as np
+
+# Import tools
+from tools.io import load_cftvm, load_test
+import tools.evaluator as evaluator
+
+# Turn on logging; let's see what all is going on
+logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
+
+
+# Main()
+if __name__ == '__main__':
+
+    # Parse Command Line Arguments
+    usage = '%prog [options]'
+    parser = OptionParser(usage)
+    parser.add_option('-c', '--cftvm', type='string', dest='cftvm',
+                      default='cftvm.pickle',
+                      help='Chains pickle dumped by automatize.py --cftvm')
+    parser.add_option('-t', '--test', type='string', dest='test',
+                      default='testing_data.pickle', help='The testing data')
+    parser.add_option('-n', '--numiter', type='int', dest='iters',
+                      default=10,
+                      help='The number of times the test is run to get data')
+    parser.add_option('-b', '--batch-size', type='int', dest='batch_size',
+                      help='The number of samples matched at a time')
+    parser.add_option('-v', '--verbose', action='store_true', default=False,
+                      dest='verbose', help='Verbose')
+    options, args = parser.parse_args()
+
+    chains, ft, value_map, reverse_value_map = load_cftvm(options.cftvm)
+
+    X_test, y_test = load_test(options.test)
+    logging.info("Test Data: %d samples x %d features" % (X_test.shape))
+
+    # Compile the chains once; only encoding and matching are timed
+    lo, hi = evaluator.chain_intervals(chains, ft)
+    votes, scores = evaluator.vote_matrix(chains, value_map)
+    chain_ids = [chain.chain_id_ for chain in chains]
+
+    logging.info("Chains: %d chains x %d symbols per sample" % lo.shape)
+
+    logging.info("Running CPU chain throughput test %d times" % options.iters)
+
+    start_time = time.time()
+
+    for i in range(options.iters):
+
+        # QuickRank features are based at index = 1
+        symbols = ft.encode(X_test, onebased=value_map is not None)
+
+        predictions = evaluator.predict_symbols(symbols, lo, hi, votes,
+                                                scores, options.batch_size,
+                                                chain_ids)
+
+    end_time = time.time()
+
+    avg_time = (end_time - start_time) / options.iters
+
+    if options.verbose:
+        logging.info("Avg Time: %f seconds" % avg_time)
+
+    if not scores:
+
+        # Predictions are indexes into the classes
+        predictions = evaluator.class_values(predictions, reverse_value_map)
+
+        logging.info("Accuracy: %f" %
+                     np.mean(predictions == np.asarray(y_test)))
+
+    logging.info("Chain Throughput: %f samples / second" %
+                 (X_test.shape[0] / avg_time))
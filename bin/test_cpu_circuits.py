@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+'''
+    The purpose of this program is to test the circuit file written by
+    automatize.py --circuit on your CPU, to estimate the performance of
+    a circuit implementation and check the file against the model.
+
+    The feature table is rebuilt from the thresholds in the header of the
+    circuit file, and every chain is matched against the encoded samples
+    (see tools/evaluator.py). The samples are either the testing data,
+    encoded with the header's thresholds, or the symbols of an input file.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+from optparse import OptionParser
+import logging
+import time
+import numpy as np
+
+# Import tools
+from tools.circuitTools import load_circuits
+from tools.io import load_cftvm, load_test
+from tools.simulator import load_input
+import tools.evaluator as evaluator
+
+# Turn on logging; let's see what all is going on
+logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
+
+
+# Main()
+if __name__ == '__main__':
+
+    # Parse Command Line Arguments
+    usage = '%prog [options]'
+    parser = OptionParser(usage)
+    parser.add_option('-c', '--circuits', type='string', dest='circuits',
+                      default='circuits.txt',
+                      help='Circuit file written by automatize.py --circuit')
+    parser.add_option('-t', '--test', type='string', dest='test',
+                      help='The testing data (default: testing_data.pickle without -i; with -i, only to compute the accuracy)')
+    parser.add_option('-i', '--input', type='string', dest='input',
+                      help='Match the symbols of this input file instead of encoding the testing data')
+    parser.add_option('-q', '--quickrank', action='store_true',
+                      default=False, dest='quickrank',
+                      help='The circuits come from a QuickRank model')
+    parser.add_option('--unrolled', action='store_true', default=False,
+                      dest='unrolled',
+                      help='The circuits come from automatize.py --circuit --unrolled')
+    parser.add_option('--cftvm', type='string', dest='cftvm',
+                      help='Chains pickle (automatize.py --cftvm) mapping the chain values to the classes for the accuracy, and giving the tree weights of QuickRank chains')
+    parser.add_option('-n', '--numiter', type='int', dest='iters',
+                      default=10,
+                      help='The number of times the test is run to get data')
+    parser.add_option('-b', '--batch-size', type='int', dest='batch_size',
+                      help='The number of samples matched at a time')
+    parser.add_option('-v', '--verbose', action='store_true', default=False,
+                      dest='verbose', help='Verbose')
+    options, args = parser.parse_args()
+
+    start_time = time.time()
+
+    ft, chain_ids, values, lo, hi = load_circuits(options.circuits,
+                                                  options.unrolled)
+
+    logging.info("Circuits: %d chains x %d symbols per sample (%d STEs)" %
+                 (lo.shape + (ft.ste_count_,)))
+
+    if options.verbose:
+        logging.info("Loaded the circuits in %f seconds" %
+                     (time.time() - start_time))
+
+    reverse_value_map = None
+
+    if options.cftvm is not None:
+
+        chains, _, _, reverse_value_map = load_cftvm(options.cftvm)
+
+        # The circuit file has no tree weights; the chains do
+        if options.quickrank:
+
+            weights = dict((chain.chain_id_, chain.tree_weight_) for chain in
+                           chains if chain.tree_weight_ is not None)
+
+            values = values * np.array([weights.get(chain_id, 1.0) for
+                                        chain_id in chain_ids])
+
+    elif options.quickrank:
+        logging.warning("No --cftvm; summing the chain values without the tree weights")
+
+    # QuickRank scores are the sum of the weighted chain values
+    votes = evaluator.value_votes(values, options.quickrank)
+
+    if options.test is None and options.input is None:
+        options.test = 'testing_data.pickle'
+
+    # The testing data is only needed to encode samples or for the accuracy
+    if options.test is not None:
+        X_test, y_test = load_test(options.test)
+
+    if options.input is not None:
+
+        data = load_input(options.input)
+        logging.info("Input: %d bytes" % len(data))
+
+    else:
+        logging.info("Test Data: %d samples x %d features" % (X_test.shape))
+
+    logging.info("Running CPU circuit throughput test %d times" %
+                 options.iters)
+
+    start_time = time.time()
+
+    for i in range(options.iters):
+
+        if options.input is not None:
+            symbols = evaluator.stream_symbols(data, lo.shape[1])
+
+        # QuickRank features are based at index = 1
+        else:
+            symbols = ft.encode(X_test, onebased=options.quickrank)
+
+        predictions = evaluator.predict_symbols(symbols, lo, hi, votes,
+                                                options.quickrank,
+                                                options.batch_size, chain_ids)
+
+    end_time = time.time()
+
+    avg_time = (end_time - start_time) / options.iters
+
+    if options.verbose:
+        logging.info("Avg Time: %f seconds" % avg_time)
+
+    if not options.quickrank and options.test is not None and\
+            len(predictions) == len(y_test):
+
+        # Predictions are indexes into the classes
+        if reverse_value_map is not None:
+            predictions = evaluator.class_values(predictions,
+                                                 reverse_value_map)
+        else:
+            logging.warning("No --cftvm; assuming the classes are 0..K-1")
+
+        logging.info("Accuracy: %f" %
+                     np.mean(predictions == np.asarray(y_test)))
+
+    logging.info("Circuit Throughput: %f samples / second" %
+                 (len(predictions) / avg_time))
+
+    if options.input is not None:
+        logging.info("Circuit Throughput: %f MB / second" %
+                     (len(data) / avg_time / 1e6))
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+'''
+    The purpose of this program is to test the floating-point MNRL chains
+    that automatize.py --mnrl exports (chains.mnrl) on your CPU, to get a
+    throughput baseline that needs no feature table encoding.
+
+    The chains are rebuilt from the model exactly as automatize.py builds
+    them before exporting, and run by tools/pfpsimulator.py.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+from optparse import OptionParser
+import logging
+import time
+import numpy as np
+
+# Import tools
+from tools.io import load_test
+import tools.pfpsimulator as pfp
+import tools.pipeline as pipe
+
+# Turn on logging; let's see what all is going on
+logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
+
+
+# Main()
+if __name__ == '__main__':
+
+    # Parse Command Line Arguments
+    usage = '%prog [options]'
+    parser = OptionParser(usage)
+    parser.add_option('-m', '--model', type='string', dest='model',
+                      default='model.pickle',
+                      help='Input SKLEARN model pickle file or QuickRank XML file')
+    parser.add_option('-t', '--test', type='string', dest='test',
+                      default='testing_data.pickle', help='The testing data')
+    parser.add_option('-c', '--csv', type='string', dest='csv',
+                      help='Run the samples of a CSV file (like testing.csv) instead of the testing data')
+    parser.add_option('-n', '--numiter', type='int', dest='iters',
+                      default=10,
+                      help='The number of times the test is run to get data')
+    parser.add_option('-b', '--batch-size', type='int', dest='batch_size',
+                      help='The number of samples run at a time')
+    parser.add_option('-r', '--reports', type='string', dest='reports',
+                      help='Write the reports (sample : report id) to a file')
+    parser.add_option('-v', '--verbose', action='store_true', default=False,
+                      dest='verbose', help='Verbose')
+    options, args = parser.parse_args()
+
+    model, trees, quickrank = pipe.load_trees(options.model)
+
+    chains, threshold_map, value_map, reverse_value_map =\
+        pipe.trees_to_chains(model, trees, quickrank,
+                             verbose=options.verbose)
+
+    network = pfp.compile_network(chains, onebased=quickrank)
+
+    logging.info("MNRL Network: %d chains, %d PFP states" %
+                 (len(network['heads']), len(network['feature'])))
+
+    X_test, y_test = load_test(options.test)
+
+    # testing.csv only keeps 5 significant digits of the features
+    if options.csv is not None:
+        X_test = np.loadtxt(options.csv, delimiter=',', ndmin=2)
+
+    logging.info("Test Data: %d samples x %d features" % (X_test.shape))
+
+    logging.info("Running MNRL throughput test %d times" % options.iters)
+
+    start_time = time.time()
+
+    for i in range(options.iters):
+        predictions = pfp.predict(network, chains, X_test, value_map,
+                                  options.batch_size)
+
+    end_time = time.time()
+
+    avg_time = (end_time - start_time) / options.iters
+
+    if options.verbose:
+        logging.info("Avg Time: %f seconds" % avg_time)
+
+    if not quickrank:
+
+        # Predictions are indexes into the classes
+        predictions = model.classes_[predictions]
+
+        logging.info("Agreement with model.predict(): %f" %
+                     np.mean(predictions == model.predict(X_test)))
+
+        if len(predictions) == len(y_test):
+            logging.info("Accuracy: %f" %
+                         np.mean(predictions == np.asarray(y_test)))
+
+    logging.info("MNRL Throughput: %f samples / second" %
+                 (X_test.shape[0] / avg_time))
+
+    if options.reports is not None:
+
+        samples, report_ids = pfp.simulate(network, X_test, options.batch_size)
+
+        with open(options.reports, 'w') as f:
+            for sample, report_id in zip(samples, report_ids):
+                f.write("%d : %d\n" % (sample, report_id))
+
+        logging.info("Wrote %d reports to %s" % (len(samples),
+                                                 options.reports))
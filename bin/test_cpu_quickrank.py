@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+'''
+    The purpose of this program is to test a QuickRank XML ensemble on
+    your CPU to get throughput results, with the native vectorized
+    scorer in tools/quickrank.py.
+
+    Features in the testing data are based at 1: column 0 is feature 1.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+from optparse import OptionParser
+import logging
+import time
+import numpy as np
+
+# Import tools
+from tools.io import load_test
+import tools.quickrank as qr
+
+# Turn on logging; let's see what all is going on
+logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
+
+
+# Print the throughput of the compiled model, like trainEnsemble.py does
+def print_throughput(compiled_, x_test_, iters_, batch_size_=None):
+
+    logging.info("Model: QuickRank, %d trees, depth %d" %
+                 (len(compiled_['roots']), compiled_['depth']))
+    logging.info("Test Data: %d samples x %d features" % x_test_.shape)
+
+    # Grab the start time
+    start_time = time.time()
+
+    # Do a bunch of predictions
+    for i in range(iters_):
+        scores = qr.score(compiled_, x_test_, batch_size_)
+
+    # Grab the end time
+    end_time = time.time()
+
+    # Grab average time per iterations
+    avg_time = (end_time - start_time) / float(iters_)
+
+    logging.info("Average Time: %f" % avg_time)
+
+    # Throughput = num_feature_vectors / average time per iteration
+    throughput = float(x_test_.shape[0]) / avg_time
+
+    # Metric becomes kilo-samples / sec
+    kthroughput = throughput / 1000.0
+
+    logging.info("Throughput: %f ksamples / second" % kthroughput)
+
+    return scores
+
+
+# Main()
+if __name__ == '__main__':
+
+    # Parse Command Line Arguments
+    usage = '%prog [options]'
+    parser = OptionParser(usage)
+    parser.add_option('-m', '--model', type='string', dest='model',
+                      default='model.xml', help='Input QuickRank XML file')
+    parser.add_option('-t', '--test', type='string', dest='test',
+                      default='testing_data.pickle', help='The testing data')
+    parser.add_option('-n', '--numiter', type='int', dest='iters',
+                      default=10,
+                      help='The number of times the test is run to get data')
+    parser.add_option('-b', '--batch-size', type='int', dest='batch_size',
+                      help='The number of samples scored at a time')
+    parser.add_option('-s', '--scores', type='string', dest='scores',
+                      help='Write the ranking scores to this file, one per line')
+    options, args = parser.parse_args()
+
+    compiled = qr.compile_trees(qr.grab_data(qr.load_qr(options.model)))
+
+    X_test, y_test = load_test(options.test)
+
+    scores = print_throughput(compiled, X_test, options.iters,
+                              options.batch_size)
+
+    if options.scores is not None:
+        np.savetxt(options.scores, scores, fmt='%.9g')
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+'''
+    The purpose of this program is to test a QuickScorer-style bitvector
+    scorer (see tools/quickscorer.py) on your CPU to get throughput
+    results for a sklearn forest or a QuickRank XML ensemble.
+
+    For sklearn models, the predictions are checked against predict().
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+from optparse import OptionParser
+import logging
+import time
+import numpy as np
+
+# Import tools
+from tools.io import load_test
+import tools.pipeline as pipe
+import tools.quickscorer as qs
+
+# Turn on logging; let's see what all is going on
+logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
+
+
+# Main()
+if __name__ == '__main__':
+
+    # Parse Command Line Arguments
+    usage = '%prog [options]'
+    parser = OptionParser(usage)
+    parser.add_option('-m', '--model', type='string', dest='model',
+                      default='model.pickle',
+                      help='Input SKLEARN model pickle file or QuickRank XML file')
+    parser.add_option('-t', '--test', type='string', dest='test',
+                      default='testing_data.pickle', help='The testing data')
+    parser.add_option('-n', '--numiter', type='int', dest='iters',
+                      default=10,
+                      help='The number of times the test is run to get data')
+    parser.add_option('-b', '--batch-size', type='int', dest='batch_size',
+                      help='The number of samples scored at a time')
+    parser.add_option('-v', '--verbose', action='store_true', default=False,
+                      dest='verbose', help='Verbose')
+    options, args = parser.parse_args()
+
+    model, trees, quickrank = pipe.load_trees(options.model)
+
+    start_time = time.time()
+
+    if quickrank:
+        forest = qs.compile_forest(qs.trees_from_quickrank(trees))
+        classes = None
+    else:
+        forest = qs.compile_forest(qs.trees_from_sklearn(model))
+        classes = getattr(model, 'classes_', None)
+
+    logging.info("Compiled %d trees (%d leaf words, %d features) in %f seconds" %
+                 (forest['trees'], forest['words'], len(forest['features']),
+                  time.time() - start_time))
+
+    # Load data
+    X_test, y_test = load_test(options.test)
+    logging.info("Test Data: %d samples x %d features" % (X_test.shape))
+
+    logging.info("Running QuickScorer throughput test %d times" %
+                 options.iters)
+
+    start_time = time.time()
+
+    for i in range(options.iters):
+        predictions = qs.predict(forest, X_test, classes, options.batch_size)
+
+    end_time = time.time()
+
+    avg_time = (end_time - start_time) / options.iters
+
+    if options.verbose:
+        logging.info("Avg Time: %f seconds" % avg_time)
+
+    if not quickrank:
+        logging.info("Agreement with model.predict(): %f" %
+                     np.mean(predictions == model.predict(X_test)))
+
+    throughput = float(X_test.shape[0]) / avg_time
+    kthroughput = throughput / 1000.0
+
+    logging.info("QuickScorer Throughput: %f ksamples / second" % kthroughput)
@@ -1,144 +1,231 @@
 '''
     This module is meant for interfacing with the ANML API
 
-    This module contains two functions:
-    1. generate_anmL(): Generate ANML from the chains
-
+    This module contains three main functions:
+    1. character_ranges(): Generate the accepted labels of each STE of a chain
+    2. character_classes(): Generate the STE character classes of a chain
+    3. generate_anmL(): Generate ANML from the chains
+
+    Chains are rendered in shards; with n_jobs > 1 the shards are rendered
+    by a process pool and written in order between the ANML header and
+    footer, so the output is identical to a serial run.
     ----------------------
     Author: Tom Tracy II
     email: tjt7a@virginia.edu
     University of Virginia
     ----------------------
     12 June 2017
-    Version 0.2
+    Version 0.3
 '''
+from multiprocessing import Pool
+
 from classes.Anml import *
 
+# Shared with the pool workers (inherited through fork)
+_chains = None
+_feature_table = None
+_value_map = None
+_unrolled = False
 
-# Generate ANML code for the provided chains
-def generate_anml(chains, feature_table, value_map, anml_filename,
-                  reverse_value_map=None, unrolled=False):
 
-    anml_net = Anml()
+# Generate the accepted label ranges (one list per STE) for the provided chain
+# Each range is (start, end) inclusive; end is None for a single label
+def character_ranges(chain, feature_table):
 
-    # This code is used to start and report
-    report_symbol = r"[\x%02X]" % 255
+    ranges = [[] for _ste in range(feature_table.ste_count_)]
 
-    # Iterate through all chains
-    for chain in chains:
+    next_node_index = 0
 
-        # character class assignments for STEs start with '[' and end with ']'
-        character_classes = ['[' for _ste in range(feature_table.ste_count_)]
+    # Iterate through all features in the feature_table
+    for _f in feature_table.features_:
 
-        next_node_index = 0
+        # If we're still pointing to a valid node ...
+        if next_node_index < len(chain.nodes_):
 
-        # Iterate through all features in the feature_table
-        for _f in feature_table.features_:
+            # Grab that next node
+            next_node = chain.nodes_[next_node_index]
 
-            # If we're still pointing to a valid node ...
-            if next_node_index < len(chain.nodes_):
+            # If that node has the feature we're looking at...
+            if next_node.feature_ == _f:
 
-                # Grab that next node
-                next_node = chain.nodes_[next_node_index]
+                # If we have multiple STEs assigned to this feature...
+                ste_index = 0
 
-                # If that node has the feature we're looking at...
-                if next_node.feature_ == _f:
+                for _ste, _start, _end in feature_table.get_ranges(_f):
 
-                    # If we have multiple STEs assigned to this feature...
-                    ste_index = 0
+                    for c in next_node.character_sets[ste_index]:
 
-                    for _ste, _start, _end in feature_table.get_ranges(_f):
+                        ranges[_ste].append((c, None))
 
-                        for c in next_node.character_sets[ste_index]:
+                    ste_index += 1
 
-                            character_classes[_ste] += r"\x%02X" % c
+                next_node_index += 1
 
-                    next_node_index += 1
+            # If the node does not have the feature we're looking for
+            else:
 
-                # If the node does not have the feature we're looking for
-                else:
+                for _ste, _start, _end in feature_table.get_ranges(_f):
+
+                    # Feature is not part of chain, accept full range
+                    ranges[_ste].append((_start, _end - 1))
+
+        # We're done with the available features in our chain
+        else:
 
-                    for _ste, _start, _end in feature_table.get_ranges(_f):
+            for _ste, _start, _end in feature_table.get_ranges(_f):
 
-                        # Feature is not part of chain, accept full range
-                        character_classes[_ste] += r"\x%02X-\x%02X" %\
-                            (_start, _end - 1)
+                # Because feature not part of chain, accept full range
+                ranges[_ste].append((_start, _end - 1))
 
-            # We're done with the available features in our chain
+    return ranges
+
+
+# Generate the character class (one per STE) for the provided chain
+def character_classes(chain, feature_table):
+
+    classes = []
+
+    for ste_ranges in character_ranges(chain, feature_table):
+
+        # character class assignments for STEs start with '[' and end with ']'
+        character_class = '['
+
+        for start, end in ste_ranges:
+
+            if end is None:
+                character_class += r"\x%02X" % start
             else:
+                character_class += r"\x%02X-\x%02X" % (start, end)
 
-                for _ste, _start, _end in feature_table.get_ranges(_f):
+        classes.append(character_class + ']')
+
+    return classes
 
-                    # Because feature not part of chain, accept full range
-                    character_classes[_ste] += r"\x%02X-\x%02X" %\
-                        (_start, _end - 1)
 
-        # End character classes with ']'
-        for i in range(len(character_classes)):
-            character_classes[i] += "]"
+# Look up the report code of the chain
+def report_code(chain, value_map):
 
-        # stes for the current chain
-        stes = []
+    # For quickrank
+    if value_map is not None:
 
-        # Start the chain with an id that ends in _s (for start)
-        ste_id = "%dt_%dl_s" % (chain.tree_id_, chain.chain_id_)
+        # Look up the index assigned ot the value
+        return value_map[chain.value_]
 
-        # Have a start ste that matches on 255
-        start_ste = anml_net.AddSTE(report_symbol, AnmlDefs.ALL_INPUT,
-                                    anmlId=ste_id, match=False)
+    # 1 offset needed because the AP can't handle '0' report codes
+    return chain.value_ + 1
 
-        # stes[0] is the start ste that only accepts \xff = 255 in base 10
-        stes.append(start_ste)
 
-        # Now go through each of the remaining STEs
-        for ste_i in range(feature_table.ste_count_):
+# Add the STEs of one chain to the ANML network
+def add_chain(anml_net, chain, feature_table, value_map, unrolled=False):
 
-            # Give them identifiers based on tree id, chain id, and ste id
-            ste_id = "%dt_%dl_%d" % (chain.tree_id_, chain.chain_id_, ste_i)
+    # This code is used to start and report
+    report_symbol = r"[\x%02X]" % 255
 
-            # Add to the list
-            ste = anml_net.AddSTE(character_classes[ste_i], AnmlDefs.NO_START,
-                                  anmlId=ste_id, match=False)
+    ste_classes = character_classes(chain, feature_table)
 
-            # Connect them forward (this is where the loop is made)
-            anml_net.AddAnmlEdge(stes[-1], ste, 0)
+    # stes for the current chain
+    stes = []
 
-            stes.append(ste)
+    # Start the chain with an id that ends in _s (for start)
+    ste_id = "%dt_%dl_s" % (chain.tree_id_, chain.chain_id_)
 
-        # If we are looping
-        if not unrolled:
-            # Our cycle; mapping from end of the chain to the start of the loop
-            anml_net.AddAnmlEdge(stes[-1], stes[feature_table.start_loop_ + 1], 0)
+    # Have a start ste that matches on 255
+    start_ste = anml_net.AddSTE(report_symbol, AnmlDefs.ALL_INPUT,
+                                anmlId=ste_id, match=False)
 
-        # For quickrank
-        if value_map is not None:
+    # stes[0] is the start ste that only accepts \xff = 255 in base 10
+    stes.append(start_ste)
 
-            # Look up the index assigned ot the value
-            report_code = value_map[chain.value_]
+    # Now go through each of the remaining STEs
+    for ste_i in range(feature_table.ste_count_):
 
-            # Reporting STE ID
-            ste_id = "%dt_%dl_%dr" %\
-                (chain.tree_id_, chain.chain_id_, report_code)
+        # Give them identifiers based on tree id, chain id, and ste id
+        ste_id = "%dt_%dl_%d" % (chain.tree_id_, chain.chain_id_, ste_i)
 
-        else:
+        # Add to the list
+        ste = anml_net.AddSTE(ste_classes[ste_i], AnmlDefs.NO_START,
+                              anmlId=ste_id, match=False)
 
-            # 1 offset needed because the AP can't handle '0' report codes
-            report_code = chain.value_ + 1
+        # Connect them forward (this is where the loop is made)
+        anml_net.AddAnmlEdge(stes[-1], ste, 0)
 
-            # Reporting STE ID
-            ste_id = "%dt_%dl_%dr" %\
-                (chain.tree_id_, chain.chain_id_, report_code)
+        stes.append(ste)
 
-        ste = anml_net.AddSTE(report_symbol, AnmlDefs.NO_START,
-                              anmlId=ste_id, reportCode=report_code)
+    # If we are looping
+    if not unrolled:
+        # Our cycle; mapping from end of the chain to the start of the loop
+        anml_net.AddAnmlEdge(stes[-1], stes[feature_table.start_loop_ + 1], 0)
+
+    code = report_code(chain, value_map)
+
+    # Reporting STE ID
+    ste_id = "%dt_%dl_%dr" % (chain.tree_id_, chain.chain_id_, code)
+
+    ste = anml_net.AddSTE(report_symbol, AnmlDefs.NO_START,
+                          anmlId=ste_id, reportCode=code)
+
+    # If we're doing chains, we know the last ste will go to the reporting state
+    if unrolled:
+        anml_net.AddAnmlEdge(stes[-1], ste, 0)
+    else:
+        # Need to add 1 to the index, because the first STE is the starting STE
+        anml_net.AddAnmlEdge(stes[feature_table.end_loop_ + 1], ste, 0)
+
+
+# Render the STEs of chains[start:end] into one block of ANML text
+def render_shard(bounds):
+
+    start, end = bounds
+
+    anml_net = Anml()
+
+    for chain in _chains[start:end]:
+        add_chain(anml_net, chain, _feature_table, _value_map,
+                  unrolled=_unrolled)
+
+    return anml_net.body()
+
+
+# Generate ANML code for the provided chains
+def generate_anml(chains, feature_table, value_map, anml_filename,
+                  reverse_value_map=None, unrolled=False, n_jobs=1,
+                  shard_size=256):
+
+    global _chains, _feature_table, _value_map, _unrolled
+
+    _chains = chains
+    _feature_table = feature_table
+    _value_map = value_map
+    _unrolled = unrolled
+
+    # Each shard is a contiguous range of chains
+    shards = [(start, min(start + shard_size, len(chains)))
+              for start in range(0, len(chains), shard_size)]
+
+    anml_net = Anml()
+
+    with open(anml_filename, 'w') as f:
+
+        f.write(anml_net.header())
+
+        if n_jobs is None or n_jobs > 1:
+
+            # Workers get the chains through fork; only bounds are pickled
+            pool = Pool(n_jobs)
+
+            try:
+                # imap() hands back the blocks in shard order
+                for block in pool.imap(render_shard, shards):
+                    f.write(block)
+            finally:
+                pool.close()
+                pool.join()
 
-        # If we're doing chains, we know the last ste will go to the reporting state
-        if unrolled:
-            anml_net.AddAnmlEdge(stes[-1], ste, 0)
         else:
-            # Need to add 1 to the index, because the first STE is the starting STE
-            anml_net.AddAnmlEdge(stes[feature_table.end_loop_ + 1], ste, 0)
 
-        del stes
+            for shard in shards:
+                f.write(render_shard(shard))
+
+        f.write(anml_net.footer())
 
-    anml_net.ExportAnml(anml_filename)
+    _chains = None
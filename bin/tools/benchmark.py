@@ -0,0 +1,267 @@
+'''
+    The purpose of this module is to benchmark CPU inference of the tree
+    ensembles, as the software baseline of the automata.
+
+    A scorer wraps one way of running a model behind the same interface,
+    predict(X, n_jobs): sklearn forests (predict() with n_jobs threads;
+    models without n_jobs, like boosting, split every batch across a pool
+    of threads), the native QuickRank scorer (tools/quickrank.py) and the
+    QuickScorer baseline (tools/quickscorer.py), the last two splitting
+    every batch across a pool of n_jobs threads.
+
+    Every (n_jobs, batch size) point runs a few warmup batches, then times
+    batches of consecutive test samples one at a time, for at least
+    min_batches batches and min_seconds seconds; the latency percentiles
+    and throughput of the point are reported.
+
+    For the conversion pipeline, measure() times one stage and samples its
+    peak resident memory (tools/metrics.py), and scaling_exponent() fits
+    how the time of a stage grows with the model size.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
+from timeit import default_timer
+import json
+import os
+import numpy as np
+
+# Import tools
+import tools.pipeline as pipe
+import tools.quickrank as qr
+import tools.quickscorer as qs
+from tools.binning import ensemble_trees
+from tools.io import load_model
+from tools.metrics import PeakMemory, machine
+
+# The engines of each kind of model; the first one is the default
+ENGINES = {'sklearn': ['sklearn', 'quickscorer'],
+           'quickrank': ['quickrank', 'quickscorer']}
+
+# The latency percentiles reported
+PERCENTILES = [50, 90, 99]
+
+
+# Split X in n_jobs row blocks and predict them on a pool of threads
+def predict_threaded(predict, X, n_jobs, pools):
+
+    if n_jobs <= 1 or len(X) < 2:
+        return predict(X)
+
+    if n_jobs not in pools:
+        pools[n_jobs] = ThreadPool(n_jobs)
+
+    blocks = np.array_split(X, min(n_jobs, len(X)))
+
+    return np.concatenate(pools[n_jobs].map(predict, blocks))
+
+
+# Load a scorer: a dict with the name of the model and engine and a
+# predict(X, n_jobs) function. sklearn models use the sklearn or
+# quickscorer engine, QuickRank XML models quickrank or quickscorer
+def load_scorer(model_filename, engine=None):
+
+    # Boosted models keep a 2D array of trees, which load_trees() can't read
+    if '.xml' in model_filename:
+        model, trees, quickrank = pipe.load_trees(model_filename)
+    else:
+        model = load_model(model_filename)
+        trees, quickrank = ensemble_trees(model), False
+
+    kind = 'quickrank' if quickrank else 'sklearn'
+
+    if engine is None:
+        engine = ENGINES[kind][0]
+
+    if engine not in ENGINES[kind]:
+        raise ValueError("No %s engine for %s models" % (engine, kind))
+
+    # Thread pools by size, shared by the threaded engines
+    pools = {}
+
+    # How the engine spreads a batch over n_jobs
+    threading = 'pool'
+
+    if engine == 'sklearn' and 'n_jobs' in model.get_params():
+
+        threading = 'sklearn'
+
+        def predict(X, n_jobs):
+            model.n_jobs = n_jobs
+            return model.predict(X)
+
+    # Boosting has no parallel predict()
+    elif engine == 'sklearn':
+
+        def predict(X, n_jobs):
+            return predict_threaded(model.predict, X, n_jobs, pools)
+
+    elif engine == 'quickrank':
+
+        compiled = qr.compile_trees(trees)
+
+        def predict(X, n_jobs):
+            return predict_threaded(lambda x: qr.score(compiled, x), X,
+                                    n_jobs, pools)
+
+    else:
+
+        if quickrank:
+            forest = qs.compile_forest(qs.trees_from_quickrank(trees))
+            classes = None
+        else:
+            forest = qs.compile_forest(qs.trees_from_sklearn(model))
+            classes = getattr(model, 'classes_', None)
+
+        def predict(X, n_jobs):
+            return predict_threaded(lambda x: qs.predict(forest, x, classes),
+                                    X, n_jobs, pools)
+
+    return {'model': os.path.basename(model_filename), 'kind': kind,
+            'engine': engine, 'threading': threading, 'trees': len(trees),
+            'predict': predict}
+
+
+# Batch sizes 1, 10, 100, ... up to and including samples
+def batch_sizes(samples):
+
+    sizes = []
+    size = 1
+
+    while size < samples:
+        sizes.append(size)
+        size *= 10
+
+    return sizes + [samples]
+
+
+# Thread counts 1, 2, 4, ... up to and including the core count
+def job_counts(cores=None):
+
+    if cores is None:
+        cores = cpu_count()
+
+    counts = []
+    count = 1
+
+    while count < cores:
+        counts.append(count)
+        count *= 2
+
+    return counts + [cores]
+
+
+# Time one (n_jobs, batch_size) point of a scorer on X
+# Returns the latency percentiles (seconds) and throughput of the point
+def benchmark_point(scorer, X, batch_size, n_jobs, warmup=3, min_batches=20,
+                    max_batches=1000, min_seconds=1.0):
+
+    batch_size = min(batch_size, len(X))
+
+    # Consecutive batches wrap around the test samples
+    starts = np.arange(0, len(X) - batch_size + 1, batch_size)
+
+    for i in range(warmup):
+        start = starts[i % len(starts)]
+        scorer['predict'](X[start:start + batch_size], n_jobs)
+
+    latencies = []
+    total_start = default_timer()
+
+    while len(latencies) < max_batches and\
+            (len(latencies) < min_batches or
+             default_timer() - total_start < min_seconds):
+
+        start = starts[len(latencies) % len(starts)]
+        batch = X[start:start + batch_size]
+
+        batch_start = default_timer()
+        scorer['predict'](batch, n_jobs)
+        latencies.append(default_timer() - batch_start)
+
+    latencies = np.array(latencies)
+
+    point = {'batch_size': int(batch_size), 'n_jobs': int(n_jobs),
+             'batches': len(latencies),
+             'mean_latency': float(latencies.mean()),
+             'std_latency': float(latencies.std()),
+             'ksamples_per_second':
+             batch_size * len(latencies) / latencies.sum() / 1000.0}
+
+    for percentile in PERCENTILES:
+        point['p%d_latency' % percentile] =\
+            float(np.percentile(latencies, percentile))
+
+    return point
+
+
+# Benchmark a scorer on X over every n_jobs and batch size
+# Returns the points in (n_jobs, batch size) order
+def benchmark(scorer, X, sizes=None, jobs=None, callback=None, **kwargs):
+
+    if sizes is None:
+        sizes = batch_sizes(len(X))
+
+    if jobs is None:
+        jobs = job_counts()
+
+    points = []
+
+    for n_jobs in jobs:
+        for batch_size in sizes:
+
+            points.append(benchmark_point(scorer, X, batch_size, n_jobs,
+                                          **kwargs))
+
+            if callback is not None:
+                callback(points[-1])
+
+    return points
+
+
+# Write the points of a benchmark, with the scorer and machine, to JSON
+def write_benchmark(scorer, X, points, filename):
+
+    directory = os.path.dirname(filename)
+
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    results = {'model': scorer['model'], 'kind': scorer['kind'],
+               'engine': scorer['engine'],
+               'threading': scorer.get('threading'), 'trees': scorer['trees'],
+               'samples': X.shape[0], 'features': X.shape[1],
+               'machine': machine(), 'points': points}
+
+    with open(filename, 'w') as f:
+        json.dump(results, f, indent=1, sort_keys=True)
+
+
+# Run function(*args), sampling the resident memory from a thread
+# Returns (result, seconds, peak resident bytes, resident bytes before)
+def measure(function, *args):
+
+    memory = PeakMemory().start()
+    start = default_timer()
+
+    try:
+        result = function(*args)
+    finally:
+        seconds = default_timer() - start
+        memory.stop()
+
+    return result, seconds, memory.peak_, memory.before_
+
+
+# Fit seconds = c * sizes ** exponent by least squares on log scales
+# Returns the exponent; 1 is linear, 2 quadratic
+def scaling_exponent(sizes, seconds):
+
+    # Stages too fast to time carry no signal
+    seconds = np.maximum(np.asarray(seconds, dtype=np.float64), 1e-6)
+
+    return float(np.polyfit(np.log(sizes), np.log(seconds), 1)[0])
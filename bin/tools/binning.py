@@ -0,0 +1,106 @@
+'''
+    The purpose of this module is to train automata-aware models: every
+    feature is pre-binned on at most K quantile edges, so the trees can
+    only split on those edges and the feature table keeps at most K
+    thresholds per feature.
+
+    The trees are trained on the bin of every value (the number of edges
+    below it), so a split bin <= t is the same test as value <= edge
+    floor(t). Once trained, the thresholds of the trees are rewritten to
+    those edges, and the model predicts on the raw features again.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+import numpy as np
+
+# Import tools
+import tools.pipeline as pipe
+
+
+# The at most max_thresholds quantile edges of every feature of X
+# The edges are values of X (as float32, like sklearn compares them), and
+# the largest value is never an edge, since no split would use it
+def quantile_edges(X, max_thresholds):
+
+    X = np.asarray(X, dtype=np.float32)
+
+    # The inner quantiles, as positions in the sorted values of a feature
+    quantiles = np.linspace(0, 1, max_thresholds + 2)[1:-1]
+    positions = np.floor(quantiles * (len(X) - 1)).astype(np.int64)
+
+    edges = []
+
+    for feature in range(X.shape[1]):
+
+        values = np.unique(X[:, feature])
+
+        # Few enough values to keep all of them
+        if len(values) <= max_thresholds + 1:
+            edges.append(values[:-1])
+            continue
+
+        feature_edges = np.unique(np.sort(X[:, feature])[positions])
+
+        edges.append(feature_edges[feature_edges < values[-1]])
+
+    return edges
+
+
+# The bin of every value of X: the number of edges of its feature below it
+def bin_features(X, edges):
+
+    X = np.asarray(X, dtype=np.float32)
+
+    bins = np.empty(X.shape, dtype=np.float32)
+
+    for feature, feature_edges in enumerate(edges):
+        bins[:, feature] = np.searchsorted(feature_edges, X[:, feature])
+
+    return bins
+
+
+# The decision trees of a sklearn ensemble (boosted ensembles keep a
+# 2D array of them)
+def ensemble_trees(model):
+
+    return [estimator.tree_ for estimator in np.ravel(model.estimators_)]
+
+
+# Rewrite the bin thresholds of a model trained on bin_features() to the
+# edges they stand for, so the model predicts on the raw features
+def unbin_thresholds(model, edges):
+
+    for tree in ensemble_trees(model):
+
+        nodes = np.flatnonzero(tree.children_left >= 0)
+
+        for node in nodes:
+            tree.threshold[node] = edges[tree.feature[node]][
+                int(np.floor(tree.threshold[node]))]
+
+    return model
+
+
+# The automata cost of a sklearn model, like automatize.py builds it:
+# its chain and STE counts, the STEs in the loop of the chains, the
+# cycles (input bytes) per classification and the most thresholds of a
+# feature
+def automata_cost(model):
+
+    chains, threshold_map, value_map, reverse_value_map =\
+        pipe.trees_to_chains(model, ensemble_trees(model), False)
+
+    pipe.sort_thresholds(threshold_map)
+
+    ft = pipe.build_feature_table(threshold_map)
+
+    return {'chains': len(chains),
+            'ste_count': ft.ste_count_,
+            'loop_length': 0 if ft.start_loop_ is None else
+            ft.ste_count_ - ft.start_loop_,
+            'cycles_per_classification': len(ft.permutation_) + 1,
+            'max_feature_thresholds': max(len(thresholds) for thresholds in
+                                          threshold_map.values())}
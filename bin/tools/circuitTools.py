@@ -1,18 +1,32 @@
 '''
     This module is meant for circuit implementations of the RF
 
-    This module contains one function:
+    This module contains these functions:
     1. generate_circuits(): Generate circuits from the chains
     2. export_circuit(): Write the circuits out to a file
+    3. load_circuits(): Read a circuit file back into label intervals
     ----------------------
     Author: Tom Tracy II
     email: tjt7a@virginia.edu
     University of Virginia
     ----------------------
     13 November 2017
-    Version 0.2
+    Version 0.3
 '''
 
+# Utility Imports
+from ast import literal_eval
+from collections import OrderedDict
+import re
+import numpy as np
+
+# Automata Imports
+from classes.featureTable import FeatureTable
+
+# Import tools
+from tools.evaluator import symbol_columns
+
+
 # Write the circuit out to a file
 def export_circuit(filename, circuit, feature_table):
 
@@ -97,4 +111,126 @@ def generate_circuits(chains, feature_table, value_map, filename,
 
     export_circuit(filename, circuit, feature_table)
 
-    return circuit
\ No newline at end of file
+    return circuit
+
+
+# Split the labels string of one STE into the (lo, hi) label interval of
+# each (start, end) range mapped to it; generate_circuits() writes them
+# back to back ('0-4041-79'), so use the ranges to find where each ends
+def parse_labels(string, ranges, position=0):
+
+    if len(ranges) == 0:
+        return [] if position == len(string) else None
+
+    start, end = ranges[0]
+
+    # Labels are at most 3 digits; a '-' always starts the upper label
+    for lo_end in range(position + 3, position, -1):
+
+        if lo_end > len(string) or not string[position:lo_end].isdigit():
+            continue
+
+        if string[lo_end:lo_end + 1] == '-':
+            candidates = [(hi_end, int(string[lo_end + 1:hi_end]))
+                          for hi_end in range(lo_end + 4, lo_end + 1, -1)
+                          if hi_end <= len(string) and
+                          string[lo_end + 1:hi_end].isdigit()]
+        else:
+            candidates = [(lo_end, int(string[position:lo_end]))]
+
+        lo = int(string[position:lo_end])
+
+        for hi_end, hi in candidates:
+
+            if not start <= lo <= hi < end:
+                continue
+
+            rest = parse_labels(string, ranges[1:], hi_end)
+
+            if rest is not None:
+                return [(lo, hi)] + rest
+
+    return None
+
+
+# Read a circuit file written by generate_circuits()
+# The feature table is rebuilt from the thresholds in the header
+# Returns the feature table, the chain ids and values, and the
+# (chains, columns) label intervals like tools.evaluator.chain_intervals()
+def load_circuits(filename, unrolled=False):
+
+    threshold_map = OrderedDict()
+    entries = []
+
+    with open(filename, 'r') as f:
+
+        for line in f:
+
+            line = line.strip()
+
+            if line.startswith('#'):
+
+                # '# <feature> (<count>) -> \t<threshold>,<threshold>,...,'
+                header = re.match(r'#\s*(\d+)\s*\((\d+)\)\s*->(.*)$', line)
+
+                if header is not None:
+                    threshold_map[int(header.group(1))] =\
+                        [float(t) for t in header.group(3).split(',')
+                         if t.strip() != '']
+
+            elif line != '':
+                entries.append(line)
+
+    if len(entries) % 3 != 0:
+        raise ValueError("%s does not hold (id, labels, value) triplets" %
+                         filename)
+
+    ft = FeatureTable(threshold_map, unrolled=unrolled)
+
+    # The (feature, range index, start, end) written to each STE, in order
+    ste_ranges = [[] for _ste in range(ft.ste_count_)]
+
+    for _f in ft.features_:
+        for index, (_ste, _start, _end) in enumerate(ft.get_ranges(_f)):
+            ste_ranges[_ste].append((_f, index, _start, _end))
+
+    columns = symbol_columns(ft)
+
+    chain_ids = []
+    values = []
+    lo = np.zeros((len(entries) // 3, len(columns)), dtype=np.uint8)
+    hi = np.zeros_like(lo)
+
+    for c in range(len(entries) // 3):
+
+        chain_id, labels, value = entries[3 * c:3 * c + 3]
+        labels = literal_eval(labels)
+
+        if len(labels) != ft.ste_count_:
+            raise ValueError("Chain %s has %d STEs, the header has %d" %
+                             (chain_id, len(labels), ft.ste_count_))
+
+        # (feature, range index) -> interval
+        intervals = {}
+
+        for _ste, string in enumerate(labels):
+
+            parsed = parse_labels(string, [(_start, _end) for
+                                           _f, index, _start, _end in
+                                           ste_ranges[_ste]])
+
+            if parsed is None:
+                raise ValueError("Bad labels %s in STE %d of chain %s" %
+                                 (string, _ste, chain_id))
+
+            for (_f, index, _start, _end), interval in zip(ste_ranges[_ste],
+                                                           parsed):
+                intervals[(_f, index)] = interval
+
+        for column, (_f, index, _start, _end) in enumerate(columns):
+            lo[c, column], hi[c, column] = intervals[(_f, index)]
+
+        chain_ids.append(int(chain_id))
+        values.append(float(value))
+
+    return ft, chain_ids, np.array(values), lo, hi
@@ -0,0 +1,260 @@
+'''
+    The purpose of this module is to check, at scale, that the automata
+    we generate are equivalent to the model they come from.
+
+    Every sample reaches one leaf in every tree, and exactly one chain
+    ends in that leaf; it should be the only chain of its tree matching
+    the sample. For every sample and tree we compare:
+    1. the model: the chain of the leaf sklearn's apply() reaches
+    2. the chains: the chains matching the encoded input file
+       (tools/evaluator.py)
+    3. report files: the chains reporting in VASIM-format report files
+    Predictions are compared too: sklearn's predict(), and the majority
+    vote of the trees, of the matching chains and of the reports.
+
+    Samples are compared in chunks by a process pool, which also parses
+    the report files a block of lines at a time.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+from multiprocessing import Pool
+import numpy as np
+
+# Import tools
+from tools.reports import parse_text_block, read_text_blocks
+from tools.simulator import find_delimiters
+import tools.evaluator as evaluator
+
+# Shared with the pool workers (inherited through fork)
+_model = None
+_X = None
+_symbols = None
+_lo = None
+_hi = None
+_leaf_chains = None
+_votes = None
+_chain_ids = None
+_batch_size = None
+
+
+# The (trees, nodes) map from the leaves of every tree to the index of
+# the chain ending in it
+def leaf_chain_map(chains, n_trees):
+
+    if any(getattr(chain, 'leaf_id_', None) is None for chain in chains):
+        raise ValueError("The chains have no leaf ids; "
+                         "dump them again with automatize.py --cftvm")
+
+    leaf_chains = np.full((n_trees, max(chain.leaf_id_ for chain in chains)
+                           + 1), -1, dtype=np.int64)
+
+    for index, chain in enumerate(chains):
+        leaf_chains[chain.tree_id_, chain.leaf_id_] = index
+
+    return leaf_chains
+
+
+# The index of the majority vote of each row of a (samples, chains)
+# matrix; ties go to the class reported first, like classify.py
+def vote(matches, votes):
+
+    return evaluator.majority_vote(matches, votes, _chain_ids)
+
+
+# Pool worker: compare the (start, end) chunk of samples
+def compare_chunk(bounds):
+
+    start, end = bounds
+
+    X = _X[start:end]
+    rows = np.arange(len(X))
+
+    # The chain of the leaf every sample reaches in every tree
+    expected = _leaf_chains[np.arange(_leaf_chains.shape[0]), _model.apply(X)]
+
+    reference = np.zeros((len(X), _lo.shape[0]), dtype=bool)
+    reference[np.repeat(rows, expected.shape[1]), expected.ravel()] = True
+
+    matches = np.empty_like(reference)
+
+    for first, batch in evaluator.match_batches(_symbols[start:end], _lo, _hi,
+                                                _batch_size):
+        matches[first:first + len(batch)] = batch
+
+    # Missing (False) and extra (True) chain matches
+    samples, chains = np.nonzero(matches != reference)
+
+    return (start, expected.astype(np.int32),
+            np.searchsorted(_model.classes_, _model.predict(X)),
+            vote(reference, _votes), vote(matches, _votes),
+            samples + start, chains, matches[samples, chains])
+
+
+# Pool worker: the cycles and chain ids of a block of text report lines
+def parse_reports(block):
+
+    cycles, codes, chain_ids = parse_text_block(block, chains=True)
+
+    return cycles, chain_ids
+
+
+# Compare the reports of a text report file with the expected chains
+# The blocks of the file are parsed by the pool, if there is one
+# Returns the missing and extra (sample, chain) reports, and the majority
+# vote of the reports for every sample
+def compare_reports(reports_filename, delimiters, chains, expected, votes,
+                    pool=None, block_size=1 << 24):
+
+    n_samples, n_trees = expected.shape
+
+    blocks = read_text_blocks(reports_filename, block_size)
+
+    if pool is not None:
+        parsed = list(pool.imap(parse_reports, blocks))
+    else:
+        parsed = [parse_reports(block) for block in blocks]
+
+    cycles = np.concatenate([np.zeros(0, dtype=np.int64)] +
+                            [block_cycles for block_cycles, ids in parsed])
+    chain_ids = np.concatenate([np.zeros(0, dtype=np.int64)] +
+                               [ids for block_cycles, ids in parsed])
+
+    # Report ids hold the chain_id_ of the chains
+    chain_index = np.full(max(chain.chain_id_ for chain in chains) + 1, -1,
+                          dtype=np.int64)
+    chain_index[[chain.chain_id_ for chain in chains]] = np.arange(len(chains))
+
+    # Reports are made on the delimiter closing a sample
+    samples = np.searchsorted(delimiters, cycles) - 1
+    reported = np.where(chain_ids < len(chain_index),
+                        chain_index[np.minimum(chain_ids, len(chain_index) - 1)],
+                        -1)
+
+    keep = (samples >= 0) & (samples < n_samples) & (reported >= 0)
+    samples, reported = samples[keep], reported[keep]
+
+    keys = samples * len(chains) + reported
+    expected_keys = (np.arange(n_samples)[:, np.newaxis] * len(chains) +
+                     expected).ravel()
+
+    missing = np.setdiff1d(expected_keys, keys)
+    extra = np.setdiff1d(keys, expected_keys)
+
+    totals = np.zeros((n_samples, votes.shape[1]))
+    np.add.at(totals, samples, votes[reported])
+
+    # The lowest chain id reporting every class of every sample
+    firsts = np.full(totals.shape, evaluator.NO_CHAIN, dtype=np.int64)
+    np.minimum.at(firsts, (samples, np.argmax(votes[reported], axis=1)),
+                  chain_ids[keep])
+
+    return (missing // len(chains), missing % len(chains),
+            extra // len(chains), extra % len(chains),
+            evaluator.break_ties(totals, firsts))
+
+
+# Compare the model, the chains over the symbols of the input file, and
+# the report files, for the first n_samples samples of X
+# Returns a dict of the predictions of every source, and the list of
+# (source, samples, chains, extra) mismatches
+def check_equivalence(model, chains, ft, X, data, n_samples=None,
+                      report_filenames=(), n_jobs=1, chunk_size=1 << 14,
+                      batch_size=None, report_block_size=1 << 24):
+
+    global _model, _X, _symbols, _lo, _hi, _leaf_chains, _votes, _chain_ids
+    global _batch_size
+
+    lo, hi = evaluator.chain_intervals(chains, ft)
+    symbols = evaluator.stream_symbols(data, lo.shape[1])
+
+    if n_samples is None:
+        n_samples = len(X)
+
+    n_samples = min(n_samples, len(X), len(symbols))
+
+    votes = evaluator.value_votes([chain.value_ for chain in chains])
+
+    _model, _X, _symbols, _lo, _hi, _votes, _batch_size =\
+        model, X, symbols, lo, hi, votes, batch_size
+    _chain_ids = np.array([chain.chain_id_ for chain in chains],
+                          dtype=np.int64)
+    _leaf_chains = leaf_chain_map(chains, len(model.estimators_))
+
+    expected = np.empty((n_samples, len(model.estimators_)), dtype=np.int32)
+    predictions = dict((source, np.empty(n_samples, dtype=np.int64)) for
+                       source in ['sklearn', 'trees', 'chains'])
+    samples = [np.zeros(0, dtype=np.int64)]
+    chain_list = [np.zeros(0, dtype=np.int64)]
+    extra = [np.zeros(0, dtype=bool)]
+
+    bounds = [(start, min(start + chunk_size, n_samples)) for start in
+              range(0, n_samples, chunk_size)]
+
+    # The pool compares the chunks of samples, then parses the reports
+    pool = None
+
+    try:
+
+        if n_jobs > 1 and (len(bounds) > 1 or len(report_filenames) > 0):
+            pool = Pool(n_jobs)
+
+        if pool is not None and len(bounds) > 1:
+            results = pool.imap_unordered(compare_chunk, bounds)
+        else:
+            results = (compare_chunk(chunk) for chunk in bounds)
+
+        for start, chunk_expected, sklearn, trees, chain_votes,\
+                chunk_samples, chunk_chains, chunk_extra in results:
+
+            end = start + len(chunk_expected)
+
+            expected[start:end] = chunk_expected
+            predictions['sklearn'][start:end] = sklearn
+            predictions['trees'][start:end] = trees
+            predictions['chains'][start:end] = chain_votes
+
+            samples.append(chunk_samples)
+            chain_list.append(chunk_chains)
+            extra.append(chunk_extra)
+
+        # Chunks may come back in any order
+        mismatches = [('chains',) + sort_mismatches(np.concatenate(samples),
+                                                    np.concatenate(chain_list),
+                                                    np.concatenate(extra))]
+
+        delimiters = find_delimiters(data)
+
+        for reports_filename in report_filenames:
+
+            missing_samples, missing_chains, extra_samples, extra_chains,\
+                report_votes = compare_reports(reports_filename, delimiters,
+                                               chains, expected, votes, pool,
+                                               report_block_size)
+
+            predictions[reports_filename] = report_votes
+
+            mismatches.append((reports_filename,) + sort_mismatches(
+                np.concatenate((missing_samples, extra_samples)),
+                np.concatenate((missing_chains, extra_chains)),
+                np.arange(len(missing_samples) + len(extra_samples)) >=
+                len(missing_samples)))
+
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    finally:
+        _model, _X, _symbols, _leaf_chains = None, None, None, None
+
+    return predictions, mismatches
+
+
+# Sort (samples, chains, extra) mismatches by sample, then by chain
+def sort_mismatches(samples, chains, extra):
+
+    order = np.lexsort((chains, samples))
+
+    return samples[order], chains[order], extra[order]
@@ -0,0 +1,221 @@
+'''
+    The purpose of this module is to evaluate the chains directly on
+    encoded samples, without simulating the automata cycle by cycle.
+
+    FeatureTable.encode() turns samples into the symbols written to the
+    input file; column j of the symbol matrix is always consumed by the
+    same STE, and the labels a chain accepts for it form one interval.
+    A chain matches a sample when every symbol falls in its interval,
+    and the matching chains vote for the predictions.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+import numpy as np
+
+# Import tools
+from tools.simulator import find_delimiters
+
+# Higher than any chain id
+NO_CHAIN = np.iinfo(np.int64).max
+
+
+# The (feature, range index, start, end) of each symbol column
+def symbol_columns(ft):
+
+    return [(f_i, index, start, end) for f_i in ft.permutation_ for
+            index, (ste, start, end) in enumerate(ft.get_ranges(f_i))]
+
+
+# The (chains, columns) inclusive lower and upper bounds of the labels
+# each chain accepts for each symbol column
+def chain_intervals(chains, ft):
+
+    columns = symbol_columns(ft)
+
+    # Features a chain doesn't test accept their whole range
+    lo = np.tile(np.array([start for f_i, index, start, end in columns],
+                          dtype=np.uint8), (len(chains), 1))
+    hi = np.tile(np.array([end - 1 for f_i, index, start, end in columns],
+                          dtype=np.uint8), (len(chains), 1))
+
+    # The columns of every (feature, range index)
+    column_map = {}
+
+    for column, (f_i, index, start, end) in enumerate(columns):
+        column_map.setdefault((f_i, index), []).append(column)
+
+    for c, chain in enumerate(chains):
+
+        for node in chain.nodes_:
+
+            for index, labels in enumerate(node.character_sets):
+
+                for column in column_map.get((node.feature_, index), []):
+
+                    # An empty character set never matches
+                    if len(labels) == 0:
+                        lo[c, column], hi[c, column] = 1, 0
+                        continue
+
+                    lo[c, column], hi[c, column] = min(labels), max(labels)
+
+                    assert hi[c, column] - lo[c, column] + 1 == len(labels),\
+                        "Chain %d accepts a non-contiguous range" % c
+
+    return lo, hi
+
+
+# The (samples, chains) matrix of chains matching each row of symbols
+def match_chains(symbols, lo, hi):
+
+    symbols = symbols[:, np.newaxis, :]
+
+    return np.all((symbols >= lo) & (symbols <= hi), axis=2)
+
+
+# Match the chains a batch of samples at a time
+# Yields (first sample, matches) for each batch
+def match_batches(symbols, lo, hi, batch_size=None):
+
+    # Keep the (samples, chains, columns) temporaries around 16 MB
+    if batch_size is None:
+        batch_size = max(1, (1 << 24) // max(1, lo.size))
+
+    for start in range(0, len(symbols), batch_size):
+        yield start, match_chains(symbols[start:start + batch_size], lo, hi)
+
+
+# The (chains, outputs) vote matrix of the chain values
+# Scores add the values to a single output; otherwise every chain casts
+# one vote for its value (the class index)
+def value_votes(values, scores=False):
+
+    if scores:
+        return np.asarray(values, dtype=np.float64).reshape(-1, 1)
+
+    values = np.asarray(values, dtype=np.int64)
+
+    votes = np.zeros((len(values), values.max() + 1 if len(values) else 1),
+                     dtype=np.float64)
+    votes[np.arange(len(values)), values] = 1
+
+    return votes
+
+
+# The (chains, outputs) vote matrix, and whether outputs are scores
+# Classification chains cast one vote for their class; QuickRank chains
+# add their weighted value to a single score
+def vote_matrix(chains, value_map=None):
+
+    if value_map is not None:
+
+        return value_votes([chain.value_ * (chain.tree_weight_ if
+                                            chain.tree_weight_ is not None
+                                            else 1.0)
+                            for chain in chains], True), True
+
+    return value_votes([chain.value_ for chain in chains]), False
+
+
+# The (samples, outputs) lowest chain id of the matching chains voting
+# for every output; NO_CHAIN where none match
+def first_chains(matches, votes, chain_ids):
+
+    chain_ids = np.asarray(chain_ids, dtype=np.int64)
+    outputs = np.argmax(votes, axis=1)
+
+    firsts = np.full((len(matches), votes.shape[1]), NO_CHAIN,
+                     dtype=np.int64)
+
+    for output in np.unique(outputs):
+
+        columns = outputs == output
+
+        firsts[:, output] = np.where(matches[:, columns], chain_ids[columns],
+                                     NO_CHAIN).min(axis=1)
+
+    return firsts
+
+
+# The most voted output of each row of a (samples, outputs) totals
+# matrix; like reports.majority(), ties go to the output reported first:
+# the one with the lowest chain id in firsts
+def break_ties(totals, firsts):
+
+    best = totals == totals.max(axis=1)[:, np.newaxis]
+
+    return np.argmin(np.where(best, firsts, NO_CHAIN), axis=1)
+
+
+# The majority vote of each row of a (samples, chains) matches matrix
+# chain_ids: the report order of the chains (default: their order)
+def majority_vote(matches, votes, chain_ids=None):
+
+    if chain_ids is None:
+        chain_ids = np.arange(len(votes))
+
+    return break_ties(np.dot(matches, votes),
+                      first_chains(matches, votes, chain_ids))
+
+
+# The (samples, width) symbol matrix of a delimited input file, like
+# the output of FeatureTable.encode()
+def stream_symbols(data, width):
+
+    data = np.asarray(data, dtype=np.uint8)
+    delimiters = find_delimiters(data)
+
+    if np.any(np.diff(delimiters) != width + 1):
+        raise ValueError("Samples of the input are not %d symbols long" %
+                         width)
+
+    return data[delimiters[:-1, np.newaxis] + 1 + np.arange(width)]
+
+
+# Predict from a symbol matrix with the chain intervals and vote matrix
+# chain_ids: the report order of the chains, breaking ties of the votes
+def predict_symbols(symbols, lo, hi, votes, scores, batch_size=None,
+                    chain_ids=None):
+
+    if scores:
+        predictions = np.empty(len(symbols), dtype=np.float64)
+    else:
+        predictions = np.empty(len(symbols), dtype=np.int64)
+
+    for start, matches in match_batches(symbols, lo, hi, batch_size):
+
+        if scores:
+            batch = np.dot(matches, votes)[:, 0]
+        else:
+            batch = majority_vote(matches, votes, chain_ids)
+
+        predictions[start:start + len(matches)] = batch
+
+    return predictions
+
+
+# Map class indices (report code - 1), like the predictions of
+# predict_symbols(), to the class values of reverse_value_map
+def class_values(indices, reverse_value_map):
+
+    lookup = np.array([reverse_value_map.get(code) for code in
+                       range(1, max(reverse_value_map) + 1)])
+
+    return lookup[np.asarray(indices, dtype=np.int64)]
+
+
+# Predict X with the chains: majority vote over the trees for
+# classification, weighted sum of the chain values for QuickRank
+def predict(chains, ft, X, value_map=None, batch_size=None):
+
+    # QuickRank features are based at index = 1
+    symbols = ft.encode(X, onebased=value_map is not None)
+
+    lo, hi = chain_intervals(chains, ft)
+    votes, scores = vote_matrix(chains, value_map)
+
+    return predict_symbols(symbols, lo, hi, votes, scores, batch_size,
+                           [chain.chain_id_ for chain in chains])
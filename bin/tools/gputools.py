@@ -1,6 +1,6 @@
 '''
     This module is meant for generating GPU chains
-    for testing on the GPU
+    for testing on the GPU, and for running them on the CPU
 
     ----------------------
     Author: Tom Tracy II
@@ -11,6 +11,19 @@
     Version 1.0
 '''
 
+# Utility Imports
+import numpy as np
+
+# Automata Imports
+from classes.network import ChainNetwork
+
+# Import tools
+from tools.anmltools import character_classes, report_code
+from tools.reports import majority
+from tools.simulator import REPORT_ID_PATTERN, find_delimiters,\
+    parse_character_class, simulate
+
+
 # Generate GPU chains
 
 def gpu_chains(chains, feature_table, value_map, gpu_chains_filename):
@@ -33,73 +46,76 @@ def gpu_chains(chains, feature_table, value_map, gpu_chains_filename):
     # Iterate through all chains
     for chain in chains:
 
-        # For quickrank
-        if value_map is not None:
+        chain_id = "%dt_%dl_%dr" %\
+            (chain.tree_id_, chain.chain_id_, report_code(chain, value_map))
 
-            # Look up the index assigned ot the value
-            report_code = value_map[chain.value_]
+        gpu_file.write(str(chain_id) + '\n')
 
-        else:
+        for character_class in character_classes(chain, feature_table):
+            gpu_file.write(character_class + '\n')
 
-            # 1 offset needed because the AP can't handle '0' report codes
-            report_code = chain.value_ + 1
+    gpu_file.close()
 
-        chain_id = "%dt_%dl_%dr" %\
-            (chain.tree_id_, chain.chain_id_, report_code)
 
-        gpu_file.write(str(chain_id) + '\n')
+# Parse a GPU chains file written by gpu_chains() into a ChainNetwork
+# The file has no end of loop, so chains can report from any STE:
+# a chain matches a sample if its STEs accept every symbol of the sample
+def load_gpu_chains(gpu_chains_filename):
 
-        # character class assignments for STEs start with '[' and end with ']'
-        character_classes = ['[' for _ste in range(feature_table.ste_count_)]
+    with open(gpu_chains_filename, 'r') as gpu_file:
 
-        next_node_index = 0
+        chain_count = int(gpu_file.readline())
+        ste_count = int(gpu_file.readline())
 
-        # Iterate through all features in the feature_table
-        for _f in feature_table.features_:
+        # 'None' for unrolled chains
+        start_loop = gpu_file.readline().strip()
+        start_loop = None if start_loop == 'None' else int(start_loop)
 
-            # If we're still pointing to a valid node ...
-            if next_node_index < len(chain.nodes_):
+        # The number of features per sample; not needed to run the chains
+        gpu_file.readline()
 
-                # Grab that next node
-                next_node = chain.nodes_[next_node_index]
+        network = ChainNetwork(ste_count, start_loop, None)
 
-                # If that node has the feature we're looking at...
-                if next_node.feature_ == _f:
+        for chain in range(chain_count):
 
-                    # If we have multiple STEs assigned to this feature...
-                    ste_index = 0
+            chain_id = gpu_file.readline().strip()
 
-                    for _ste, _start, _end in feature_table.get_ranges(_f):
+            accept = np.array([parse_character_class(gpu_file.readline())
+                               for ste in range(ste_count)])
 
-                        for c in next_node.character_sets[ste_index]:
+            match = REPORT_ID_PATTERN.match(chain_id)
 
-                            character_classes[_ste] += r"\x%02X" % c
+            if match is None:
+                raise ValueError("Bad chain id %s in %s" %
+                                 (chain_id, gpu_chains_filename))
 
-                    next_node_index += 1
+            network.add_chain(int(match.group(1)), int(match.group(2)),
+                              int(match.group(3)), accept)
 
-                # If the node does not have the feature we're looking for
-                else:
+    network.finalize()
 
-                    for _ste, _start, _end in feature_table.get_ranges(_f):
+    return network
 
-                        # Feature is not part of chain, accept full range
-                        character_classes[_ste] += r"\x%02X-\x%02X" %\
-                            (_start, _end - 1)
 
-            # We're done with the available features in our chain
-            else:
+# Predict every sample (window between two delimiters) of the input with
+# the majority report code (minus the offset of 1) of its matching chains,
+# like classify.py; ties go to the code reported first, samples without
+# a matching chain get -1
+def gpu_predictions(network, data, batch_size=None):
 
-                for _ste, _start, _end in feature_table.get_ranges(_f):
+    delimiters = find_delimiters(data)
+    predictions = np.full(max(0, len(delimiters) - 1), -1, dtype=np.int64)
 
-                    # Because feature not part of chain, accept full range
-                    character_classes[_ste] += r"\x%02X-\x%02X" %\
-                        (_start, _end - 1)
+    cycles, chains = simulate(network, data, batch_size)
 
-        # End character classes with ']'
-        for i in range(len(character_classes)):
-            character_classes[i] += "]"
+    if len(cycles) == 0:
+        return predictions
 
-        for character_class in character_classes:
-            gpu_file.write(character_class + '\n')
+    # The window closed by each report, and the class it votes for
+    windows, codes = majority(
+        np.searchsorted(delimiters, cycles.astype(np.int64)) - 1,
+        network.codes_[chains].astype(np.int64) - 1)
 
-    gpu_file.close()
+    predictions[windows] = codes
+
+    return predictions
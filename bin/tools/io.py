@@ -1,3 +1,4 @@
+import json
 import logging
 import pickle
 
@@ -23,3 +24,62 @@ def load_test(testfile):
         x_test, y_test = pickle.load(f)
 
     return x_test, y_test
+
+
+# Dump the chains, feature table, value map and reverse value map
+def dump_cftvm(cftvm_filename, chains, ft, value_map, reverse_value_map):
+
+    with open(cftvm_filename, 'wb') as f:
+        pickle.dump((chains, ft, value_map, reverse_value_map), f,
+                    pickle.HIGHEST_PROTOCOL)
+
+
+# Load the chains, feature table, value map and reverse value map
+def load_cftvm(cftvm_filename):
+
+    with open(cftvm_filename, 'rb') as f:
+        chains, ft, value_map, reverse_value_map = pickle.load(f)
+
+    return chains, ft, value_map, reverse_value_map
+
+
+# Dump the value map sidecar used to aggregate reports: the value of
+# every report code, the weight of every tree and the default mode
+# (vote for classifiers, weighted-vote for classifiers with tree weights
+# like AdaBoost, weighted-sum for QuickRank)
+def dump_value_map(value_map_filename, chains, value_map, reverse_value_map):
+
+    tree_weights = {}
+
+    for chain in chains:
+        if chain.tree_weight_ is not None:
+            tree_weights[str(chain.tree_id_)] = float(chain.tree_weight_)
+
+    # numpy scalars (class labels, leaf values) aren't JSON serializable
+    values = dict((str(code), getattr(value, 'item', lambda: value)())
+                  for code, value in reverse_value_map.items())
+
+    if value_map is not None:
+        mode = 'weighted-sum'
+    elif tree_weights:
+        mode = 'weighted-vote'
+    else:
+        mode = 'vote'
+
+    with open(value_map_filename, 'w') as f:
+        json.dump({'mode': mode, 'values': values,
+                   'tree_weights': tree_weights}, f, indent=1,
+                  sort_keys=True)
+
+
+# Load the value map sidecar; codes and trees are ints again
+def load_value_map(value_map_filename):
+
+    with open(value_map_filename, 'r') as f:
+        sidecar = json.load(f)
+
+    return {'mode': sidecar['mode'],
+            'values': dict((int(code), value) for code, value in
+                           sidecar['values'].items()),
+            'tree_weights': dict((int(tree), weight) for tree, weight in
+                                 sidecar['tree_weights'].items())}
@@ -0,0 +1,245 @@
+'''
+    The purpose of this module is to instrument the stages of a conversion,
+    so a slow run of automatize.py shows where its time and memory went.
+
+    Metrics times every stage (wall and CPU seconds) and samples its peak
+    resident memory from a thread, keeps named counters, and can run one
+    stage under cProfile. NullMetrics has the same interface and does
+    nothing, so instrumented code costs nothing when metrics are off;
+    counters that take work to compute are guarded by metrics.enabled.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+from collections import OrderedDict
+from multiprocessing import cpu_count
+from timeit import default_timer
+import cProfile
+import json
+import logging
+import os
+import platform
+import pstats
+import resource
+import threading
+
+# Seconds between two samples of the resident memory of a stage
+MEMORY_INTERVAL = 0.005
+
+# Functions logged from the cProfile of a stage
+PROFILE_TOP = 20
+
+
+# The resident memory of this process in bytes; the peak so far where
+# /proc isn't available
+def resident_memory():
+
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+    except (IOError, OSError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# CPU seconds (user + system) used by this process so far
+def cpu_seconds():
+
+    times = os.times()
+
+    return times[0] + times[1]
+
+
+# The machine a run happens on
+def machine():
+
+    import numpy as np
+
+    return {'cores': cpu_count(), 'processor': platform.processor(),
+            'platform': platform.platform(),
+            'python': platform.python_version(), 'numpy': np.__version__}
+
+
+# Samples the resident memory from a thread between start() and stop()
+class PeakMemory(object):
+
+    def __init__(self, interval=MEMORY_INTERVAL):
+
+        self.interval_ = interval
+        self.before_ = None
+        self.peak_ = None
+        self.done_ = threading.Event()
+        self.sampler_ = threading.Thread(target=self.sample)
+        self.sampler_.daemon = True
+
+    def sample(self):
+
+        while not self.done_.wait(self.interval_):
+            self.peak_ = max(self.peak_, resident_memory())
+
+    def start(self):
+
+        self.before_ = self.peak_ = resident_memory()
+        self.sampler_.start()
+
+        return self
+
+    # Returns the peak resident bytes since start()
+    def stop(self):
+
+        self.done_.set()
+        self.sampler_.join()
+
+        self.peak_ = max(self.peak_, resident_memory())
+
+        return self.peak_
+
+
+# One stage being measured; the context manager of Metrics.stage()
+class Stage(object):
+
+    def __init__(self, metrics, name):
+
+        self.metrics_ = metrics
+        self.name_ = name
+        self.profile_ = None
+
+    def __enter__(self):
+
+        self.memory_ = PeakMemory().start()
+
+        if self.name_ == self.metrics_.profile_stage_:
+            self.profile_ = cProfile.Profile()
+
+        self.cpu_ = cpu_seconds()
+        self.start_ = default_timer()
+
+        if self.profile_ is not None:
+            self.profile_.enable()
+
+        return self
+
+    def __exit__(self, type, value, traceback):
+
+        if self.profile_ is not None:
+            self.profile_.disable()
+
+        seconds = default_timer() - self.start_
+        cpu = cpu_seconds() - self.cpu_
+        peak = self.memory_.stop()
+
+        self.metrics_.add_stage(self.name_, seconds, cpu, peak,
+                                self.memory_.before_)
+
+        if self.profile_ is not None:
+            self.metrics_.add_profile(self.name_, self.profile_)
+
+        return False
+
+
+# Does nothing; the context manager of NullMetrics.stage()
+class NullStage(object):
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, type, value, traceback):
+
+        return False
+
+
+# Collects the time and memory of named stages and named counters
+# profile_stage: the name of the stage to run under cProfile
+# profile_directory: where the <stage>.prof cProfile stats are dumped
+class Metrics(object):
+
+    enabled = True
+
+    def __init__(self, profile_stage=None, profile_directory='.'):
+
+        self.stages_ = OrderedDict()
+        self.counters_ = OrderedDict()
+        self.profile_stage_ = profile_stage
+        self.profile_directory_ = profile_directory
+        self.profile_file_ = None
+
+    # Measure the with block as the stage name; a stage run twice adds up
+    def stage(self, name):
+
+        return Stage(self, name)
+
+    def add_stage(self, name, seconds, cpu, peak, before):
+
+        if name in self.stages_:
+            stage = self.stages_[name]
+            stage['wall_seconds'] += seconds
+            stage['cpu_seconds'] += cpu
+            stage['peak_rss'] = max(stage['peak_rss'], peak)
+            stage['rss_growth'] = max(stage['rss_growth'], peak - before)
+
+        else:
+            self.stages_[name] = {'wall_seconds': seconds, 'cpu_seconds': cpu,
+                                  'peak_rss': peak,
+                                  'rss_growth': peak - before}
+
+    # Dump the cProfile of a stage and log its most expensive functions
+    def add_profile(self, name, profile):
+
+        self.profile_file_ = os.path.join(self.profile_directory_,
+                                          '%s.prof' % name)
+
+        profile.dump_stats(self.profile_file_)
+
+        logging.info("cProfile of %s dumped to %s" % (name, self.profile_file_))
+
+        pstats.Stats(self.profile_file_).sort_stats('cumulative').\
+            print_stats(PROFILE_TOP)
+
+    # Set the counter name to value
+    def count(self, name, value):
+
+        self.counters_[name] = value
+
+    def results(self):
+
+        return {'stages': self.stages_, 'counters': self.counters_,
+                'profile': self.profile_file_, 'machine': machine()}
+
+    # Log a table of the stages and the counters
+    def log_summary(self):
+
+        for name, stage in self.stages_.items():
+            logging.info("%-20s %10.4f s wall, %10.4f s cpu, peak %8.1f MB" %
+                         (name, stage['wall_seconds'], stage['cpu_seconds'],
+                          stage['peak_rss'] / float(1 << 20)))
+
+        for name, value in self.counters_.items():
+            logging.info("%-30s %s" % (name, value))
+
+    # Write the stages, counters and machine to JSON
+    def write(self, filename):
+
+        directory = os.path.dirname(filename)
+
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        with open(filename, 'w') as f:
+            json.dump(self.results(), f, indent=1)
+
+
+# The interface of Metrics, doing nothing
+class NullMetrics(object):
+
+    enabled = False
+
+    def stage(self, name):
+
+        return NullStage()
+
+    def count(self, name, value):
+
+        pass
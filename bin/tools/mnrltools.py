@@ -40,12 +40,13 @@ def make_mnrl_chains(chains):
         for i, state in enumerate(chain.nodes_):
 
             # Make the first node an enable-on START node that doesn't report
+            # (unless it's the only node of the chain)
             if i == 0:
                 node = mnrl_network.addPFPState(state.feature_,
                                                 state.threshold_,
                                                 greaterThan=state.gt_,
                                                 reportId=report_code,
-                                                report=False,
+                                                report=len(chain.nodes_) == 1,
                                                 enable=mnrl.MNRLDefs.ENABLE_ON_START_AND_ACTIVATE_IN)
 
             # Make the last node report
@@ -0,0 +1,121 @@
+'''
+    The purpose of this module is to run the floating-point (PFP state)
+    MNRL chains of tools/mnrltools.make_mnrl_chains() on the CPU, without
+    the feature table encoding.
+
+    Each chain is a line of PFP states: the head is enabled on start,
+    and every state activates the next one if its test on the feature
+    value passes (value > threshold for greater-than states, value <=
+    threshold otherwise). The last state reports. All states of a chain
+    test the same sample, so a chain reports for a sample exactly when
+    all its tests pass; the tests of a batch of samples are evaluated at
+    once and reduced per chain.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+import numpy as np
+
+# Import tools
+import tools.evaluator as evaluator
+
+
+# Flatten the chains into per-state arrays, in the order make_mnrl_chains()
+# adds the states; heads are the first state of every chain
+# Chains without nodes have no states in the MNRL network, and never report
+def compile_network(chains, onebased=False):
+
+    feature, threshold, gt, heads, indices = [], [], [], [], []
+
+    for index, chain in enumerate(chains):
+
+        if len(chain.nodes_) == 0:
+            continue
+
+        heads.append(len(feature))
+        indices.append(index)
+
+        for node in chain.nodes_:
+
+            # QuickRank features are based at index = 1
+            feature.append(node.feature_ - 1 if onebased else node.feature_)
+            threshold.append(node.threshold_)
+            gt.append(node.gt_)
+
+    return {'feature': np.array(feature, dtype=np.int64),
+            'threshold': np.array(threshold, dtype=np.float64),
+            'gt': np.array(gt, dtype=bool),
+            'heads': np.array(heads, dtype=np.int64),
+            'chains': np.array(indices, dtype=np.int64),
+            'report_ids': np.array([chains[i].chain_id_ for i in indices],
+                                   dtype=np.int64)}
+
+
+# The (samples, chains) matrix of chains reporting for each sample of X
+def match_batch(network, X):
+
+    tests = (X[:, network['feature']] > network['threshold']) == network['gt']
+
+    if len(network['heads']) == 0:
+        return np.zeros((len(X), 0), dtype=bool)
+
+    return np.logical_and.reduceat(tests, network['heads'], axis=1)
+
+
+# Run the samples of X through the network a batch at a time
+# Yields (first sample, matches) for each batch
+def match_batches(network, X, batch_size=None):
+
+    # sklearn and QuickRank both compare float32 features
+    X = np.asarray(X, dtype=np.float32).astype(np.float64)
+
+    # Keep the (samples, states) tests around 16 MB
+    if batch_size is None:
+        batch_size = max(1, (1 << 24) // max(1, len(network['feature'])))
+
+    for start in range(0, len(X), batch_size):
+        yield start, match_batch(network, X[start:start + batch_size])
+
+
+# The reports of the network on X: the sample and report id of every
+# report, ordered by sample, then by chain
+def simulate(network, X, batch_size=None):
+
+    samples = [np.zeros(0, dtype=np.int64)]
+    report_ids = [np.zeros(0, dtype=np.int64)]
+
+    for start, matches in match_batches(network, X, batch_size):
+
+        rows, columns = np.nonzero(matches)
+
+        samples.append(rows + start)
+        report_ids.append(network['report_ids'][columns])
+
+    return np.concatenate(samples), np.concatenate(report_ids)
+
+
+# Predict X with the chains: majority vote over the trees for
+# classification, weighted sum of the chain values for QuickRank
+def predict(network, chains, X, value_map=None, batch_size=None):
+
+    votes, scores = evaluator.vote_matrix(chains, value_map)
+    votes = votes[network['chains']]
+
+    if scores:
+        predictions = np.empty(len(X), dtype=np.float64)
+    else:
+        predictions = np.empty(len(X), dtype=np.int64)
+
+    for start, matches in match_batches(network, X, batch_size):
+
+        if scores:
+            batch = np.dot(matches, votes)[:, 0]
+        else:
+            batch = evaluator.majority_vote(matches, votes,
+                                            network['report_ids'])
+
+        predictions[start:start + len(matches)] = batch
+
+    return predictions
@@ -0,0 +1,146 @@
+'''
+    The purpose of this module is to expose the stages of the automatize
+    pipeline (model -> chains -> feature table -> character sets) as
+    functions, so that automatize.py and the benchmark scripts run the
+    exact same conversion.
+
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+import logging
+
+# Automata Imports
+from classes.featureTable import FeatureTable
+
+# Import tools
+import tools.charactersets as cs
+import tools.quickrank as qr
+import tools.sklearn as skl
+from tools.io import load_model
+
+
+# Load a model file and grab its constituent trees
+# Returns (model, trees, quickrank)
+def load_trees(model_filename):
+
+    # Simple check if quickrank model (might wanna improve this later)
+    if '.xml' in model_filename:
+
+        model = qr.load_qr(model_filename)
+
+        return model, qr.grab_data(model), True
+
+    # Else, its a scikit learn-type model
+    model = load_model(model_filename)
+
+    return model, [dtc.tree_ for dtc in model.estimators_], False
+
+
+# Convert all trees to chains; each chain represents a root->leaf path
+# Returns (chains, threshold_map, value_map, reverse_value_map)
+def trees_to_chains(model, trees, quickrank, verbose=False):
+
+    chains = []
+
+    # Keep track of map from unique
+    # feature -> thresholds used for branch comparisons
+    threshold_map = {}
+
+    # Keep track of unique class values (unique(Y))
+    values = []
+
+    # We're going to use these to index leaf values (classes)
+    value_map = {}
+    reverse_value_map = {}
+
+    # To deal with quickrank, we need to parse the trees differently
+    if quickrank:
+
+        if verbose:
+            logging.info("Converting QuickRank trees to chains")
+
+        for tree_id, tree_weight, tree_split in trees:
+
+            qr.tree_to_chains(tree_id, tree_weight, tree_split,
+                              chains, threshold_map, values)
+
+        # Sort the classification values
+        values.sort()
+
+        # Create a map from value to index (starting from 1 -- imposed by AP)
+        for _i, _value in enumerate(values):
+
+            value_map[_value] = _i + 1
+            reverse_value_map[_i + 1] = _value
+
+    # Else, we're dealing with an SKLEARN model
+    else:
+
+        if verbose:
+            logging.info("Converting SKLEARN trees to chains")
+
+        # Grab the classification values
+        classes = model.classes_
+
+        if verbose:
+            logging.info("%d unique classifications available: %s" %
+                         (len(classes), str(model.classes_)))
+
+        for tree_id, tree in enumerate(trees):
+
+            skl.tree_to_chains(tree, tree_id, chains, threshold_map, values)
+
+        # Boosted classifiers (AdaBoost) weigh the vote of every tree
+        tree_weights = getattr(model, 'estimator_weights_', None)
+
+        if tree_weights is not None:
+            for chain in chains:
+                chain.tree_weight_ = float(tree_weights[chain.tree_id_])
+
+        # We don't need a value map (this might not be true)
+        value_map = None
+
+        for _i in values:
+            reverse_value_map[_i + 1] = classes[_i]
+
+    if verbose:
+        logging.info("There are %d chains" % len(chains))
+
+    # Because we built the chains from the left-most to the right-most leaf
+    # We can simply assign chain ids sequentially over our list
+    for chain_id, chain in enumerate(chains):
+        chain.set_chain_id(chain_id)
+
+    return chains, threshold_map, value_map, reverse_value_map
+
+
+# Sort the thresholds for all features
+def sort_thresholds(threshold_map):
+
+    for f, t in threshold_map.items():
+        t.sort()
+
+    return threshold_map
+
+
+# Create ideal address spacing for all features and thresholds
+def build_feature_table(threshold_map, unrolled=False):
+
+    return FeatureTable(threshold_map, unrolled=unrolled)
+
+
+# Set the character sets for each node in the chains
+def set_character_sets(chains, ft):
+
+    for chain in chains:
+        cs.set_character_sets(chain, ft)
+
+
+# Sort and combine the states in the chains
+def sort_and_combine(chains):
+
+    for chain in chains:
+        chain.sort_and_combine()
@@ -1,6 +1,7 @@
 '''
     The purpose of this module is to convert QuickLearn models into
-    an automata representation.
+    an automata representation, and to score them natively on the CPU
+    (compile_trees() and score()).
 
     ----------------------
     Author: Tom Tracy II
@@ -8,13 +9,14 @@
     University of Virginia
     ----------------------
     27 January 2017
-    Version 1.0
+    Version 1.1
 '''
 
 # Utility Imports
 import sys
 import xmltodict
 import logging
+import numpy as np
 
 # RF Automata Imports
 from classes.chain import *
@@ -158,6 +160,93 @@ def recurse(split, temp_chain, threshold_map, values):
             recurse(next_split[1], right_chain, threshold_map, values)
 
 
+# Compile the trees from grab_data() into flat arrays
+# The nodes of all trees share one set of arrays; leaves have feature 0
+# and point back at themselves, so traversal can run a fixed number of
+# levels without checking for leaves
+def compile_trees(trees):
+
+    feature, threshold, left, right, output = [], [], [], [], []
+    roots, weights = [], []
+    depths = [0]
+
+    # Add the nodes depth first; returns the index of the node
+    def add_node(split, depth):
+
+        index = len(feature)
+
+        feature.append(0)
+        threshold.append(0.0)
+        left.append(index)
+        right.append(index)
+        output.append(0.0)
+
+        if 'output' in split:
+            output[index] = float(split['output'])
+            depths.append(depth)
+
+        else:
+            feature[index] = int(split['feature'])
+            threshold[index] = float(split['threshold'])
+            left[index] = add_node(split['split'][0], depth + 1)
+            right[index] = add_node(split['split'][1], depth + 1)
+
+        return index
+
+    for tree_id, tree_weight, tree_split in trees:
+
+        roots.append(add_node(tree_split, 0))
+        weights.append(tree_weight)
+
+    return {'feature': np.array(feature, dtype=np.int64),
+            'threshold': np.array(threshold, dtype=np.float32),
+            'left': np.array(left, dtype=np.int64),
+            'right': np.array(right, dtype=np.int64),
+            'output': np.array(output, dtype=np.float64),
+            'roots': np.array(roots, dtype=np.int64),
+            'weights': np.array(weights, dtype=np.float64),
+            'depth': max(depths)}
+
+
+# Score X (features based at 1 in column 0) with the compiled trees
+# Every level moves all (sample, tree) pairs down one node at once
+# Returns the weighted sum of the tree outputs of every sample
+def score(compiled, X, batch_size=None):
+
+    # QuickRank compares single precision features and thresholds
+    X = np.asarray(X, dtype=np.float32)
+
+    # Zero-based columns; leaves read column 0 and go nowhere
+    columns = np.maximum(compiled['feature'] - 1, 0)
+
+    trees = len(compiled['roots'])
+
+    # Keep the (samples, trees) temporaries around 8 MB
+    if batch_size is None:
+        batch_size = max(1, (1 << 20) // max(1, trees))
+
+    scores = np.empty(len(X), dtype=np.float64)
+
+    for start in range(0, len(X), batch_size):
+
+        batch = X[start:start + batch_size]
+        rows = np.arange(len(batch))[:, np.newaxis]
+
+        nodes = np.tile(compiled['roots'], (len(batch), 1))
+
+        for level in range(compiled['depth']):
+
+            go_left = batch[rows, columns[nodes]] <= compiled['threshold'][nodes]
+
+            nodes = np.where(go_left, compiled['left'][nodes],
+                             compiled['right'][nodes])
+
+        scores[start:start + len(batch)] = np.dot(compiled['output'][nodes],
+                                                  compiled['weights'])
+
+    return scores
+
+
 # Test the module by converting a quickrank xml file into a set of chains
 if __name__ == '__main__':
     if len(sys.argv) == 2:
@@ -0,0 +1,265 @@
+'''
+    The purpose of this module is to score tree ensembles on a CPU in the
+    QuickScorer style (Lucchese et al., SIGIR 2015), as a software
+    baseline for the automata.
+
+    The leaves of every tree are numbered left to right, and each tree
+    keeps one bitvector with a bit per leaf. A node whose test is false
+    for a sample (value > threshold) clears the bits of the leaves in its
+    left subtree; once all false nodes are applied, the lowest set bit is
+    the exit leaf. The nodes of a feature are sorted by threshold, the
+    same per-feature thresholds automatize keeps in its threshold_map, so
+    the false nodes of a sample are a prefix of that list. We precompute
+    the AND of every prefix, per feature and for only the trees using the
+    feature, and apply them with one lookup per feature and sample batch.
+
+    Both sklearn forests (estimators_ of trees) and QuickRank XML
+    ensembles are supported.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+import numpy as np
+
+# A bitvector word with every leaf bit set
+ALL_LEAVES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+# A flat tree: per node feature (-1 for leaves), threshold, children,
+# and a (nodes, outputs) array of leaf values
+def flat_tree(feature, threshold, left, right, values):
+
+    return {'feature': np.asarray(feature, dtype=np.int64),
+            'threshold': np.asarray(threshold, dtype=np.float64),
+            'left': np.asarray(left, dtype=np.int64),
+            'right': np.asarray(right, dtype=np.int64),
+            'values': np.asarray(values, dtype=np.float64)}
+
+
+# Convert the trees of a sklearn forest; classifiers average the class
+# probabilities of their trees, regressors average the leaf values
+def trees_from_sklearn(model):
+
+    trees = []
+
+    for estimator in model.estimators_:
+
+        tree = estimator.tree_
+        values = tree.value[:, 0, :]
+
+        if hasattr(model, 'classes_'):
+            totals = values.sum(axis=1)[:, np.newaxis]
+            values = values / np.where(totals > 0, totals, 1)
+
+        # sklearn marks leaves with feature -2
+        trees.append(flat_tree(np.where(tree.children_left < 0, -1,
+                                        tree.feature),
+                               tree.threshold, tree.children_left,
+                               tree.children_right,
+                               values / len(model.estimators_)))
+
+    return trees
+
+
+# Convert QuickRank trees, as returned by tools.quickrank.grab_data()
+# The leaf values are weighted by the trees; features are based at 1
+def trees_from_quickrank(qr_trees):
+
+    trees = []
+
+    for tree_id, tree_weight, tree_split in qr_trees:
+
+        feature, threshold, left, right, values = [], [], [], [], []
+
+        # Add the nodes depth first; returns the index of the node
+        def add_node(split):
+
+            index = len(feature)
+
+            feature.append(-1)
+            threshold.append(0.0)
+            left.append(-1)
+            right.append(-1)
+            values.append([0.0])
+
+            if 'output' in split:
+                values[index] = [tree_weight * float(split['output'])]
+
+            else:
+                feature[index] = int(split['feature']) - 1
+                threshold[index] = float(split['threshold'])
+                left[index] = add_node(split['split'][0])
+                right[index] = add_node(split['split'][1])
+
+            return index
+
+        add_node(tree_split)
+
+        trees.append(flat_tree(feature, threshold, left, right, values))
+
+    return trees
+
+
+# Number the leaves of a tree left to right
+# Returns the leaf nodes, and the (first, last) leaf under every node
+def leaf_ranges(tree):
+
+    leaves = []
+    ranges = {}
+
+    def visit(node):
+
+        if tree['feature'][node] < 0:
+            ranges[node] = (len(leaves), len(leaves))
+            leaves.append(node)
+
+        else:
+            first, middle = visit(tree['left'][node])
+            middle, last = visit(tree['right'][node])
+            ranges[node] = (first, last)
+
+        return ranges[node]
+
+    visit(0)
+
+    return leaves, ranges
+
+
+# Build the QuickScorer tables of a list of flat trees
+def compile_forest(trees):
+
+    leaves = [leaf_ranges(tree) for tree in trees]
+
+    words = max(1, (max(len(tree_leaves) for tree_leaves, r in leaves) + 63)
+                // 64)
+    outputs = trees[0]['values'].shape[1]
+
+    # (trees, leaves, outputs) values of each leaf, in bit order
+    leaf_values = np.zeros((len(trees), words * 64, outputs))
+
+    # feature -> [(threshold, tree, mask)] of its nodes
+    nodes = {}
+
+    for t, (tree, (tree_leaves, ranges)) in enumerate(zip(trees, leaves)):
+
+        leaf_values[t, :len(tree_leaves)] = tree['values'][tree_leaves]
+
+        for node in np.flatnonzero(tree['feature'] >= 0):
+
+            # A false node rules out the leaves of its left subtree
+            first, last = ranges[tree['left'][node]]
+
+            bits = np.ones(words * 64, dtype=bool)
+            bits[first:last + 1] = False
+
+            mask = np.packbits(bits.reshape(-1, 8)[:, ::-1]).view('<u8')
+
+            nodes.setdefault(tree['feature'][node], []).append(
+                (tree['threshold'][node], t, mask))
+
+    features = []
+
+    for feature in sorted(nodes.keys()):
+
+        feature_nodes = nodes[feature]
+
+        # The sorted thresholds of the feature, like the threshold_map
+        thresholds = np.unique([threshold for threshold, t, mask in
+                                feature_nodes])
+        feature_trees = np.unique([t for threshold, t, mask in feature_nodes])
+
+        # Scattering into a subset of the trees costs more than ANDing
+        # a few extra all-ones masks; keep the subset only if it's small
+        if len(feature_trees) * 2 > len(trees):
+            feature_trees = np.arange(len(trees))
+
+        # Row k + 1 holds the masks of the nodes on the k-th threshold...
+        table = np.empty((len(thresholds) + 1, len(feature_trees), words),
+                         dtype=np.uint64)
+        table[:] = ALL_LEAVES
+
+        for threshold, t, mask in feature_nodes:
+            row = np.searchsorted(thresholds, threshold) + 1
+            column = np.searchsorted(feature_trees, t)
+            table[row, column] &= mask
+
+        # ...and the running AND makes row k the AND of the first k
+        np.bitwise_and.accumulate(table, axis=0, out=table)
+
+        if len(feature_trees) == len(trees):
+            feature_trees = None
+
+        features.append((feature, thresholds, feature_trees, table))
+
+    return {'features': features, 'words': words, 'trees': len(trees),
+            'leaf_values': leaf_values}
+
+
+# Exit leaves of a (samples, trees, words) array of leaf bitvectors
+def exit_leaves(bitvectors):
+
+    # The first word with a bit set, then its lowest set bit
+    word = np.argmax(bitvectors != 0, axis=2)
+    bits = np.take_along_axis(bitvectors, word[..., np.newaxis],
+                              axis=2)[..., 0]
+
+    lowest = bits & (~bits + np.uint64(1))
+
+    return word * 64 + np.log2(lowest.astype(np.float64)).astype(np.int64)
+
+
+# Sum the exit leaf values of all trees for a batch of samples
+def score_batch(forest, X):
+
+    bitvectors = np.empty((len(X), forest['trees'], forest['words']),
+                          dtype=np.uint64)
+    bitvectors[:] = ALL_LEAVES
+
+    for feature, thresholds, feature_trees, table in forest['features']:
+
+        # The number of thresholds below the value = the false nodes
+        ranks = np.searchsorted(thresholds, X[:, feature])
+
+        if feature_trees is None:
+            bitvectors &= table[ranks]
+        else:
+            bitvectors[:, feature_trees] &= table[ranks]
+
+    leaves = exit_leaves(bitvectors)
+
+    return forest['leaf_values'][np.arange(forest['trees']), leaves].sum(
+        axis=1)
+
+
+# Score X a batch of samples at a time
+# Returns the (samples, outputs) sums of the exit leaf values
+def score(forest, X, batch_size=None):
+
+    # sklearn and QuickRank both compare float32 features
+    X = np.asarray(X, dtype=np.float32).astype(np.float64)
+
+    # Keep the (samples, trees, words) bitvectors within the CPU caches
+    if batch_size is None:
+        batch_size = max(1, (1 << 17) // (forest['trees'] * forest['words']))
+
+    scores = np.empty((len(X), forest['leaf_values'].shape[2]))
+
+    for start in range(0, len(X), batch_size):
+        scores[start:start + batch_size] =\
+            score_batch(forest, X[start:start + batch_size])
+
+    return scores
+
+
+# Predict X: the class with the highest average probability for sklearn
+# classifiers (pass their classes_), or the score otherwise
+def predict(forest, X, classes=None, batch_size=None):
+
+    scores = score(forest, X, batch_size)
+
+    if classes is not None:
+        return np.asarray(classes)[np.argmax(scores, axis=1)]
+
+    return scores[:, 0]
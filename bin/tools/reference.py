@@ -0,0 +1,138 @@
+'''
+    The purpose of this module is to provide a straightforward reference
+    simulator for the chain networks we generate.
+
+    The network is expanded into one classes.Anml STE object per STE and
+    simulated one symbol at a time, the way an ANML engine would: the
+    enabled STEs that accept the symbol become active, active report STEs
+    report, and the neighbors of the active STEs (plus the all-input start
+    STEs) are enabled for the next symbol. It is slow on purpose; it is
+    meant to check and benchmark the vectorized engines against.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+import numpy as np
+
+# Automata Imports
+from classes.Anml import Anml, AnmlDefs
+
+# Import tools
+from tools.simulator import DELIMITER, parse_character_class
+
+
+# Format 256 booleans as an ANML character class like [\x00-\x0A\x0F]
+def format_character_class(accept):
+
+    character_class = '['
+
+    # Start and (exclusive) end of every run of accepted symbols
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], accept.astype(int),
+                                                   [0]))))
+
+    for start, end in zip(edges[::2], edges[1::2] - 1):
+
+        if start == end:
+            character_class += r"\x%02X" % start
+        else:
+            character_class += r"\x%02X-\x%02X" % (start, end)
+
+    return character_class + ']'
+
+
+# Expand the network into an Anml object with one Ste object per STE
+def anml_from_network(network):
+
+    anml_net = Anml()
+    report_symbol = r"[\x%02X]" % DELIMITER
+
+    report_ids = network.report_ids()
+
+    # character_classes[position][chain], one STE position at a time
+    character_classes = []
+
+    for position in range(network.ste_count_):
+
+        accept = np.unpackbits(network.tables_[position].view(np.uint8),
+                               axis=1)
+
+        character_classes.append([format_character_class(accept[:, chain])
+                                  for chain in range(len(network))])
+
+    for chain in range(len(network)):
+
+        start_ste = anml_net.AddSTE(report_symbol, AnmlDefs.ALL_INPUT,
+                                    anmlId="%d_s" % chain)
+
+        stes = []
+        previous = start_ste
+
+        for position in range(network.ste_count_):
+
+            ste = anml_net.AddSTE(character_classes[position][chain],
+                                  AnmlDefs.NO_START,
+                                  anmlId="%d_%d" % (chain, position))
+
+            anml_net.AddAnmlEdge(previous, ste, 0)
+            stes.append(ste)
+            previous = ste
+
+        if network.start_loop_ is not None:
+            anml_net.AddAnmlEdge(stes[-1], stes[network.start_loop_], 0)
+
+        report_ste = anml_net.AddSTE(report_symbol, AnmlDefs.NO_START,
+                                     anmlId=report_ids[chain],
+                                     reportCode=network.codes_[chain])
+
+        # Without an end_loop_, any chain STE can enable the report
+        if network.end_loop_ is None:
+            for ste in stes:
+                anml_net.AddAnmlEdge(ste, report_ste, 0)
+        else:
+            anml_net.AddAnmlEdge(stes[network.end_loop_], report_ste, 0)
+
+    return anml_net
+
+
+# Run a symbol stream through the network, one symbol at a time
+# Returns (cycles, chains) like tools.simulator.simulate()
+def simulate(network, data, anml_net=None):
+
+    if anml_net is None:
+        anml_net = anml_from_network(network)
+
+    # Look up what each STE accepts once, rather than on every symbol
+    accepts = dict((ste.id_, parse_character_class(ste.character_class_))
+                   for ste in anml_net.stes_)
+
+    chain_index = dict((report_id, chain) for chain, report_id in
+                       enumerate(network.report_ids()))
+
+    starts = [ste for ste in anml_net.stes_ if ste.starting_]
+
+    cycles = []
+    chains = []
+    enabled = []
+
+    for cycle, symbol in enumerate(data):
+
+        active = {}
+
+        for ste in starts + enabled:
+
+            if accepts[ste.id_][symbol]:
+                active[ste.id_] = ste
+
+        reported = [chain_index[ste.id_] for ste in active.values()
+                     if ste.reportCode_ is not None]
+
+        for chain in sorted(reported):
+            cycles.append(cycle)
+            chains.append(chain)
+
+        enabled = [neighbor for ste in active.values()
+                   for neighbor in ste.neighbors_]
+
+    return np.array(cycles, dtype=np.uint64), np.array(chains, dtype=np.int64)
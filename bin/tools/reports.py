@@ -0,0 +1,407 @@
+'''
+    The purpose of this module is to read and write report files.
+
+    Text reports follow the VASIM format, one report per line:
+        cycle : reporting ste id : report code
+    Binary reports are .npy files holding one REPORT_DTYPE record per
+    report, and can be opened with np.load(..., mmap_mode='r'). Compact
+    binary reports only keep the cycle and the code, in the narrowest
+    fixed-width fields that hold them (compact_dtype()).
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+import os
+import numpy as np
+
+# One binary report record
+REPORT_DTYPE = np.dtype([('cycle', '<u8'), ('chain', '<u4'), ('code', '<u4')])
+
+
+# A compact binary report record: the cycle and code, in the narrowest
+# of uint32/uint64 and uint16/uint32 holding max_cycle and max_code
+def compact_dtype(max_cycle, max_code):
+
+    return np.dtype([('cycle', '<u4' if max_cycle < 1 << 32 else '<u8'),
+                     ('code', '<u2' if max_code < 1 << 16 else '<u4')])
+
+
+# Size of the .npy header we reserve, so it can be rewritten in place
+NPY_HEADER_SIZE = 128
+
+
+# Build a fixed-size .npy (version 1.0) header for count records
+def npy_header(dtype, count):
+
+    header = "{'descr': %s, 'fortran_order': False, 'shape': (%d,), }" %\
+        (repr(np.lib.format.dtype_to_descr(dtype)), count)
+
+    # magic string, version, header length, header (ends with '\n')
+    header = header.ljust(NPY_HEADER_SIZE - 10 - 1) + '\n'
+
+    assert len(header) == NPY_HEADER_SIZE - 10, "Header does not fit"
+
+    return np.lib.format.magic(1, 0) +\
+        np.array([len(header)], dtype='<u2').tobytes() + header.encode('latin1')
+
+
+# Write report batches (cycles, chains) from the simulator
+# to a text (VASIM format) file and/or a binary .npy file of
+# binary_dtype records (REPORT_DTYPE or a compact_dtype())
+def write_reports(batches, network, text_filename=None, binary_filename=None,
+                  binary_dtype=REPORT_DTYPE):
+
+    report_ids = network.report_ids()
+    codes = network.codes_.tolist()
+
+    text_file = None
+    binary_file = None
+    count = 0
+
+    if text_filename is not None:
+        text_file = open(text_filename, 'w')
+
+    if binary_filename is not None:
+        binary_file = open(binary_filename, 'wb')
+        binary_file.write(npy_header(binary_dtype, 0))
+
+    try:
+
+        for cycles, chains in batches:
+
+            if text_file is not None:
+                text_file.write(''.join(["%d : %s : %d\n" %
+                                         (cycle, report_ids[chain],
+                                          codes[chain]) for
+                                         cycle, chain in
+                                         zip(cycles.tolist(),
+                                             chains.tolist())]))
+
+            if binary_file is not None:
+                reports = np.empty(len(cycles), dtype=binary_dtype)
+                reports['cycle'] = cycles
+                reports['code'] = network.codes_[chains]
+
+                if 'chain' in binary_dtype.names:
+                    reports['chain'] = chains
+
+                binary_file.write(reports.tobytes())
+
+            count += len(cycles)
+
+        # Now that we know how many reports there are, fix up the header
+        if binary_file is not None:
+            binary_file.seek(0)
+            binary_file.write(npy_header(binary_dtype, count))
+
+    finally:
+
+        if text_file is not None:
+            text_file.close()
+
+        if binary_file is not None:
+            binary_file.close()
+
+    return count
+
+
+# Read binary reports without loading them into memory
+def read_binary_reports(reports_filename):
+
+    return np.load(reports_filename, mmap_mode='r')
+
+
+# Parse the unsigned integers in the [starts, ends) byte ranges of buf,
+# skipping any non-digit bytes
+def parse_integers(buf, starts, ends):
+
+    values = np.zeros(len(starts), dtype=np.int64)
+
+    if len(starts) == 0:
+        return values
+
+    for offset in range(int((ends - starts).max())):
+
+        positions = starts + offset
+        digits = buf[np.minimum(positions, len(buf) - 1)].astype(np.int64) - 48
+
+        valid = (positions < ends) & (digits >= 0) & (digits <= 9)
+        values = np.where(valid, values * 10 + digits, values)
+
+    return values
+
+
+# Parse a block of whole text report lines into (cycles, codes) arrays,
+# then the tree ids of the reporting STEs (<tree>t_<chain>l_<code>r) if
+# trees is set, and their chain ids if chains is set. The cycle is the
+# first field and the code the last; lines without exactly two ':' are
+# not reports and are skipped
+def parse_text_block(block, trees=False, chains=False):
+
+    buf = np.frombuffer(block, dtype=np.uint8)
+
+    newlines = np.flatnonzero(buf == 10)
+
+    # The last line might not end with a newline
+    if len(buf) > 0 and buf[-1] != 10:
+        newlines = np.append(newlines, len(buf))
+
+    starts = np.concatenate(([0], newlines[:-1] + 1)).astype(np.int64)
+
+    colons = np.flatnonzero(buf == 58)
+    lines = np.searchsorted(newlines, colons)
+
+    # Keep the lines with two colons; theirs come in (first, last) pairs
+    reports = np.bincount(lines, minlength=len(newlines)) == 2
+    colons = colons[reports[lines]].reshape(-1, 2)
+    reports = np.flatnonzero(reports)
+
+    cycles = parse_integers(buf, starts[reports], colons[:, 0])
+    codes = parse_integers(buf, colons[:, 1] + 1, newlines[reports])
+
+    if not trees and not chains:
+        return cycles, codes
+
+    fields = (cycles, codes)
+
+    # The tree id ends at the first 't' of the STE id
+    ts = np.append(np.flatnonzero(buf == 116), len(buf))
+    ends = np.minimum(ts[np.searchsorted(ts, colons[:, 0])], colons[:, 1])
+
+    if trees:
+        fields += (parse_integers(buf, colons[:, 0] + 1, ends),)
+
+    # The chain id follows, up to the next 'l'
+    if chains:
+        ls = np.append(np.flatnonzero(buf == 108), len(buf))
+        fields += (parse_integers(buf, ends, np.minimum(
+            ls[np.searchsorted(ls, ends)], colons[:, 1])),)
+
+    return fields
+
+
+# Read a text report file in blocks of about block_size bytes; yields
+# every block of whole lines
+def read_text_blocks(reports_filename, block_size=1 << 24):
+
+    with open(reports_filename, 'rb') as reports:
+
+        remainder = b''
+
+        while True:
+
+            block = reports.read(block_size)
+
+            if not block:
+                break
+
+            # Keep the partial last line for the next block
+            block = remainder + block
+            end = block.rfind(b'\n') + 1
+            remainder = block[end:]
+
+            if end > 0:
+                yield block[:end]
+
+        if remainder:
+            yield remainder
+
+
+# Read a report file in blocks; yields (cycles, codes) for each block,
+# then the tree ids and chain ids of the reports if trees and chains are
+# set (text reports only)
+# Text reports are parsed a block of whole lines at a time, binary (.npy)
+# reports are read from a memory map
+def read_report_blocks(reports_filename, block_size=1 << 24, trees=False,
+                       chains=False):
+
+    if reports_filename.endswith('.npy'):
+
+        if trees or chains:
+            raise ValueError("Binary reports have no tree or chain ids")
+
+        reports = read_binary_reports(reports_filename)
+        records = max(1, block_size // reports.dtype.itemsize)
+
+        for start in range(0, len(reports), records):
+
+            block = reports[start:start + records]
+
+            yield (block['cycle'].astype(np.int64),
+                   block['code'].astype(np.int64))
+
+        return
+
+    for block in read_text_blocks(reports_filename, block_size):
+        yield parse_text_block(block, trees, chains)
+
+
+# Reduce every cycle of (cycles, values...) report blocks with
+# reducer(cycles, values...), which returns one result per run of equal
+# cycles. The reports of a cycle are consecutive, but may span blocks
+# Yields (cycles, results) for each block
+def group_blocks(blocks, reducer):
+
+    carried = None
+
+    for block in blocks:
+
+        if carried is not None:
+            block = tuple(np.concatenate((c, b)) for c, b in zip(carried,
+                                                                 block))
+
+        cycles = block[0]
+
+        if len(cycles) == 0:
+            continue
+
+        # The last cycle may continue in the next block
+        changes = np.flatnonzero(cycles[1:] != cycles[:-1])
+        last = changes[-1] + 1 if len(changes) else 0
+
+        carried = tuple(column[last:] for column in block)
+
+        if last > 0:
+            yield reducer(*[column[:last] for column in block])
+
+    if carried is not None and len(carried[0]) > 0:
+        yield reducer(*carried)
+
+
+# The input sample of every report cycle; sample k is framed by the
+# delimiters at cycles k * cycles_per_sample and (k + 1) * cycles_per_sample
+# and its chains report on the closing one
+def report_samples(cycles, cycles_per_sample):
+
+    return cycles // cycles_per_sample - 1
+
+
+# Number the runs of consecutive equal cycles
+# Returns the run of every report, and the first report of every run
+def cycle_runs(cycles):
+
+    changes = cycles[1:] != cycles[:-1]
+
+    return (np.concatenate(([0], np.cumsum(changes))),
+            np.concatenate(([0], np.flatnonzero(changes) + 1)))
+
+
+# The majority vote of each run of equal cycles; ties go to the code
+# reported first. Returns (cycles, codes), one per run
+def majority(cycles, codes):
+
+    runs, run_starts = cycle_runs(cycles)
+
+    offset = codes.min()
+    width = codes.max() - offset + 1
+
+    pairs, first, counts = np.unique(runs * width + codes - offset,
+                                     return_index=True, return_counts=True)
+
+    # The most voted code of each run, reported first on ties
+    order = np.lexsort((first, -counts, pairs // width))
+    pairs = pairs[order]
+    best = np.concatenate(([True], pairs[1:] // width != pairs[:-1] // width))
+
+    return cycles[run_starts], pairs[best] % width + offset
+
+
+# The weighted vote of each run of equal cycles: every report votes for
+# its code with its weight, and ties go to the code reported first
+# Returns (cycles, codes), one per run
+def weighted_majority(cycles, codes, weights):
+
+    runs, run_starts = cycle_runs(cycles)
+
+    offset = codes.min()
+    width = codes.max() - offset + 1
+
+    pairs, first, inverse = np.unique(runs * width + codes - offset,
+                                      return_index=True, return_inverse=True)
+    sums = np.bincount(inverse.ravel(), weights=weights)
+
+    # The heaviest code of each run, reported first on ties
+    order = np.lexsort((first, -sums, pairs // width))
+    pairs = pairs[order]
+    best = np.concatenate(([True], pairs[1:] // width != pairs[:-1] // width))
+
+    return cycles[run_starts], pairs[best] % width + offset
+
+
+# The sum of the scores of each run of equal cycles
+# Returns (cycles, sums), one per run
+def weighted_sum(cycles, scores):
+
+    runs, run_starts = cycle_runs(cycles)
+
+    return cycles[run_starts], np.bincount(runs, weights=scores)
+
+
+# The mean of the scores of each run of equal cycles
+# Returns (cycles, means), one per run
+def mean(cycles, scores):
+
+    runs, run_starts = cycle_runs(cycles)
+
+    return cycles[run_starts], np.bincount(runs, weights=scores) /\
+        np.bincount(runs)
+
+
+# Convert text reports to compact binary reports
+# The text is parsed once into wide records in a temporary file, which
+# is then narrowed to the compact_dtype() of the largest cycle and code
+# Returns the number of reports
+def convert_text_reports(text_filename, binary_filename, block_size=1 << 24):
+
+    wide_dtype = compact_dtype(1 << 32, 1 << 16)
+    wide_filename = binary_filename + '.tmp'
+
+    count, max_cycle, max_code = 0, 0, 0
+
+    try:
+
+        with open(wide_filename, 'wb') as wide:
+
+            for cycles, codes in read_report_blocks(text_filename, block_size):
+
+                reports = np.empty(len(cycles), dtype=wide_dtype)
+                reports['cycle'] = cycles
+                reports['code'] = codes
+                wide.write(reports.tobytes())
+
+                if len(cycles) > 0:
+                    max_cycle = max(max_cycle, int(cycles.max()))
+                    max_code = max(max_code, int(codes.max()))
+
+                count += len(cycles)
+
+        dtype = compact_dtype(max_cycle, max_code)
+
+        with open(binary_filename, 'wb') as binary:
+
+            binary.write(npy_header(dtype, count))
+
+            if count > 0:
+
+                wide = np.memmap(wide_filename, dtype=wide_dtype, mode='r')
+                records = max(1, block_size // wide_dtype.itemsize)
+
+                for start in range(0, count, records):
+
+                    block = wide[start:start + records]
+
+                    reports = np.empty(len(block), dtype=dtype)
+                    reports['cycle'] = block['cycle']
+                    reports['code'] = block['code']
+                    binary.write(reports.tobytes())
+
+                del wide
+
+    finally:
+
+        if os.path.exists(wide_filename):
+            os.remove(wide_filename)
+
+    return count
@@ -0,0 +1,289 @@
+'''
+    The purpose of this module is to simulate an input file in shards.
+
+    Every sample in the input file is preceded and followed by a 0xFF
+    delimiter, and every chain restarts on a delimiter, so the file can be
+    split at delimiters and each shard simulated independently. A shard
+    runs from one delimiter up to and including the next shard's first
+    delimiter; reports are only made on closing delimiters, so no report
+    is lost or repeated. Shard-local cycles are shifted by the offset of
+    the shard to get the cycles of a serial run.
+
+    Shards are simulated by a process pool, either with the built-in
+    simulator or with an external VASIM-compatible command.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+from multiprocessing import Pool
+import os
+import shutil
+import subprocess
+import tempfile
+import numpy as np
+
+try:
+    from shlex import quote
+except ImportError:
+    from pipes import quote
+
+# Import tools
+from tools.reports import REPORT_DTYPE, npy_header, write_reports
+import tools.reference as reference
+import tools.shiftand as shiftand
+import tools.simulator as sim
+
+# Shared with the pool workers (inherited through fork)
+_data = None
+_network = None
+_engine = None
+_command = None
+_anml_filename = None
+_shard_dir = None
+_binary_dtype = None
+
+
+# Split data into about n_shards (start, end) byte ranges; every range
+# but the first starts on a delimiter, and ends on the next one's start
+def shard_bounds(data, n_shards, scan_size=1 << 16):
+
+    starts = [0]
+
+    for shard in range(1, n_shards):
+
+        position = max(len(data) * shard // n_shards, starts[-1] + 1)
+
+        # Move forward to the next delimiter
+        while position < len(data):
+
+            delimiters = np.flatnonzero(
+                data[position:position + scan_size] == sim.DELIMITER)
+
+            if len(delimiters) > 0:
+                position += delimiters[0]
+                break
+
+            position += scan_size
+
+        if position >= len(data) - 1:
+            break
+
+        starts.append(int(position))
+
+    # Shards overlap on the delimiter that closes one and opens the next
+    return [(start, end + 1) for start, end in zip(starts[:-1], starts[1:])] +\
+        [(starts[-1], len(data))]
+
+
+# Write a shard of the input to its own file; memoryview avoids a copy
+def write_shard(data, bounds, filename):
+
+    start, end = bounds
+
+    with open(filename, 'wb') as f:
+        f.write(memoryview(data)[start:end])
+
+
+# Shift the cycles of report batches by offset
+def offset_batches(batches, offset):
+
+    for cycles, chains in batches:
+        yield cycles + np.uint64(offset), chains
+
+
+# The built-in simulator for one shard of the input
+# The reports already have the cycles of a serial run
+def simulate_shard(shard, bounds):
+
+    data = _data[bounds[0]:bounds[1]]
+
+    if _engine == 'shift-and':
+        batches = shiftand.simulate_batches(_network, data)
+    elif _engine == 'reference':
+        batches = [reference.simulate(_network, data)]
+    else:
+        batches = sim.simulate_batches(_network, data)
+
+    batches = offset_batches(batches, bounds[0])
+
+    text_filename = os.path.join(_shard_dir, "reports_%d.txt" % shard)
+    binary_filename = None
+
+    if _binary_dtype is not None:
+        binary_filename = os.path.join(_shard_dir, "reports_%d.npy" % shard)
+
+    write_reports(batches, _network, text_filename, binary_filename,
+                  _binary_dtype)
+
+    return text_filename, binary_filename
+
+
+# An external simulator command for one shard of the input
+# {anml}, {input} and {report} in the command are replaced by the file
+# names; without {report}, the standard output is used as the report.
+# Each shard runs in its own directory, so simulators writing reports
+# to a fixed file name don't step on each other
+def run_command(shard, bounds):
+
+    shard_dir = os.path.join(_shard_dir, "shard_%d" % shard)
+    os.mkdir(shard_dir)
+
+    input_filename = os.path.join(shard_dir, "input.bin")
+    text_filename = os.path.join(_shard_dir, "reports_%d.txt" % shard)
+
+    write_shard(_data, bounds, input_filename)
+
+    command = _command.format(anml=quote(os.path.abspath(_anml_filename)
+                                         if _anml_filename else ''),
+                              input=quote(input_filename),
+                              report=quote(text_filename))
+
+    if '{report}' in _command:
+        subprocess.check_call(command, shell=True, cwd=shard_dir)
+    else:
+        with open(text_filename, 'w') as f:
+            subprocess.check_call(command, shell=True, stdout=f,
+                                  cwd=shard_dir)
+
+    shutil.rmtree(shard_dir)
+
+    return text_filename, None
+
+
+# Pool worker: simulate one (shard, bounds) job
+def run_shard(job):
+
+    if _command is not None:
+        return run_command(*job)
+
+    return simulate_shard(*job)
+
+
+# Concatenate text reports, shifting the leading cycle of every report
+# line by the offset of its shard; lines that are not reports are only
+# kept from the first shard. Returns the number of lines written
+def merge_text_reports(filenames, offsets, output_filename,
+                       block_size=1 << 20):
+
+    count = 0
+
+    with open(output_filename, 'w') as output:
+
+        for shard, (filename, offset) in enumerate(zip(filenames, offsets)):
+
+            with open(filename, 'r') as reports:
+
+                # Nothing to rewrite; copy the reports as they are
+                if offset == 0:
+
+                    block = reports.read(block_size)
+
+                    while block:
+                        output.write(block)
+                        count += block.count('\n')
+                        block = reports.read(block_size)
+
+                    continue
+
+                for line in reports:
+
+                    cycle, separator, rest = line.partition(':')
+                    local = cycle.strip()
+
+                    if separator and local.isdigit():
+                        output.write(cycle.replace(local,
+                                                   str(int(local) + offset),
+                                                   1) + separator + rest)
+                        count += 1
+
+                    elif shard == 0:
+                        output.write(line)
+
+    return count
+
+
+# Concatenate binary reports, shifting the cycles by the shard offsets
+def merge_binary_reports(filenames, offsets, output_filename,
+                         chunk_size=1 << 20, dtype=REPORT_DTYPE):
+
+    count = 0
+
+    with open(output_filename, 'wb') as output:
+
+        output.write(npy_header(dtype, 0))
+
+        for filename, offset in zip(filenames, offsets):
+
+            reports = np.load(filename, mmap_mode='r')
+
+            for start in range(0, len(reports), chunk_size):
+
+                chunk = np.array(reports[start:start + chunk_size])
+                chunk['cycle'] += chunk.dtype['cycle'].type(offset)
+
+                output.write(chunk.tobytes())
+
+            count += len(reports)
+
+        output.seek(0)
+        output.write(npy_header(dtype, count))
+
+    return count
+
+
+# Simulate data in n_jobs shards, with the built-in simulator on the
+# network or with an external command, and merge the reports in order
+# Returns the number of reports
+def simulate_sharded(data, n_jobs, text_filename, binary_filename=None,
+                     network=None, engine='windows', command=None,
+                     anml_filename=None, binary_dtype=REPORT_DTYPE):
+
+    global _data, _network, _engine, _command, _anml_filename, _shard_dir,\
+        _binary_dtype
+
+    assert network is not None or command is not None,\
+        "Provide a network or a simulator command"
+    assert command is None or binary_filename is None,\
+        "External simulators only produce text reports"
+
+    bounds = shard_bounds(data, n_jobs)
+
+    _data, _network, _engine, _command, _anml_filename, _binary_dtype =\
+        data, network, engine, command, anml_filename,\
+        binary_dtype if binary_filename is not None else None
+    _shard_dir = tempfile.mkdtemp(prefix='shards_')
+
+    try:
+
+        jobs = list(enumerate(bounds))
+
+        if n_jobs > 1 and len(jobs) > 1:
+            pool = Pool(n_jobs)
+            results = pool.map(run_shard, jobs, 1)
+            pool.close()
+            pool.join()
+        else:
+            results = [run_shard(job) for job in jobs]
+
+        # Only the external simulators report shard-local cycles
+        if command is not None:
+            offsets = [start for start, end in bounds]
+        else:
+            offsets = [0] * len(bounds)
+
+        count = merge_text_reports([text for text, binary in results],
+                                   offsets, text_filename)
+
+        if binary_filename is not None:
+            merge_binary_reports([binary for text, binary in results],
+                                 offsets, binary_filename,
+                                 dtype=binary_dtype)
+
+    finally:
+
+        shutil.rmtree(_shard_dir)
+        _data, _network, _shard_dir = None, None, None
+
+    return count
@@ -0,0 +1,207 @@
+'''
+    The purpose of this module is to simulate the chain networks we
+    generate with bit-parallel (Shift-And) state updates.
+
+    Every chain owns ste_count_ + 1 consecutive bits of one long bit
+    vector: its start STE, followed by its chain STEs in order. For each
+    symbol the active states are shifted up by one bit (every STE enables
+    the next one), the start STEs are enabled (all-input), the last STE
+    of every chain re-enables start_loop_, and the result is ANDed with
+    the accept mask of the symbol. A chain reports when its end_loop_ STE
+    (any of its STEs, without an end_loop_) is active and the next symbol
+    is the delimiter the report STE matches.
+
+    Windows between delimiters are independent, so a batch of windows is
+    advanced in lockstep, one row of the state matrix per window.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+import numpy as np
+
+# Import tools
+from tools.simulator import DELIMITER, LSB_BIT_OFFSETS, find_delimiters,\
+    unpack_matches
+
+# Shift amounts; numpy won't shift uint64 arrays by Python ints
+ONE = np.uint64(1)
+CARRY = np.uint64(63)
+
+
+# Pack booleans into little-endian uint64 words; bit i goes to bit i % 64
+# of word i // 64
+def pack_words(bits, words):
+
+    padded = np.zeros(words * 64, dtype=bool)
+    padded[:len(bits)] = bits
+
+    return np.packbits(padded.reshape(-1, 8)[:, ::-1]).view('<u8')
+
+
+# Build the bit masks of the network
+def compile_masks(network):
+
+    chains = len(network)
+    stride = network.ste_count_ + 1
+    words = max(1, (chains * stride + 63) // 64)
+
+    # Bit offset of the first STE of every chain
+    base = np.arange(chains) * stride
+
+    masks = {'stride': stride, 'words': words}
+
+    # Without an end_loop_, any chain STE can enable the report
+    if network.end_loop_ is None:
+        report_offsets = range(1, stride)
+    else:
+        report_offsets = [network.end_loop_ + 1]
+
+    # The start STEs, the last chain STEs and the STEs enabling the reports
+    for name, offsets in [('start', [0]), ('last', [network.ste_count_]),
+                          ('report', report_offsets)]:
+
+        bits = np.zeros(chains * stride, dtype=bool)
+
+        for offset in offsets:
+            bits[base + offset] = True
+
+        masks[name] = pack_words(bits, words)
+
+    # The loop moves the last chain STE down to start_loop_
+    if network.start_loop_ is None:
+        masks['loop_shift'] = None
+    else:
+        masks['loop_shift'] = network.ste_count_ - 1 - network.start_loop_
+
+    # Symbol -> accept mask of every STE
+    accept = np.zeros((256, words), dtype='<u8')
+
+    for symbol in range(256):
+
+        bits = np.zeros((chains, stride), dtype=bool)
+
+        # The start STEs only match the delimiter
+        bits[:, 0] = symbol == DELIMITER
+
+        for ste in range(network.ste_count_):
+            bits[:, ste + 1] = np.unpackbits(
+                network.tables_[ste][symbol].view(np.uint8))[:chains]
+
+        accept[symbol] = pack_words(bits.ravel(), words)
+
+    masks['accept'] = accept
+
+    return masks
+
+
+# Shift every row of packed bits towards bit 0 by count bits
+def shift_down(bits, count, out):
+
+    word_shift, bit_shift = divmod(count, 64)
+    words = bits.shape[1]
+
+    out[:] = 0
+
+    if word_shift >= words:
+        return out
+
+    out[:, :words - word_shift] = bits[:, word_shift:] >> np.uint64(bit_shift)
+
+    if bit_shift > 0 and word_shift + 1 < words:
+        out[:, :words - word_shift - 1] |=\
+            bits[:, word_shift + 1:] << np.uint64(64 - bit_shift)
+
+    return out
+
+
+# Advance the states of a (windows, length) matrix of symbols
+# Returns the states after the last symbol of every window
+def run_windows(masks, symbols):
+
+    rows = symbols.shape[0]
+
+    # The opening delimiter leaves only the start STEs active
+    states = np.tile(masks['start'], (rows, 1))
+
+    enabled = np.empty_like(states)
+    carry = np.empty_like(states)
+    scratch = np.empty_like(states)
+
+    for position in range(symbols.shape[1]):
+
+        # Every STE enables the following one...
+        np.left_shift(states, ONE, out=enabled)
+        np.right_shift(states, CARRY, out=carry)
+        enabled[:, 1:] |= carry[:, :-1]
+
+        # ...the start STEs are always enabled...
+        enabled |= masks['start']
+
+        # ...and the last STE of every chain enables the loop
+        if masks['loop_shift'] is not None:
+            np.bitwise_and(states, masks['last'], out=scratch)
+            enabled |= shift_down(scratch, masks['loop_shift'], carry)
+
+        np.take(masks['accept'], symbols[:, position], axis=0, out=states)
+        states &= enabled
+
+    return states
+
+
+# Run a symbol stream through the network, one batch of windows at a time
+# Yields (cycles, chains) like tools.simulator.simulate_batches()
+def simulate_batches(network, data, batch_size=None, masks=None):
+
+    data = np.asarray(data, dtype=np.uint8)
+
+    if masks is None:
+        masks = compile_masks(network)
+
+    delimiters = find_delimiters(data)
+
+    # Window i starts after delimiters[i] and reports on delimiters[i + 1]
+    starts = delimiters[:-1] + 1
+    ends = delimiters[1:]
+    lengths = ends - starts
+
+    # Keep the working set of one batch within a few dozen MB
+    if batch_size is None:
+        batch_size = max(1, min(1 << 16, (1 << 20) // masks['words']))
+
+    for batch_start in range(0, len(starts), batch_size):
+
+        batch_starts = starts[batch_start:batch_start + batch_size]
+        batch_ends = ends[batch_start:batch_start + batch_size]
+        batch_lengths = lengths[batch_start:batch_start + batch_size]
+
+        batch_cycles = []
+        batch_chains = []
+
+        # Windows in lockstep have to be the same length; group them
+        for length in np.unique(batch_lengths):
+
+            windows = np.flatnonzero(batch_lengths == length)
+
+            # (windows, length) matrix of symbols
+            symbols = data[batch_starts[windows][:, np.newaxis] +
+                           np.arange(length)]
+
+            states = run_windows(masks, symbols)
+            states &= masks['report']
+
+            rows, bits = unpack_matches(states, LSB_BIT_OFFSETS)
+
+            batch_cycles.append(batch_ends[windows[rows]])
+            batch_chains.append(bits // masks['stride'])
+
+        cycles = np.concatenate(batch_cycles).astype(np.uint64)
+        chains = np.concatenate(batch_chains)
+
+        # Each group is already in order; merge them if there are several
+        if len(batch_cycles) > 1:
+            order = np.lexsort((chains, cycles))
+            cycles, chains = cycles[order], chains[order]
+
+        yield cycles, chains
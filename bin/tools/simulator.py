@@ -0,0 +1,316 @@
+'''
+    The purpose of this module is to simulate the chain networks we
+    generate on a CPU, without VASIM or AP hardware.
+
+    The start STE of every chain only matches the 0xFF delimiter and none
+    of the chain STEs do, so each window of symbols between two delimiters
+    is simulated independently: a chain reports on the closing delimiter
+    if the STE visited by every symbol of the window accepts it, and the
+    last symbol is consumed by the STE that enables the report STE.
+    Windows are evaluated in batches with one packed bit per chain.
+
+    Networks can be loaded from the in-memory chains and feature table,
+    or by parsing the ANML files generated by tools/anmltools.py.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# Utility Imports
+import re
+import numpy as np
+
+try:
+    import xml.etree.cElementTree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+# Automata Imports
+from classes.network import ChainNetwork
+
+# Import tools
+from tools.anmltools import character_ranges, report_code
+
+# The start-of-sample delimiter
+DELIMITER = 255
+
+# \xNN or \xNN-\xNN inside of a character class
+RANGE_PATTERN = re.compile(r'\\x([0-9A-Fa-f]{2})(?:-\\x([0-9A-Fa-f]{2}))?')
+
+# <tree>t_<chain>l_<code>r
+REPORT_ID_PATTERN = re.compile(r'^(\d+)t_(\d+)l_(\d+)r$')
+
+
+# Build the network from the chains and the feature table
+def network_from_chains(chains, ft, value_map):
+
+    if ft.unrolled or ft.start_loop_ is None:
+        network = ChainNetwork(ft.ste_count_, None, ft.ste_count_ - 1)
+    else:
+        network = ChainNetwork(ft.ste_count_, ft.start_loop_, ft.end_loop_)
+
+    for chain in chains:
+
+        accept = np.zeros((ft.ste_count_, 256), dtype=bool)
+
+        for ste, ste_ranges in enumerate(character_ranges(chain, ft)):
+
+            for start, end in ste_ranges:
+
+                if end is None:
+                    accept[ste, start] = True
+                else:
+                    accept[ste, start:end + 1] = True
+
+        network.add_chain(chain.tree_id_, chain.chain_id_,
+                          report_code(chain, value_map), accept)
+
+    network.finalize()
+
+    return network
+
+
+# Convert an ANML character class like [\x00-\x0A\x0F] into 256 booleans
+def parse_character_class(character_class):
+
+    accept = np.zeros(256, dtype=bool)
+
+    for start, end in RANGE_PATTERN.findall(character_class):
+
+        if end:
+            accept[int(start, 16):int(end, 16) + 1] = True
+        else:
+            accept[int(start, 16)] = True
+
+    return accept
+
+
+# Parse an ANML file generated by generate_anml() into a network
+def network_from_anml(anml_filename):
+
+    symbols = {}
+    edges = {}
+    reports = {}
+    starts = []
+
+    # Stream through the STEs; we only need ids, symbols, edges and reports
+    for event, element in ET.iterparse(anml_filename):
+
+        if element.tag != 'state-transition-element':
+            continue
+
+        ste_id = element.get('id')
+
+        symbols[ste_id] = element.get('symbol-set')
+        edges[ste_id] = [e.get('element') for e in
+                         element.findall('activate-on-match')]
+
+        report = element.find('report-on-match')
+
+        if report is not None:
+            reports[ste_id] = int(report.get('reportcode'))
+
+        if element.get('start') is not None:
+            starts.append(ste_id)
+
+        element.clear()
+
+    network = None
+
+    for start_id in starts:
+
+        assert len(edges[start_id]) == 1,\
+            "Start STE %s should enable exactly one STE" % start_id
+
+        # Walk the chain from the start STE until we run out of new STEs
+        path = []
+        on_path = {}
+        start_loop = None
+        end_loop = None
+        report_id = None
+        current = edges[start_id][0]
+
+        while current is not None:
+
+            on_path[current] = len(path)
+            path.append(current)
+
+            following = None
+
+            for neighbor in edges[current]:
+
+                if neighbor in reports:
+                    end_loop = len(path) - 1
+                    report_id = neighbor
+
+                elif neighbor in on_path:
+                    start_loop = on_path[neighbor]
+
+                else:
+                    following = neighbor
+
+            current = following
+
+        if report_id is None:
+            raise ValueError("Chain starting at %s never reports" % start_id)
+
+        if network is None:
+            network = ChainNetwork(len(path), start_loop, end_loop)
+
+        elif (len(path), start_loop, end_loop) !=\
+                (network.ste_count_, network.start_loop_, network.end_loop_):
+            raise ValueError("Chain starting at %s has a different shape" %
+                             start_id)
+
+        accept = np.array([parse_character_class(symbols[ste_id]) for
+                           ste_id in path])
+
+        match = REPORT_ID_PATTERN.match(report_id)
+
+        if match is not None:
+            tree_id, chain_id = int(match.group(1)), int(match.group(2))
+        else:
+            tree_id, chain_id = -1, len(network)
+
+        network.add_chain(tree_id, chain_id, reports[report_id], accept)
+
+    if network is None:
+        raise ValueError("No chains found in %s" % anml_filename)
+
+    network.finalize()
+
+    return network
+
+
+# Load a symbol stream without copying it into memory
+def load_input(input_filename):
+
+    return np.memmap(input_filename, dtype=np.uint8, mode='r')
+
+
+# Find the offsets of all delimiters, a chunk of the stream at a time
+def find_delimiters(data, chunk_size=1 << 26):
+
+    return np.concatenate([np.flatnonzero(data[start:start + chunk_size] ==
+                                          DELIMITER) + start
+                           for start in range(0, len(data), chunk_size)] +
+                          [np.zeros(0, dtype=np.int64)])
+
+
+# Run a symbol stream through the network, one batch of windows at a time
+# Yields (cycles, chains): the cycle and chain index of every report,
+# ordered by cycle, then by chain
+def simulate_batches(network, data, batch_size=None):
+
+    data = np.asarray(data, dtype=np.uint8)
+
+    delimiters = find_delimiters(data)
+
+    # Window i starts after delimiters[i] and reports on delimiters[i + 1]
+    starts = delimiters[:-1] + 1
+    ends = delimiters[1:]
+    lengths = ends - starts
+
+    # Keep the working set of one batch within a few dozen MB
+    if batch_size is None:
+        batch_size = max(1, min(1 << 16, (1 << 23) // network.words_))
+
+    for batch_start in range(0, len(starts), batch_size):
+
+        batch_starts = starts[batch_start:batch_start + batch_size]
+        batch_ends = ends[batch_start:batch_start + batch_size]
+        batch_lengths = lengths[batch_start:batch_start + batch_size]
+
+        batch_cycles = []
+        batch_chains = []
+
+        # Windows are normally all the same length; group them if not
+        for length in np.unique(batch_lengths):
+
+            states = network.window_states(length)
+
+            if states is None:
+                continue
+
+            windows = np.flatnonzero(batch_lengths == length)
+
+            # (windows, length) matrix of symbols
+            symbols = data[batch_starts[windows][:, np.newaxis] +
+                           np.arange(length)]
+
+            matches = np.take(network.tables_[states[0]], symbols[:, 0],
+                              axis=0)
+            scratch = np.empty_like(matches)
+
+            for position in range(1, length):
+
+                np.take(network.tables_[states[position]],
+                        symbols[:, position], axis=0, out=scratch)
+                np.bitwise_and(matches, scratch, out=matches)
+
+            rows, chains = unpack_matches(matches)
+
+            batch_cycles.append(batch_ends[windows[rows]])
+            batch_chains.append(chains)
+
+        if not batch_cycles:
+            continue
+
+        cycles = np.concatenate(batch_cycles).astype(np.uint64)
+        chains = np.concatenate(batch_chains)
+
+        # Each group is already in order; merge them if there are several
+        if len(batch_cycles) > 1:
+            order = np.lexsort((chains, cycles))
+            cycles, chains = cycles[order], chains[order]
+
+        yield cycles, chains
+
+
+# Run a symbol stream through the network
+# Returns (cycles, chains) for all reports; see simulate_batches()
+def simulate(network, data, batch_size=None):
+
+    all_cycles = [np.zeros(0, dtype=np.uint64)]
+    all_chains = [np.zeros(0, dtype=np.int64)]
+
+    for cycles, chains in simulate_batches(network, data, batch_size):
+        all_cycles.append(cycles)
+        all_chains.append(chains)
+
+    return np.concatenate(all_cycles), np.concatenate(all_chains)
+
+
+# Set bits of every byte value; BIT_OFFSETS lists them in packbits() order
+# (MSB = first chain), LSB_BIT_OFFSETS lists them from the LSB up
+BIT_COUNTS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, np.newaxis],
+                           axis=1).sum(axis=1).astype(np.int64)
+BIT_OFFSETS = np.array([list(np.flatnonzero(
+    np.unpackbits(np.array([value], dtype=np.uint8)))) + [0] * (8 - count)
+    for value, count in enumerate(BIT_COUNTS)], dtype=np.int64)
+LSB_BIT_OFFSETS = np.array([list(7 - np.flatnonzero(
+    np.unpackbits(np.array([value], dtype=np.uint8)))[::-1]) + [0] * (8 - count)
+    for value, count in enumerate(BIT_COUNTS)], dtype=np.int64)
+
+
+# Convert packed (rows, words) match bits into (row, bit) pairs,
+# ordered by row, then by bit
+def unpack_matches(matches, bit_offsets=BIT_OFFSETS):
+
+    matches = matches.view(np.uint8)
+    row_bytes = matches.shape[1]
+
+    # Only look at the bytes that have at least one match
+    nonzero = np.flatnonzero(matches)
+    values = matches.ravel()[nonzero]
+    counts = BIT_COUNTS[values]
+
+    # One entry per set bit: which byte it is in, and which bit of the byte
+    hits = np.repeat(np.arange(len(nonzero)), counts)
+    nth_bit = np.arange(len(hits)) - np.repeat(np.cumsum(counts) - counts,
+                                               counts)
+
+    hit_bytes = nonzero[hits]
+
+    return hit_bytes // row_bytes, (hit_bytes % row_bytes) * 8 +\
+        bit_offsets[values[hits], nth_bit]
@@ -82,6 +82,7 @@ def recurse(tree, index, temp_chain, threshold_map, values):
 
         # Set the value of the chain
         temp_chain.set_value(value)
+        temp_chain.set_leaf_id(index)
 
         # This returns the chain as a single value list
         return [temp_chain]
@@ -0,0 +1,214 @@
+'''
+    The purpose of this module is to sweep the hyperparameters of the
+    trainEnsemble.py models and measure what each configuration costs on
+    the automata: every configuration is trained, converted to chains and
+    a feature table in-process (like automatize.py) and timed on the CPU.
+
+    Configurations are run by a process pool; the training and testing
+    data are module globals, inherited by the workers.
+    ----------------------
+    19 October 2026
+    Version 0.1
+'''
+
+# tools/sklearn.py would shadow sklearn in Python 2
+from __future__ import absolute_import
+
+# Utility Imports
+from multiprocessing import Pool
+import csv
+import itertools
+import json
+import time
+import numpy as np
+
+# Model Imports
+from sklearn.ensemble import AdaBoostClassifier, GradientBoostingClassifier,\
+    RandomForestClassifier
+
+# Import tools
+from tools.binning import automata_cost, bin_features, quantile_edges,\
+    unbin_thresholds
+
+# The models of trainEnsemble.py
+MODELS = {'rf': RandomForestClassifier,
+          'brt': GradientBoostingClassifier,
+          'ada': AdaBoostClassifier}
+
+# The hyperparameters swept, and the metrics measured, in column order
+PARAMETERS = ['model', 'max_depth', 'max_leaf_nodes', 'n_estimators',
+              'max_thresholds']
+METRICS = ['accuracy', 'chains', 'ste_count', 'loop_length',
+           'bytes_per_sample', 'max_feature_thresholds', 'train_seconds',
+           'ksamples_per_second']
+
+# Objectives of the Pareto front: maximized, then minimized; the CPU
+# throughput is left out, since workers time their models side by side
+MAXIMIZED = ['accuracy']
+MINIMIZED = ['ste_count', 'bytes_per_sample']
+
+# The tree shape parameters each model ignores
+IGNORED = {'ada': ['max_depth', 'max_leaf_nodes']}
+
+# Globals of the pool workers
+_X_train = None
+_y_train = None
+_X_test = None
+_y_test = None
+_iters = None
+
+
+# Every combination of the hyperparameter grids; grids maps parameters to
+# lists of values ([None] for parameters left alone). Parameters a model
+# ignores are None in its configurations, which are only listed once
+def grid_configs(grids):
+
+    configs = []
+
+    for values in itertools.product(*[grids.get(name) or [None]
+                                      for name in PARAMETERS]):
+
+        config = dict(zip(PARAMETERS, values))
+
+        for name in IGNORED.get(config['model'], []):
+            config[name] = None
+
+        if config not in configs:
+            configs.append(config)
+
+    return configs
+
+
+# Build the model of a configuration, like trainEnsemble.py
+def build_model(config):
+
+    params = {'n_estimators': config['n_estimators']}
+
+    # AdaBoost keeps its default stumps (see IGNORED)
+    for name in ['max_depth', 'max_leaf_nodes']:
+        if config[name] is not None:
+            params[name] = config[name]
+
+    return MODELS[config['model']](**params)
+
+
+# Pool worker: train, convert and time one configuration
+# Returns the configuration with its metrics
+def evaluate(config):
+
+    model = build_model(config)
+
+    start_time = time.time()
+
+    # Automata-aware training on quantile bins (trainEnsemble.py -k)
+    if config['max_thresholds'] is not None:
+
+        edges = quantile_edges(_X_train, config['max_thresholds'])
+
+        model.fit(bin_features(_X_train, edges), _y_train.ravel())
+        unbin_thresholds(model, edges)
+
+    else:
+        model.fit(_X_train, _y_train.ravel())
+
+    train_seconds = time.time() - start_time
+
+    start_time = time.time()
+
+    for i in range(_iters):
+        predictions = model.predict(_X_test)
+
+    avg_time = (time.time() - start_time) / _iters
+
+    cost = automata_cost(model)
+
+    result = dict(config)
+    result.update({'accuracy': float(np.mean(predictions == _y_test.ravel())),
+                   'chains': cost['chains'],
+                   'ste_count': cost['ste_count'],
+                   'loop_length': cost['loop_length'],
+                   'bytes_per_sample': cost['cycles_per_classification'],
+                   'max_feature_thresholds': cost['max_feature_thresholds'],
+                   'train_seconds': train_seconds,
+                   'ksamples_per_second': len(_X_test) / avg_time / 1000.0})
+
+    return result
+
+
+# Flag the results on the Pareto front: no other result is at least as
+# good on every objective and better on one
+def pareto_front(results, maximized=MAXIMIZED, minimized=MINIMIZED):
+
+    # Negate the maximized objectives, so lower is better everywhere
+    points = np.array([[-result[name] for name in maximized] +
+                       [result[name] for name in minimized]
+                       for result in results], dtype=np.float64)
+
+    front = []
+
+    for point in points:
+
+        dominated = np.any(np.all(points <= point, axis=1) &
+                           np.any(points < point, axis=1))
+
+        front.append(not dominated)
+
+    return front
+
+
+# Run every configuration in a pool of n_jobs processes
+# Returns the results in configuration order, with their Pareto flags
+def sweep(configs, X_train, y_train, X_test, y_test, n_jobs=1, iters=10,
+          callback=None):
+
+    global _X_train, _y_train, _X_test, _y_test, _iters
+
+    _X_train, _y_train, _X_test, _y_test, _iters =\
+        X_train, y_train, X_test, y_test, iters
+
+    results = []
+
+    if n_jobs > 1 and len(configs) > 1:
+
+        pool = Pool(n_jobs)
+
+        for result in pool.imap(evaluate, configs):
+            results.append(result)
+
+            if callback is not None:
+                callback(result)
+
+        pool.close()
+        pool.join()
+
+    else:
+
+        for config in configs:
+            results.append(evaluate(config))
+
+            if callback is not None:
+                callback(results[-1])
+
+    for result, pareto in zip(results, pareto_front(results)):
+        result['pareto'] = pareto
+
+    return results
+
+
+# Write the results to a CSV file, or a JSON list with a .json extension
+def write_results(results, filename):
+
+    if filename.endswith('.json'):
+
+        with open(filename, 'w') as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+
+        return
+
+    with open(filename, 'w') as f:
+
+        writer = csv.DictWriter(f, PARAMETERS + METRICS + ['pareto'])
+        writer.writeheader()
+
+        for result in results:
+            writer.writerow(result)
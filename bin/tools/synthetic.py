@@ -0,0 +1,346 @@
+'''
+    The purpose of this module is to generate synthetic tree ensembles,
+    so the automatize pipeline can be benchmarked at any size without
+    training a model or downloading a dataset.
+
+    A synthetic forest looks like a sklearn forest to the pipeline: its
+    estimators_ have tree_ arrays in sklearn's layout (nodes in depth
+    first order, leaves with feature -2). Every feature draws its
+    thresholds from its own pool of uniform values in [0, 1) (or of split
+    points of a data sample, see data_pools()), and the features are
+    picked with a Zipf-like skew, so a few features can hold most of the
+    thresholds, like the features of real models do. Trees never test a
+    threshold outside the interval left by their ancestors, so every chain
+    matches some input. write_quickrank() writes a forest as a QuickRank
+    XML ensemble.
+
+    Synthetic datasets replace the canned datasets of trainEnsemble.py on
+    machines without network access. The features are uniform, binary
+    (like thresholded OCR pixels) or heavy tailed (like the MSLR counts:
+    mostly zeros and small values, a few huge ones). The labels come from
+    a hidden linear model of the features plus noise: the argmax of one
+    score per class, or relevance grades of the score for ranking, where
+    the rows are grouped in queries of consecutive documents.
+    ----------------------
+    19 October 2026
+    Version 0.2
+'''
+
+# Utility Imports
+import numpy as np
+
+# The value distributions of the synthetic features
+DISTRIBUTIONS = ['uniform', 'binary', 'heavy']
+
+# The tasks of the synthetic datasets
+TASKS = ['classification', 'ranking']
+
+# The share of the documents at every relevance grade, like MSLR's
+GRADE_SHARES = [0.5, 0.3, 0.15, 0.04, 0.01]
+
+# Rows generated at a time, bounding the float64 temporaries
+CHUNK_ROWS = 1 << 16
+
+
+# A stand-in for a sklearn object: an object with the given attributes
+class Attributes(object):
+
+    def __init__(self, **attributes):
+
+        self.__dict__.update(attributes)
+
+
+# The probability of picking every feature; feature i is picked with a
+# weight of 1 / (i + 1) ** skew (skew 0 is uniform)
+def feature_probabilities(features, skew):
+
+    weights = 1.0 / (np.arange(features) + 1.0) ** skew
+
+    return weights / weights.sum()
+
+
+# Generate one tree of at most depth levels of tests
+# pools is a (features, thresholds) array of sorted thresholds
+def synthetic_tree(random, depth, pools, probabilities, classes):
+
+    feature, threshold, left, right, value = [], [], [], [], []
+
+    # Add the nodes depth first; lo and hi bound every feature on the path
+    # Returns the index of the node
+    def add_node(level, lo, hi):
+
+        index = len(feature)
+
+        feature.append(-2)
+        threshold.append(-2.0)
+        left.append(-1)
+        right.append(-1)
+        value.append(np.zeros(classes))
+
+        if level < depth:
+
+            # A few tries at a feature with a threshold inside its bounds
+            for attempt in range(8):
+
+                f = random.choice(len(pools), p=probabilities)
+
+                first = np.searchsorted(pools[f], lo[f], side='right')
+                last = np.searchsorted(pools[f], hi[f], side='left')
+
+                if first < last:
+                    break
+
+            else:
+                first = last = None
+
+            if first is not None:
+
+                t = pools[f][random.randint(first, last)]
+
+                feature[index] = f
+                threshold[index] = t
+
+                # x <= t goes left, x > t right
+                left_hi = hi.copy()
+                left_hi[f] = t
+                left[index] = add_node(level + 1, lo, left_hi)
+
+                right_lo = lo.copy()
+                right_lo[f] = t
+                right[index] = add_node(level + 1, right_lo, hi)
+
+                return index
+
+        # A leaf: the class counts of its samples
+        value[index] = random.randint(0, 10, classes).astype(np.float64)
+        value[index][random.randint(classes)] += 10
+
+        return index
+
+    features = len(pools)
+    add_node(0, np.full(features, -np.inf), np.full(features, np.inf))
+
+    return Attributes(feature=np.array(feature, dtype=np.int64),
+                      threshold=np.array(threshold, dtype=np.float64),
+                      children_left=np.array(left, dtype=np.int64),
+                      children_right=np.array(right, dtype=np.int64),
+                      value=np.array(value)[:, np.newaxis, :])
+
+
+# Generate a forest of trees of the given depth over features features,
+# each with a pool of thresholds thresholds (see feature_probabilities()
+# for the skew); pools replaces the uniform pools with sorted thresholds
+# by feature. Returns a model object the pipeline reads like a sklearn
+# forest
+def synthetic_forest(trees, depth, features, thresholds=64, skew=1.0,
+                     classes=2, seed=0, pools=None):
+
+    random = np.random.RandomState(seed)
+
+    probabilities = feature_probabilities(features, skew)
+
+    if pools is None:
+
+        # float32 thresholds, like sklearn's
+        pools = np.sort(random.rand(features, thresholds).astype(np.float32),
+                        axis=1).astype(np.float64)
+
+    else:
+
+        # Features without a threshold (constant in the data) are never split
+        probabilities = probabilities * np.array([len(pool) > 0
+                                                  for pool in pools])
+        probabilities /= probabilities.sum()
+
+    estimators = [Attributes(tree_=synthetic_tree(random, depth, pools,
+                                                  probabilities, classes))
+                  for tree in range(trees)]
+
+    return Attributes(estimators_=estimators, classes_=np.arange(classes),
+                      n_features_=features)
+
+
+# Generate samples uniform in [0, 1), the range of the thresholds
+def synthetic_samples(samples, features, seed=0):
+
+    return np.random.RandomState(seed).rand(samples, features)
+
+
+# Split points of every feature of X: the midpoints between consecutive
+# distinct values, at most thresholds of them by feature
+def data_pools(X, thresholds):
+
+    pools = []
+
+    for column in np.asarray(X, dtype=np.float64).T:
+
+        values = np.unique(column)
+        points = (values[:-1] + values[1:]) / 2.0
+
+        if len(points) > thresholds:
+            points = points[np.linspace(0, len(points) - 1,
+                                        thresholds).astype(np.int64)]
+
+        # float32 thresholds, like sklearn's
+        pools.append(np.unique(points.astype(np.float32)).astype(np.float64))
+
+    return pools
+
+
+# The parameters of the features of a distribution, drawn once so every
+# chunk of rows follows the same distribution
+def feature_parameters(random, features, distribution):
+
+    if distribution == 'uniform':
+        return {}
+
+    # Every pixel is on with its own probability, mostly near 0 or 1
+    if distribution == 'binary':
+        return {'p': random.beta(0.5, 0.5, features)}
+
+    # Pareto counts with their own scale and share of zeros by feature
+    if distribution == 'heavy':
+        return {'scale': random.lognormal(0.0, 1.0, features),
+                'zeros': random.rand(features)}
+
+    raise ValueError("No %s distribution; use one of %s" %
+                     (distribution, ', '.join(DISTRIBUTIONS)))
+
+
+# Generate rows x features float32 values of a distribution
+def synthetic_features(random, rows, features, distribution, parameters):
+
+    if distribution == 'uniform':
+        X = random.rand(rows, features)
+
+    elif distribution == 'binary':
+        X = random.rand(rows, features) < parameters['p']
+
+    else:
+        X = np.floor(random.pareto(1.5, (rows, features)) *
+                     parameters['scale'])
+        X[random.rand(rows, features) < parameters['zeros']] = 0
+
+    return X.astype(np.float32)
+
+
+# Generate a dataset of rows samples of features features
+# task: classification (classes labels) or ranking (classes relevance
+# grades, in queries of docs_per_query rows)
+# noise: the standard deviation of the label noise, relative to the
+# spread of the scores
+# Returns (X, y, qid); qid is None for classification
+def synthetic_dataset(rows, features, distribution='uniform', classes=2,
+                      task='classification', docs_per_query=100, noise=0.1,
+                      seed=0):
+
+    if task not in TASKS:
+        raise ValueError("No %s task; use one of %s" % (task, ', '.join(TASKS)))
+
+    random = np.random.RandomState(seed)
+
+    parameters = feature_parameters(random, features, distribution)
+
+    # The hidden linear model: one score per class, one for ranking
+    weights = random.normal(0.0, 1.0, (features,
+                                       classes if task == 'classification'
+                                       else 1))
+
+    X = np.empty((rows, features), dtype=np.float32)
+    scores = np.empty((rows, weights.shape[1]))
+
+    for start in range(0, rows, CHUNK_ROWS):
+
+        chunk = synthetic_features(random, min(CHUNK_ROWS, rows - start),
+                                   features, distribution, parameters)
+
+        X[start:start + len(chunk)] = chunk
+
+        # Heavy tails would drown the other features in the scores
+        if distribution == 'heavy':
+            chunk = np.log1p(chunk)
+
+        scores[start:start + len(chunk)] = np.dot(chunk, weights)
+
+    scores -= scores.mean(axis=0)
+    scores += random.normal(0.0, noise * max(scores.std(), 1e-12),
+                            scores.shape)
+
+    if task == 'classification':
+        return X, np.argmax(scores, axis=1).astype(np.int64), None
+
+    # Grades cut at the quantiles of the score, most documents irrelevant
+    shares = np.array(GRADE_SHARES[:classes] if classes <= len(GRADE_SHARES)
+                      else [1.0] * classes, dtype=np.float64)
+    cuts = np.sort(scores[:, 0])[(np.cumsum(shares / shares.sum())[:-1] *
+                                  (rows - 1)).astype(np.int64)]
+
+    y = np.searchsorted(cuts, scores[:, 0], side='right').astype(np.int64)
+
+    return X, y, np.arange(rows, dtype=np.int64) // docs_per_query
+
+
+# Write a dataset as the .npz trainEnsemble.py reads (X, y and qid)
+def write_dataset(filename, X, y, qid=None):
+
+    if qid is None:
+        np.savez(filename, X=X, y=y)
+    else:
+        np.savez(filename, X=X, y=y, qid=qid)
+
+
+# Write the splits of a synthetic forest as QuickRank XML lines
+# QuickRank features are one-based; outputs are the leaf values
+def quickrank_splits(tree, node, outputs, lines, indent, pos=None):
+
+    tag = '<split>' if pos is None else '<split pos="%s">' % pos
+
+    lines.append(indent + tag)
+
+    if tree.children_left[node] == -1:
+        lines.append(indent + ' <output>%r</output>' % outputs[node])
+
+    else:
+        lines.append(indent + ' <feature>%d</feature>' %
+                     (tree.feature[node] + 1))
+        lines.append(indent + ' <threshold>%r</threshold>' %
+                     float(tree.threshold[node]))
+
+        quickrank_splits(tree, tree.children_left[node], outputs, lines,
+                         indent + ' ', 'left')
+        quickrank_splits(tree, tree.children_right[node], outputs, lines,
+                         indent + ' ', 'right')
+
+    lines.append(indent + '</split>')
+
+
+# Write a synthetic forest as a QuickRank MART ensemble of trees weighted
+# shrinkage, with normal leaf outputs
+def write_quickrank(filename, model, shrinkage=0.1, seed=0):
+
+    random = np.random.RandomState(seed)
+
+    trees = [estimator.tree_ for estimator in model.estimators_]
+
+    leaves = max(int((tree.children_left == -1).sum()) for tree in trees)
+
+    with open(filename, 'w') as f:
+
+        f.write('<ranker>\n<info>\n<type>MART</type>\n')
+        f.write('<trees>%d</trees>\n<leaves>%d</leaves>\n' %
+                (len(trees), leaves))
+        f.write('<shrinkage>%r</shrinkage>\n</info>\n<ensemble>\n' %
+                shrinkage)
+
+        for i, tree in enumerate(trees):
+
+            outputs = [float(output) for output in
+                       random.normal(0.0, 1.0, len(tree.feature))]
+
+            lines = ['<tree id="%d" weight="%r">' % (i + 1, shrinkage)]
+            quickrank_splits(tree, 0, outputs, lines, '')
+            lines.append('</tree>')
+
+            f.write('\n'.join(lines) + '\n')
+
+        f.write('</ensemble>\n</ranker>\n')
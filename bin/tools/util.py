@@ -1,19 +1,23 @@
 '''
     This module is intended for utilities purposes
+
+    The progress of the STE packing is logged at the DEBUG level of the
+    tools.util logger, formatted only when that level is enabled, so
+    conversions stay quiet (and fast) by default.
     ----------------------
     Author: Tom Tracy II
     email: tjt7a@virginia.edu
     University of Virginia
     ----------------------
     12 June 2017
-    Version 0.2
+    Version 0.3
 '''
 
 import math
 from heapq import *
 import logging
 
-logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 # Get valid ordering of features
 # this is the order in which the input is streamed
@@ -29,7 +33,7 @@ def getordering(ft):
 
             stes[_i].append(_f)
 
-    print "STES: ", stes
+    logger.debug("getordering: stes=%s", stes)
 
     '''
         Some Comments
@@ -53,13 +57,11 @@ def getordering(ft):
 
 
     else:
-        print "Start loop: ", 0, ft.start_loop_
+        logger.debug("getordering: start_loop=%s", ft.start_loop_)
 
         # All STEs with a single feature (not part of the loop)
         for _i in range(0, ft.start_loop_):
 
-            print "Size of ste ", _i, ": ", len(stes[_i])
-
             assert len(stes[_i]) == 1,\
                 "Bad assumption about size of STE allocations"
 
@@ -94,11 +96,11 @@ def getordering(ft):
 
 def compact(threshold_map, priority='runtime', unrolled=False, verbose=True):
 
-    if verbose:
-        logging.info("Running compact() on %d unique features; each with min=%d to max=%d unique threshold counts" %
-                     (len(threshold_map.keys()),
+    if verbose and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("compact: features=%d min_thresholds=%d max_thresholds=%d",
+                     len(threshold_map),
                      min([len(thresholds) for _,thresholds in threshold_map.iteritems()]),
-                     max([len(thresholds) for _,thresholds in threshold_map.iteritems()])))
+                     max([len(thresholds) for _,thresholds in threshold_map.iteritems()]))
 
     # Set maximum bin size (in the case of an STE its 2^8 - 1)
     # [0 - 254] are allowed (which counts the extra -1)
@@ -122,27 +124,23 @@ def compact(threshold_map, priority='runtime', unrolled=False, verbose=True):
     threshold_counts.sort(key=lambda x: x[1], reverse=True)
 
     if verbose:
-        logging.info("Maximum Binsize set to %d thresholds" % BINSIZE)
-        logging.info("Initialized stes[] and feature_pointer{}")
-        logging.info("Created sorted threshold_counts containing (feature, len(thresholds))")
+        logger.debug("compact: binsize=%d", BINSIZE)
 
     # This function grabs all 'large' features that take
     # one full STE or more, updating the threshold_counts by
     # removing those features and stes variable with the address table
 
-    if unrolled:
-        logging.info("Attempting to pack all features into their own (1 or more) bins")
-    else:
-        if verbose:
-            logging.info("Attempting to pack 'large' features into 1 or more bins")
+    if verbose:
+        if unrolled:
+            logger.debug("compact: packing every feature into its own bins")
+        else:
+            logger.debug("compact: packing 'large' features into 1 or more bins")
 
     # Grab the big features
     stes, feature_pointer, threshold_counts = big_features(stes, feature_pointer, threshold_map, threshold_counts,
                 BINSIZE, verbose, unrolled=unrolled)
 
-    print "STEs post big_features"
-    for ste in stes:
-        print ste
+    logger.debug("compact: stes after big_features=%s", stes)
 
     # This means we have remaining small features
     if len(threshold_counts) > 0:
@@ -150,9 +148,8 @@ def compact(threshold_map, priority='runtime', unrolled=False, verbose=True):
         assert not unrolled, "It appears that something went wrong with generating long chains";
 
         if verbose:
-            logging.info("We still have %d features left to put into bins: \n%s" %
-                         (len(threshold_counts), str([(_f, _t) for
-                          _f, _t in threshold_counts])))
+            logger.debug("compact: small features=%d threshold_counts=%s",
+                         len(threshold_counts), threshold_counts)
 
         start_loop, end_loop = small_features(stes, feature_pointer,
                                              threshold_map, threshold_counts,
@@ -186,7 +183,7 @@ def big_features(stes, feature_pointer, threshold_map, threshold_counts,
         if unrolled and _t <= BINSIZE:
 
             if verbose:
-                logging.info("UNROLLING: Found feature %d to fit in exactly one bin!" % _f)
+                logger.debug("big_features: unrolled feature=%d bins=1", _f)
 
             counts_to_remove.append((_f, _t))
 
@@ -196,7 +193,7 @@ def big_features(stes, feature_pointer, threshold_map, threshold_counts,
         elif _t == BINSIZE:
 
             if verbose:
-                logging.info("Found feature %d to use exactly one bin!" % _f)
+                logger.debug("big_features: feature=%d bins=1", _f)
 
             counts_to_remove.append((_f, _t))
 
@@ -209,7 +206,8 @@ def big_features(stes, feature_pointer, threshold_map, threshold_counts,
         elif _t > BINSIZE:
 
             if verbose:
-                logging.info("Found feature %d to have %d thresholds! (>=BINSIZE))" % (_f, _t))
+                logger.debug("big_features: feature=%d thresholds=%d > binsize",
+                             _f, _t)
 
             # We're going to have to remove this feature from the list
             counts_to_remove.append((_f, _t))
@@ -302,18 +300,14 @@ def big_features(stes, feature_pointer, threshold_map, threshold_counts,
             break
 
     if verbose:
-        logging.info("Found %d features that take 1 or more full bins" %
-                     len(counts_to_remove))
+        logger.debug("big_features: features=%d", len(counts_to_remove))
 
     for removable in counts_to_remove:
         threshold_counts.remove(removable)
 
-    if verbose:
-        if len(counts_to_remove) > 0:
-            logging.info("Resulting feature pointer: \n\n%s\n" %
-                         str(feature_pointer))
-            logging.info("Resulting bin address spacing (%d bins): \n\n%s\n" %
-                         (len(stes), str(stes)))
+    if verbose and len(counts_to_remove) > 0:
+        logger.debug("big_features: feature_pointer=%s", feature_pointer)
+        logger.debug("big_features: bins=%d stes=%s", len(stes), stes)
 
     return (stes, feature_pointer, threshold_counts)
 
@@ -328,17 +322,13 @@ def pack(threshold_counts, ste_count, verbose):
     heap = []
 
     if verbose:
-        logging.info("Initializing %d empty bin(s) to be filled" %
-                     ste_count)
+        logger.debug("pack: bins=%d features=%d", ste_count,
+                     len(threshold_counts))
 
     # Add <ste_count> empty 'bins' to our priority queue
     for i in range(ste_count):
         heappush(heap, (0, []))
 
-    if verbose:
-        logging.info("Filling bins by putting largest available item in \
-                     most empty bin")
-
     # Iterate through all features in threshold_counts, and update bins
     # We're updating the bins such that the emptiest is filled first (with thresholds)
     for _f, _t in threshold_counts:
@@ -364,8 +354,8 @@ def pack(threshold_counts, ste_count, verbose):
         sizes.append(size)  # Have a list of sizes
 
         if verbose:
-            logging.info("STE %d stats: size=%d, %d features=%s" %
-                         (i, size, len(features), str(features)))
+            logger.debug("pack: ste=%d size=%d features=%s", i, size,
+                         features)
 
     single_ste_features = []
 
@@ -374,7 +364,6 @@ def pack(threshold_counts, ste_count, verbose):
     # strategy, remove them and try packing again!
     for _f in feature_list:
 
-        print _f, len(_f)
         # Check if one of the STEs only has a single feature in it
         if len(_f) == 1:
 
@@ -386,10 +375,8 @@ def pack(threshold_counts, ste_count, verbose):
             # Grab the index of the feature to be removed
             f_index = feature_list.index(_f)
 
-            print "Feature to remove: ", _f
-            print "From feature_list: ", feature_list[f_index]
-
-            print (feature_list[f_index][0], sizes[f_index]-1)
+            logger.debug("pack: single feature=%d size=%d",
+                         feature_list[f_index][0], sizes[f_index])
 
             # ... also remove this feature from the threshold_counts
             assert (feature_list[f_index][0], sizes[f_index]-1) in threshold_counts
@@ -408,11 +395,8 @@ def pack(threshold_counts, ste_count, verbose):
 
         assert len(_f) > 0
 
-    print "--------------------Pack-----------------"
-    print "Feature List: ", feature_list
-    print "Sizes: ", sizes
-    print "Single STE Features: ", single_ste_features
-    print "-------------------------------------------"
+    logger.debug("pack: feature_list=%s sizes=%s single_ste_features=%s",
+                 feature_list, sizes, single_ste_features)
 
     return feature_list, sizes, single_ste_features
 
@@ -430,10 +414,11 @@ def small_features(stes, feature_pointer, threshold_map, threshold_counts,
 
     # In the future we will support 'runtime' and 'capacity' optimization
     if priority != 'runtime':
-        print "Sorry, but we only have 'runtime' support at this time"
+        logger.warning("Only the 'runtime' priority is supported; got %s",
+                       priority)
         q = input("Continue binpacking with priority set to runtime?: y/n")
         if q != 'y' and q != 'Y':
-            print "Quiting prematurely"
+            logger.warning("Quiting prematurely")
             exit()
 
     # We'll start at the minimum possible number of STEs that could work out
@@ -443,7 +428,7 @@ def small_features(stes, feature_pointer, threshold_map, threshold_counts,
     assert min_ste_count > 0
 
     if verbose:
-        logging.info("Found that %d is the min number of STEs to fit all remaining features" % min_ste_count)
+        logger.debug("small_features: min_stes=%d", min_ste_count)
 
     iteration_counter = 0
     ste_count = min_ste_count
@@ -452,8 +437,8 @@ def small_features(stes, feature_pointer, threshold_map, threshold_counts,
     while True:
 
         if verbose:
-            logging.info("Iteration %d: attempting %d bins with %d features" %
-                         (iteration_counter, ste_count, len(threshold_counts)))
+            logger.debug("small_features: iteration=%d bins=%d features=%d",
+                         iteration_counter, ste_count, len(threshold_counts))
 
         iteration_counter += 1
 
@@ -465,7 +450,7 @@ def small_features(stes, feature_pointer, threshold_map, threshold_counts,
         for _f in single_ste_features:
 
             if verbose:
-                logging.info("Found feature %d needed a full bin!" % _f[0])
+                logger.debug("small_features: feature=%d bins=1", _f[0])
 
             # New list of STEs for the feature
             stes, feature_pointer = update_stes(stes, feature_pointer, threshold_map,
@@ -476,7 +461,6 @@ def small_features(stes, feature_pointer, threshold_map, threshold_counts,
 
         # Verify that there are no single-feature STEs left (should have been removed by pack
         for _f in feature_list:
-            print _f, len(_f)
             assert len(_f) > 1
             assert len(feature_list) == len(sizes)
 
@@ -484,31 +468,26 @@ def small_features(stes, feature_pointer, threshold_map, threshold_counts,
         if len(feature_list) == 0:
 
             if verbose:
-                logging.info("All features required one bin each; \
-                             we're done here")
+                logger.debug("small_features: every feature needed one bin")
             return (None, None)
 
         # If the most full STE is not over-full...
         if max(sizes) <= BINSIZE:
 
-            if verbose:
-                logging.info("Binsize: %d" % BINSIZE)
-                logging.info("We managed to fit all features into %d bins" %
-                             ste_count)
-
             num_features_per_ste = [len(x) for x in feature_list]
 
-            print "Sizes: ", sizes
-            print "num_features_per_ste: ", num_features_per_ste
-
             if verbose:
-                logging.info("Checking to see if the bins are balanced")
+                logger.debug("small_features: fit bins=%d sizes=%s "
+                             "features_per_ste=%s", ste_count, sizes,
+                             num_features_per_ste)
 
             # If imbalanced by the number of features assigned to the STEs...
             if max(num_features_per_ste) - min(num_features_per_ste) > 1:
 
                 if verbose:
-                    logging.info("The bins are not balanced! (min=%d,max=%d) features in a bin" % (min(num_features_per_ste), max(num_features_per_ste)))
+                    logger.debug("small_features: unbalanced min=%d max=%d",
+                                 min(num_features_per_ste),
+                                 max(num_features_per_ste))
 
                 if balance(feature_list, sizes, threshold_map,
                            threshold_counts, BINSIZE, verbose):
@@ -532,14 +511,15 @@ def small_features(stes, feature_pointer, threshold_map, threshold_counts,
                 else:
                     # Try with another STE
                     ste_count += 1
-                    logging.info("Balancing failed :/; incremeneting ste_count to: " + str(ste_count))
+                    logger.debug("small_features: balancing failed; bins=%d",
+                                 ste_count)
 
             else:
 
                 if verbose:
-                    logging.info("The bins are balanced; we're done here")
-                    logging.info("The largest STE is: %d" % max(num_features_per_ste))
-                    logging.info("The smallest STE is: %d" % min(num_features_per_ste))
+                    logger.debug("small_features: balanced min=%d max=%d",
+                                 min(num_features_per_ste),
+                                 max(num_features_per_ste))
 
                 feature_list.sort(key=lambda x: len(x), reverse=True)
 
@@ -565,8 +545,8 @@ def small_features(stes, feature_pointer, threshold_map, threshold_counts,
         else:
 
             if verbose:
-                logging.info("Couldn't fit them in %d bins" % ste_count)
-                logging.info("One STE is too full with %d thresholds!" % max(sizes))
+                logger.debug("small_features: overfull bins=%d max_size=%d",
+                             ste_count, max(sizes))
 
             # Continue to increment the STE counter
             ste_count += 1
@@ -577,9 +557,7 @@ def balance(feature_list, sizes, threshold_map, threshold_counts,
             BINSIZE, verbose):
 
     if verbose:
-        logging.info("Unbalanced feature list: %s" % str(feature_list))
-        logging.info("Min features in an STE: %d" % min([len(x) for x in feature_list]))
-        logging.info("Max features in an STE: %d" % max([len(x) for x in feature_list]))
+        logger.debug("balance: unbalanced feature_list=%s", feature_list)
 
     # Find the min number of features in any of the STEs
     min_features = min([len(x) for x in feature_list])
@@ -598,8 +576,8 @@ def balance(feature_list, sizes, threshold_map, threshold_counts,
         num_features = len(ste)
 
         if verbose:
-            print("We're going to remove %d features from ste %d" %
-                  ((num_features - min_features), i))
+            logger.debug("balance: ste=%d removed=%d", i,
+                         num_features - min_features)
 
         # Remove the extra features from each STE
         for _ in range(num_features - min_features):
@@ -639,44 +617,15 @@ def balance(feature_list, sizes, threshold_map, threshold_counts,
 
         # If we bust the size limit, we're done here. oh well
         if size > BINSIZE:
-            logging.info("Size (" + str(size) + ") > BINSIZE (" + str(BINSIZE) + ") this doesn't work. Try again")
+            logger.debug("balance: size=%d > binsize=%d", size, BINSIZE)
             return False
 
         heappush(next_heap, (size, features))
 
     if verbose:
-        logging.info("Balanced feature list: %s" % str(feature_list))
-
-    print "next_heap: ", next_heap
-    print "current_heap: ", current_heap
-
-    temp_features = []
-    temp_sizes = []
-    temp_ = []
-    while next_heap:
-        size, features = heappop(next_heap)
-        temp_.append(features)
-        temp_sizes.append(size)
-
-    print "next_heap: ", next_heap
-    print "current_heap: ", current_heap
-
-    while current_heap:
-        size, features = heappop(current_heap)
-        temp_.append(features)
-        temp_sizes.append(size)
-
-    print "Temp: ", temp_
-    print "Temp Sizes: ", temp_sizes
+        logger.debug("balance: balanced feature_list=%s", feature_list)
 
     # If we got here without issues, we balanced!
-    print "Current Heap: "
-    for size, features in current_heap:
-        print size, features, len(features)
-    print "Next Heap:"
-    for size, features in next_heap:
-        print size, features, len(features)
-
     return True
 
 
@@ -721,7 +670,7 @@ def update_stes(stes, feature_pointer, threshold_map, features):
 def verification(threshold_map, feature_pointer, stes, verbose):
 
     if verbose:
-        logging.info("Time to run sanity check on the stes address allocation")
+        logger.debug("verification: checking the STE address allocation")
 
     for f, thresholds in threshold_map.iteritems():
 
@@ -760,7 +709,7 @@ def verification(threshold_map, feature_pointer, stes, verbose):
                 (str(combined_thresholds), str(thresholds))
 
     if verbose:
-        logging.info("Time to run a sanity check on feature_pointer")
+        logger.debug("verification: checking feature_pointer")
 
     # Verify that the results make sense
     for f, thresholds in threshold_map.iteritems():
@@ -794,7 +743,6 @@ def verification(threshold_map, feature_pointer, stes, verbose):
                 "|Thresholds|=%d, |total address space|=%d \n%s\n%s" %\
                 (len(thresholds), total_address_space, len(thresholds), bins)
     if verbose:
-        logging.info("Feature Pointer looks right!")
-        logging.info("All Sanity Checks Passed")
+        logger.debug("verification: passed")
 
     return True
@@ -17,7 +17,6 @@ import pickle
 from optparse import OptionParser
 import numpy as np
 import logging
-import time
 
 # Model Imports
 from sklearn.model_selection import train_test_split
@@ -28,12 +27,15 @@ from sklearn.ensemble import AdaBoostClassifier
 # Feature selection imports
 from sklearn.feature_selection import SelectKBest, chi2
 
-# Dataset Imports
-from sklearn.datasets import fetch_mldata
-
 # Metrics Import
 from sklearn import metrics
 
+# Import tools
+from tools.benchmark import benchmark_point
+from tools.binning import automata_cost, bin_features, quantile_edges,\
+    unbin_thresholds
+from tools.synthetic import synthetic_dataset
+
 # Global dictionaries
 model_names = {'rf': 'Random Forest',
                'brt': 'Boosted Regression Trees',
@@ -47,7 +49,8 @@ metric_names = {'acc': 'accuracy',
                 'auc': 'Area Under the Curve'
                 }
 
-datasets = {'mnist': 'MNIST original'}
+datasets = {'mnist': 'MNIST original',
+            'synthetic': 'MNIST-sized synthetic (tools/synthetic.py)'}
 
 # Turn on logging.
 logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
@@ -102,37 +105,28 @@ def write_report(report_name_, report_dict_):
 
         for key, value in report_dict_.items():
 
-            f.write(str(key) + ":" + str(value))
+            f.write(str(key) + ":" + str(value) + "\n")
 
 
-# Calculate the average throughput of the model on the CPU
+# Benchmark the model on the CPU over the whole test set, after a warmup
+# See test_cpu.py for batch size and thread count sweeps
 def print_throughput(model_, x_test_, iters_):
 
     logging.info("Model: %s" % str(model_))
     logging.info("Test Data: %d samples x %d features" % x_test_.shape)
 
-    # Grab the start time
-    start_time = time.time()
-
-    # Do a bunch of predictions
-    for i in range(iters_):
-        model_.predict(x_test_)
-
-    # Grab the end time
-    end_time = time.time()
-
-    # Grab average time per iterations
-    avg_time = (end_time - start_time) / float(iters_)
+    scorer = {'predict': lambda X, n_jobs: model_.predict(X)}
 
-    logging.info("Average Time: %f" % avg_time)
+    point = benchmark_point(scorer, x_test_, len(x_test_),
+                            getattr(model_, 'n_jobs', None) or 1,
+                            max_batches=iters_)
 
-    # Throughput = num_feature_vectors / average time per iteration
-    throughput = float(x_test_.shape[0]) / avg_time
+    logging.info("Latency: p50 %f, p99 %f seconds over %d runs" %
+                 (point['p50_latency'], point['p99_latency'],
+                  point['batches']))
 
-    # Metric becomes kilo-samples / sec
-    kthroughput = throughput / 1000.0
-
-    logging.info("Throughput: %f ksamples / second" % kthroughput)
+    logging.info("Throughput: %f ksamples / second" %
+                 point['ksamples_per_second'])
 
 # Dump the predictions made by the model to a file for testing
 def dump_predictions(model_, x_test_, filename_):
@@ -156,7 +150,7 @@ if __name__ == '__main__':
     parser = OptionParser(usage)
 
     parser.add_option('-c', '--canned', type='string', dest='canned',
-                      help='A canned dataset included in SKLEARN (mnist)')
+                      help='A canned dataset: mnist (SKLEARN, needs network access) or synthetic (an MNIST-sized stand-in, generated offline)')
 
     parser.add_option('-t', '--train', type='string', dest='trainfile',
                       help='Training Data File (.npz file)')
@@ -186,6 +180,10 @@ if __name__ == '__main__':
     parser.add_option('-f', '--n_features', type='int', dest='n_features',
                       help='The number of features when fit is performed.')
 
+    parser.add_option('-k', '--max-thresholds', type='int',
+                      dest='max_thresholds',
+                      help='Pre-bin every feature on at most K quantile edges, so trees only split on them')
+
     parser.add_option('-j', '--njobs', type='int', dest='njobs',
                       help='Number jobs to run in parallel for fit/predict')
 
@@ -253,7 +251,14 @@ if __name__ == '__main__':
     if options.verbose:
         logging.info("Loading training file from %s" % options.trainfile)
 
-    if canned:
+    if canned and options.canned == 'synthetic':
+        # Binary pixels and 10 classes, like MNIST
+        X, y, qid = synthetic_dataset(70000, 784, 'binary', 10)
+
+    elif canned:
+        # Older SKLEARN releases only
+        from sklearn.datasets import fetch_mldata
+
         canned_dataset = fetch_mldata(datasets[options.canned])
         X = canned_dataset.data
         y = canned_dataset.target
@@ -325,8 +330,23 @@ if __name__ == '__main__':
     if options.verbose:
         logging.info("Training the %s model" % model_names[options.model])
 
+    # Train on the bins of the features, then move the thresholds back to
+    # the quantile edges; the model still predicts on the raw features
+    if options.max_thresholds is not None:
+
+        edges = quantile_edges(X_train, options.max_thresholds)
+        report_dict['max_thresholds'] = options.max_thresholds
+
+        if options.verbose:
+            logging.info("Binned the features on at most %d edges" %
+                         options.max_thresholds)
+
+        train_model(model, bin_features(X_train, edges), y_train)
+        unbin_thresholds(model, edges)
+
     # Train the model
-    train_model(model, X_train, y_train)
+    else:
+        train_model(model, X_train, y_train)
 
     if options.verbose:
         logging.info("Testing the %s model" % model_names[options.model])
@@ -341,6 +361,19 @@ if __name__ == '__main__':
     logging.info(metric_names[metric] + ":" + str(result))
     report_dict[metric_names[metric]] = str(result)
 
+    # The automata the model turns into; the other side of the accuracy
+    cost = automata_cost(model)
+
+    logging.info("%s: %s with %d STEs, %d cycles per classification, "
+                 "at most %d thresholds per feature" %
+                 (metric_names[metric], str(result), cost['ste_count'],
+                  cost['cycles_per_classification'],
+                  cost['max_feature_thresholds']))
+
+    for key in ['ste_count', 'cycles_per_classification',
+                'max_feature_thresholds']:
+        report_dict[key] = cost[key]
+
     if options.verbose:
         logging.info("Writing model out to %s" % options.modelout)
 
@@ -1,50 +1,214 @@
 '''
-    The purpose of this program is to extract the X feature vector and y
-    results from MSLR data.
+    The purpose of this program is to extract the X feature vector, y
+    results and query ids from MSLR data (or any svmlight / LETOR file).
+
+    Each line is a sample: "<label> qid:<qid> <feature>:<value> ...", with
+    one-based features; missing features (sparse rows) are 0 and anything
+    after a '#' is a comment. The file is read twice in chunks of bytes:
+    once to count the samples, then to parse every chunk of lines straight
+    into preallocated float32 arrays, memory-mapped .npy files on disk, so
+    the memory used doesn't grow with the file.
+
+    Given the MSLR-WEB30K directory (-d), the train, vali and test files of
+    every fold are extracted in parallel by a pool of processes.
     ----------------------
     Author: Tom Tracy II
     email: tjt7a@virginia.edu
     University of Virginia
     ----------------------
     12 November 2016
-    Version 1.0
+    Version 1.1
 '''
 
-import sys, json
 from optparse import OptionParser
+from multiprocessing import Pool
+from timeit import default_timer
+import glob
+import os
 import numpy as np
 import logging
 
+# The number of features of MSLR-WEB10K and WEB30K
+MSLR_FEATURES = 136
+
+# The bytes read at a time
+CHUNK_BYTES = 1 << 26
+
+# The data files of every fold
+FOLD_FILES = ['train.txt', 'vali.txt', 'test.txt']
+
 # Turn on logging.
 logging.basicConfig(format='%(asctime)s : %(message)s', level=logging.INFO)
 
-# Read the MSLR file and stack X and y
-def readmslr(filename):
 
-    # Populate lists and then convert to NUMPY arrays; faster then stacking
-    y = []
-    X = []
+# Yield the complete lines of a file, a chunk of bytes at a time
+def read_chunks(filename, chunk_bytes=CHUNK_BYTES):
+
+    rest = b''
+
+    with open(filename, 'rb') as f:
+
+        while True:
+
+            chunk = f.read(chunk_bytes)
+
+            if not chunk:
+                break
+
+            chunk = rest + chunk
+            end = chunk.rfind(b'\n') + 1
+
+            rest = chunk[end:]
+
+            if end > 0:
+                yield chunk[:end].split(b'\n')[:-1]
+
+    if rest:
+        yield [rest]
+
+
+# A line without its comment; blank if the line holds no sample
+def strip_comment(line):
+
+    if b'#' in line:
+        return line.split(b'#', 1)[0]
+
+    return line
+
+
+# Count the samples (lines not blank without their comment) of a file
+def count_rows(filename, chunk_bytes=CHUNK_BYTES):
+
+    rows = 0
+
+    for lines in read_chunks(filename, chunk_bytes):
+        rows += sum(1 for line in lines if strip_comment(line).strip())
+
+    return rows
+
+
+# Parse the samples of a chunk of lines into X, y and qid from row start
+# Returns the number of samples parsed
+def parse_lines(lines, X, y, qid, start):
+
+    labels = []
+    qids = []
+    counts = []
+    pairs = []
+
+    for line in lines:
+
+        tokens = strip_comment(line).split(None, 2)
+
+        if not tokens:
+            continue
+
+        labels.append(tokens[0])
+
+        # The qid is optional in svmlight files
+        if len(tokens) > 1 and tokens[1].startswith(b'qid:'):
+            qids.append(tokens[1][4:])
+            rest = tokens[2] if len(tokens) > 2 else b''
+        else:
+            qids.append(b'0')
+            rest = b' '.join(tokens[1:])
+
+        counts.append(rest.count(b':'))
+        pairs.append(rest.replace(b':', b' '))
+
+    rows = len(labels)
+
+    y[start:start + rows] = np.array(labels, dtype=np.float64)
+    qid[start:start + rows] = np.array(qids, dtype=np.int64)
+
+    values = np.fromstring(b' '.join(pairs), dtype=np.float64, sep=' ')
+
+    if len(values) != 2 * sum(counts):
+        raise ValueError("Malformed <feature>:<value> pairs in rows %d-%d" %
+                         (start, start + rows - 1))
+
+    features = values[0::2].astype(np.int64) - 1
+
+    if len(features) and (features.min() < 0 or
+                          features.max() >= X.shape[1]):
+        raise ValueError("Feature %d out of 1-%d in rows %d-%d" %
+                         (features.max() + 1 if features.max() >= X.shape[1]
+                          else features.min() + 1, X.shape[1], start,
+                          start + rows - 1))
+
+    samples = np.repeat(np.arange(start, start + rows), counts)
+
+    X[samples, features] = values[1::2]
+
+    return rows
+
+
+# Parse a whole file into X, y and qid (arrays of count_rows() samples)
+def parse_file(filename, X, y, qid, chunk_bytes=CHUNK_BYTES):
+
+    start = 0
+
+    for lines in read_chunks(filename, chunk_bytes):
+        start += parse_lines(lines, X, y, qid, start)
 
-    # This assumes that they're in the correct order
-    with open(filename) as mslrfile:
-        for line in mslrfile:
-            tokens = line.split()
-            score = int(tokens[0])
-            features = [float(x.split(':')[1]) for x in tokens[2:]]
+    if start != len(X):
+        raise ValueError("Parsed %d of %d samples of %s" %
+                         (start, len(X), filename))
 
-            if '\n' in features:
-                features.remove('\n')
 
-            assert len(features) == 136, "Don't have the right number of features"
+# Read the MSLR file into memory; returns X, y and qid
+def readmslr(filename, features=MSLR_FEATURES):
 
-            y.append(score)
-            X.append(features)
+    rows = count_rows(filename)
 
-    # Convert lists into arrays
-    X = np.array(X)
-    y = np.array(y)
+    X = np.zeros((rows, features), dtype=np.float32)
+    y = np.zeros(rows, dtype=np.float32)
+    qid = np.zeros(rows, dtype=np.int64)
+
+    parse_file(filename, X, y, qid)
+
+    return X, y, qid
+
+
+# Extract a file to <prefix>.X.npy (float32 samples x features),
+# <prefix>.y.npy (float32 labels) and <prefix>.qid.npy (int64 query ids)
+# Returns (filename, samples, bytes read, seconds)
+def extract(filename, prefix, features=MSLR_FEATURES,
+            chunk_bytes=CHUNK_BYTES):
+
+    start = default_timer()
+
+    rows = count_rows(filename, chunk_bytes)
+
+    # New .npy files are zero filled, the value of missing features
+    X = np.lib.format.open_memmap(prefix + '.X.npy', 'w+', np.float32,
+                                  (rows, features))
+    y = np.lib.format.open_memmap(prefix + '.y.npy', 'w+', np.float32,
+                                  (rows,))
+    qid = np.lib.format.open_memmap(prefix + '.qid.npy', 'w+', np.int64,
+                                    (rows,))
+
+    parse_file(filename, X, y, qid, chunk_bytes)
+
+    for array in [X, y, qid]:
+        array.flush()
+
+    del X, y, qid
+
+    return filename, rows, os.path.getsize(filename), default_timer() - start
+
+
+# extract() for a pool worker: a tuple of arguments
+def extract_job(job):
+
+    return extract(*job)
+
+
+# The MB per second of a number of bytes
+def throughput(size, seconds):
+
+    return size / float(1 << 20) / max(seconds, 1e-9)
 
-    return X, y
 
 if __name__ == '__main__':
 
@@ -52,28 +216,98 @@ if __name__ == '__main__':
     usage = '%prog [options][text]'
     parser = OptionParser(usage)
     parser.add_option('-i', '--file-in', type='string', dest='infile', help='Input MSLR data file')
-    parser.add_option('-o', '--file-out', type='string', dest='outfile', help='Save resulting X and y to a file')
+    parser.add_option('-d', '--directory', type='string', dest='directory', help='MSLR directory; extract the train, vali and test files of every Fold*')
+    parser.add_option('-o', '--file-out', type='string', dest='outfile', help='Prefix of the .X.npy, .y.npy and .qid.npy files of -i (default: the input file without .txt); with -d, an output directory mirroring the folds (default: next to the inputs)')
+    parser.add_option('-f', '--features', type='int', dest='features', default=MSLR_FEATURES, help='Number of features (default: 136)')
+    parser.add_option('-j', '--njobs', type='int', dest='njobs', default=5, help='Number of processes extracting the files of -d')
+    parser.add_option('--chunk-mb', type='int', dest='chunk_mb', default=CHUNK_BYTES >> 20, help='MB read at a time')
+    parser.add_option('--npz', type='string', dest='npz', help='Also save X and y of -i to this .npz file (for trainEnsemble.py)')
     parser.add_option('-v', '--verbose', action='store_true', default=False, dest='verbose', help='Verbose')
     options, args = parser.parse_args()
 
-    if options.outfile is None:
-        raise ValueError("No valid mslr output file name specified; provide '-o'")
-        exit(-1)
+    chunk_bytes = options.chunk_mb << 20
+
+    # -o <file>.npz, as before
+    if options.outfile is not None and options.outfile.endswith('.npz'):
+        options.npz = options.outfile
+        options.outfile = None
 
     if options.infile is not None:
-        if options.verbose:
-            logging.info('Reading from file: %s' % options.infile)
 
-        X, y = readmslr(options.infile)
+        prefix = options.outfile
 
-        if options.verbose:
-            logging.info('Done reading file')
+        if prefix is None:
+            prefix = os.path.splitext(options.infile)[0]
+
+        jobs = [(options.infile, prefix, options.features, chunk_bytes)]
+
+    elif options.directory is not None:
+
+        jobs = []
+
+        for fold in sorted(glob.glob(os.path.join(options.directory, 'Fold*'))):
+
+            directory = fold
+
+            if options.outfile is not None:
+                directory = os.path.join(options.outfile,
+                                         os.path.basename(fold))
+
+                if not os.path.isdir(directory):
+                    os.makedirs(directory)
+
+            for name in FOLD_FILES:
+
+                filename = os.path.join(fold, name)
+
+                if os.path.isfile(filename):
+                    jobs.append((filename,
+                                 os.path.join(directory,
+                                              os.path.splitext(name)[0]),
+                                 options.features, chunk_bytes))
+
+        if len(jobs) == 0:
+            raise ValueError("No Fold*/{train,vali,test}.txt files in %s" %
+                             options.directory)
 
     else:
-        raise ValueError("No valid mslr input file name specified; provide '-i")
-        exit(-1)
+        raise ValueError("No valid mslr input specified; provide '-i' or '-d'")
 
     if options.verbose:
-        logging.info("Writing to file: %s" % options.outfile)
+        logging.info("Extracting %d files with %d processes" %
+                     (len(jobs), min(options.njobs, len(jobs))))
+
+    start = default_timer()
+
+    if len(jobs) == 1 or options.njobs <= 1:
+        results = map(extract_job, jobs)
+    else:
+        pool = Pool(min(options.njobs, len(jobs)))
+        results = pool.imap_unordered(extract_job, jobs)
+
+    total_bytes = 0
+
+    for filename, rows, size, seconds in results:
+
+        total_bytes += size
+
+        logging.info("%s: %d samples, %.1f MB in %.2f seconds (%.1f MB/s)" %
+                     (filename, rows, size / float(1 << 20), seconds,
+                      throughput(size, seconds)))
+
+    seconds = default_timer() - start
+
+    logging.info("Extracted %.1f MB in %.2f seconds (%.1f MB/s)" %
+                 (total_bytes / float(1 << 20), seconds,
+                  throughput(total_bytes, seconds)))
+
+    if options.npz is not None and options.infile is not None:
+
+        if options.verbose:
+            logging.info("Writing to file: %s" % options.npz)
+
+        prefix = jobs[0][1]
 
-    np.savez(options.outfile, X=X, y=y)
+        np.savez(options.npz, X=np.load(prefix + '.X.npy', mmap_mode='r'),
+                 y=np.load(prefix + '.y.npy', mmap_mode='r'),
+                 qid=np.load(prefix + '.qid.npy', mmap_mode='r'))